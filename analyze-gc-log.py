@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+GC Log Analyzer
+
+Summarizes the server's JVM GC log (written by 'make run-server') into pause
+time percentiles, allocation rate and heap-after-GC trend, with heap size and
+collector recommendations.
+Usage: ./analyze-gc-log.py [gc-log] [--json FILE]
+
+Rotated logs (gc.log.0, gc.log.1, ...) are included automatically. The
+analysis is shared with the bot's /gc command (discord-bot/utils/gc_log.py).
+"""
+
+import sys
+import json
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / "discord-bot"))
+from utils.gc_log import analyze_gc_logs, format_summary  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyze JVM unified GC logs")
+    parser.add_argument('log', nargs='?', default='server/logs/gc.log', help="GC log file")
+    parser.add_argument('--json', help="Also write the summary to this file")
+    args = parser.parse_args()
+
+    try:
+        summary = analyze_gc_logs(args.log)
+    except FileNotFoundError as e:
+        print(f"Error: {e}")
+        print("GC logging is enabled by 'make run-server'; run the server for a while first.")
+        sys.exit(1)
+
+    print(format_summary(summary))
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(summary, f, indent=2)
+        print()
+        print(f"✓ Wrote summary to {args.json}")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\n\nCancelled by user.")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n\nError: {e}")
+        sys.exit(1)
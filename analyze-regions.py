@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Region File Analyzer
+
+Reports what is taking up space in a world: chunk counts and sizes per
+region file, oversized chunks and wasted (fragmented) space.
+Usage: ./analyze-regions.py [world-dir] [--top N] [--oversized KiB] [--json FILE]
+
+Only region headers and the 5 byte per-chunk headers are read, through mmap,
+so chunk payloads are never decompressed. Region files are spread over a
+process pool.
+"""
+
+import os
+import sys
+import json
+import mmap
+import heapq
+import argparse
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+from regionfile import (
+    SECTOR_SIZE, EXTERNAL_FLAG,
+    region_coords, chunk_coords, read_header, read_chunk_header,
+)
+
+
+def analyze_region(task):
+    """Scan one region file. Runs in a worker process."""
+    path, oversized_bytes, top = task
+    path = Path(path)
+    file_size = path.stat().st_size
+
+    result = {
+        'path': str(path),
+        'file_size': file_size,
+        'chunks': 0,
+        'data_bytes': 0,
+        'used_sectors': 0,
+        'free_sectors': 0,
+        'external_chunks': 0,
+        'oversized': [],
+        'largest': [],
+        'newest_write': 0,
+        'corrupt': 0,
+    }
+
+    if file_size == 0:
+        return result
+
+    coords = region_coords(path) or (0, 0)
+    largest = []
+
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        entries = read_header(mm)
+        file_sectors = (file_size + SECTOR_SIZE - 1) // SECTOR_SIZE
+        used = bytearray(file_sectors)
+        used[0:2] = b'\x01\x01'
+
+        for index, offset, count, timestamp in entries:
+            chunk_header = read_chunk_header(mm, offset)
+            if chunk_header is None or offset < 2 or offset + count > file_sectors:
+                result['corrupt'] += 1
+                continue
+
+            length, compression = chunk_header
+            used[offset:offset + count] = b'\x01' * count
+
+            result['chunks'] += 1
+            result['data_bytes'] += length
+            result['newest_write'] = max(result['newest_write'], timestamp)
+
+            external = bool(compression & EXTERNAL_FLAG)
+            if external:
+                result['external_chunks'] += 1
+                mcc = path.parent / "c.{}.{}.mcc".format(*chunk_coords(*coords, index))
+                if mcc.exists():
+                    length = mcc.stat().st_size
+
+            chunk = (length, chunk_coords(*coords, index), external)
+            if length >= oversized_bytes or external:
+                result['oversized'].append(chunk)
+            if len(largest) < top:
+                heapq.heappush(largest, chunk)
+            elif length > largest[0][0]:
+                heapq.heapreplace(largest, chunk)
+
+        result['used_sectors'] = sum(used)
+        result['free_sectors'] = file_sectors - result['used_sectors']
+
+    result['largest'] = largest
+    return result
+
+
+def find_region_files(world_dir):
+    """Group .mca files by their directory relative to the world (region, DIM-1/region, entities, ...)."""
+    groups = {}
+    for dirpath, _, filenames in os.walk(world_dir):
+        files = [Path(dirpath) / name for name in filenames if name.endswith('.mca')]
+        if files:
+            groups[Path(dirpath).relative_to(world_dir).as_posix()] = files
+    return groups
+
+
+def format_size(size):
+    if size < 1024:
+        return f"{size} B"
+    for unit in ('KiB', 'MiB', 'GiB'):
+        size /= 1024
+        if size < 1024 or unit == 'GiB':
+            return f"{size:.1f} {unit}"
+
+
+def summarize(group, results):
+    file_bytes = sum(r['file_size'] for r in results)
+    free_sectors = sum(r['free_sectors'] for r in results)
+    total_sectors = sum(r['used_sectors'] + r['free_sectors'] for r in results)
+
+    return {
+        'group': group,
+        'regions': len(results),
+        'chunks': sum(r['chunks'] for r in results),
+        'file_bytes': file_bytes,
+        'data_bytes': sum(r['data_bytes'] for r in results),
+        'free_bytes': free_sectors * SECTOR_SIZE,
+        'fragmentation': free_sectors / total_sectors if total_sectors else 0.0,
+        'external_chunks': sum(r['external_chunks'] for r in results),
+        'corrupt_chunks': sum(r['corrupt'] for r in results),
+    }
+
+
+def print_report(summaries, results, top):
+    for summary in summaries:
+        print(f"{summary['group']}")
+        print(f"  Regions:        {summary['regions']}")
+        print(f"  Chunks:         {summary['chunks']} "
+              f"(avg {summary['chunks'] / summary['regions'] if summary['regions'] else 0:.0f} per region)")
+        print(f"  Size on disk:   {format_size(summary['file_bytes'])}")
+        print(f"  Chunk data:     {format_size(summary['data_bytes'])}")
+        print(f"  Free sectors:   {format_size(summary['free_bytes'])} "
+              f"({summary['fragmentation'] * 100:.1f}% fragmentation)")
+        if summary['external_chunks']:
+            print(f"  External (.mcc): {summary['external_chunks']} chunks")
+        if summary['corrupt_chunks']:
+            print(f"  ⚠️ Corrupt entries: {summary['corrupt_chunks']}")
+        print()
+
+    print("Largest region files:")
+    for r in heapq.nlargest(top, results, key=lambda r: r['file_size']):
+        print(f"  {format_size(r['file_size']):>10}  {r['chunks']:4d} chunks  {r['path']}")
+    print()
+
+    largest = heapq.nlargest(top, ((c, r['path']) for r in results for c in r['largest']),
+                             key=lambda item: item[0][0])
+    print("Largest chunks:")
+    for (length, (x, z), external), path in largest:
+        flag = " (external)" if external else ""
+        print(f"  {format_size(length):>10}  chunk {x}, {z}  (block {x * 16}, {z * 16}){flag}  {path}")
+    print()
+
+    oversized = sum(len(r['oversized']) for r in results)
+    if oversized:
+        print(f"⚠️ {oversized} oversized chunk(s); these are slow to save and load")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyze region files without decompressing chunks")
+    parser.add_argument('world', nargs='?', default='server/world', help="World directory")
+    parser.add_argument('--top', type=int, default=10, help="How many of the largest regions/chunks to list")
+    parser.add_argument('--oversized', type=int, default=512,
+                        help="Flag chunks larger than this many KiB")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="Worker processes")
+    parser.add_argument('--json', help="Also write the full report to this file")
+    args = parser.parse_args()
+
+    world_dir = Path(args.world)
+    if not world_dir.exists():
+        print(f"Error: world directory not found: {world_dir}")
+        sys.exit(1)
+
+    groups = find_region_files(world_dir)
+    if not groups:
+        print(f"No region files found in {world_dir}")
+        return
+
+    oversized_bytes = args.oversized * 1024
+    tasks = [(str(path), oversized_bytes, args.top) for files in groups.values() for path in files]
+    print(f"Scanning {len(tasks)} region file(s) in {world_dir}...")
+    print()
+
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        # Batch small files together so IPC doesn't dominate on huge worlds
+        chunksize = max(1, len(tasks) // (args.workers * 8))
+        results = list(executor.map(analyze_region, tasks, chunksize=chunksize))
+
+    by_path = {r['path']: r for r in results}
+    summaries = [summarize(group, [by_path[str(p)] for p in files]) for group, files in sorted(groups.items())]
+    print_report(summaries, results, args.top)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'summary': summaries, 'regions': results}, f, indent=2)
+        print(f"✓ Wrote report to {args.json}")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\n\nCancelled by user.")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n\nError: {e}")
+        sys.exit(1)
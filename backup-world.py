@@ -0,0 +1,440 @@
+#!/usr/bin/env python3
+"""
+World Backup Script
+
+Incremental, deduplicated backups of the server world that are safe to take
+while the server is running.
+
+Usage:
+  ./backup-world.py backup [--no-rcon] [--max-rate MB/s]
+  ./backup-world.py list
+  ./backup-world.py restore <backup-id> <destination>
+  ./backup-world.py prune --keep <count>
+
+Autosaving is turned off over RCON (save-off, save-all flush) for the
+duration of the backup and turned back on afterwards. Only files whose size
+or mtime changed since the previous backup are read; everything is stored
+once in backups/objects/ by SHA-256 and compressed with zstd, and each
+backup is a small JSON manifest in backups/manifests/ pointing at objects.
+"""
+
+import os
+import sys
+import json
+import time
+import fcntl
+import hashlib
+import argparse
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from contextlib import contextmanager
+
+try:
+    import zstandard
+except ImportError:
+    print("Error: zstandard not installed. Please run 'make install-deps' first.")
+    sys.exit(1)
+
+CHUNK_SIZE = 1024 * 1024
+
+# Files the server holds open or rewrites constantly; never useful to restore
+SKIP_FILES = {'session.lock'}
+
+# mcrcon gives up on a response after 5s; flushing a large world takes longer
+FLUSH_TIMEOUT = 600
+
+
+def load_env_vars():
+    """Load environment variables from .env file."""
+    env_path = Path(".env")
+    env_vars = {}
+
+    if not env_path.exists():
+        return env_vars
+
+    with open(env_path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            # Skip comments and empty lines
+            if not line or line.startswith('#'):
+                continue
+
+            # Parse KEY=VALUE
+            if '=' in line:
+                key, value = line.split('=', 1)
+                env_vars[key.strip()] = value.strip()
+
+    return env_vars
+
+
+def get_world_dir(server_dir):
+    """Resolve the world directory from level-name in server.properties."""
+    level_name = 'world'
+    properties_path = server_dir / "server.properties"
+
+    if properties_path.exists():
+        with open(properties_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.startswith('level-name='):
+                    level_name = line.split('=', 1)[1].strip() or level_name
+
+    return server_dir / level_name
+
+
+class RconSession:
+    """Keeps autosave off for the duration of a with block."""
+
+    def __init__(self, env_vars):
+        try:
+            from mcrcon import MCRcon
+        except ImportError:
+            print("Error: mcrcon not installed. Please run 'make install-deps' first.")
+            sys.exit(1)
+
+        password = env_vars.get('RCON_PASSWORD')
+        if not password:
+            print("Error: RCON_PASSWORD not set in .env (use --no-rcon for a stopped server)")
+            sys.exit(1)
+
+        self.rcon = MCRcon(
+            env_vars.get('RCON_HOST', '127.0.0.1'),
+            password,
+            port=int(env_vars.get('RCON_PORT', '25575')),
+        )
+
+    def __enter__(self):
+        self.rcon.connect()
+        self.rcon.command("save-off")
+        # Runs on the server thread, so it returns once everything is on disk
+        timeout, self.rcon.timeout = self.rcon.timeout, FLUSH_TIMEOUT
+        try:
+            response = self.rcon.command("save-all flush")
+        finally:
+            self.rcon.timeout = timeout
+        print(f"✓ Autosave paused ({response.strip() or 'saved'})")
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self.rcon.command("save-on")
+            print("✓ Autosave resumed")
+        finally:
+            self.rcon.disconnect()
+
+
+class Throttle:
+    """Caps read throughput so backups don't starve the server of disk I/O."""
+
+    def __init__(self, bytes_per_second):
+        self.bytes_per_second = bytes_per_second
+        self.started = time.monotonic()
+        self.consumed = 0
+
+    def consume(self, size):
+        if not self.bytes_per_second:
+            return
+
+        self.consumed += size
+        expected = self.consumed / self.bytes_per_second
+        elapsed = time.monotonic() - self.started
+        if expected > elapsed:
+            time.sleep(expected - elapsed)
+
+
+class BackupStore:
+    def __init__(self, root):
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.manifests_dir = self.root / "manifests"
+
+    @contextmanager
+    def lock(self):
+        """
+        Held by backup and prune, so prune doesn't delete objects a running
+        backup has stored but not written a manifest for yet.
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.root / ".lock", 'w') as f:
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                print("Waiting for another backup or prune to finish...")
+                fcntl.flock(f, fcntl.LOCK_EX)
+            yield
+
+    def object_path(self, digest):
+        return self.objects_dir / digest[:2] / f"{digest}.zst"
+
+    def manifests(self):
+        if not self.manifests_dir.exists():
+            return []
+        # Ids are timestamps with a -N suffix for backups taken in the same second
+        def backup_order(path):
+            date, clock, *suffix = path.stem.split('-')
+            return date, clock, int(suffix[0]) if suffix else 0
+
+        return sorted(self.manifests_dir.glob("*.json"), key=backup_order)
+
+    def load_manifest(self, backup_id):
+        path = self.manifests_dir / f"{backup_id}.json"
+        if not path.exists():
+            print(f"Error: backup not found: {backup_id}")
+            sys.exit(1)
+        with open(path, 'r') as f:
+            return json.load(f)
+
+    def new_backup_id(self):
+        backup_id = datetime.now().strftime('%Y%m%d-%H%M%S')
+        suffix = 1
+        candidate = backup_id
+        while (self.manifests_dir / f"{candidate}.json").exists():
+            candidate = f"{backup_id}-{suffix}"
+            suffix += 1
+        return candidate
+
+    def latest_manifest(self):
+        manifests = self.manifests()
+        if not manifests:
+            return None
+        with open(manifests[-1], 'r') as f:
+            return json.load(f)
+
+    def store_file(self, path, compressor, throttle):
+        """
+        Stream a file through SHA-256 and zstd in one pass.
+
+        The compressed data goes to a temp file that is renamed into place
+        once the digest is known; if that object already exists the temp
+        file is just dropped.
+        """
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha256()
+        stored = 0
+
+        fd, tmp_name = tempfile.mkstemp(dir=self.objects_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as out, open(path, 'rb') as src:
+                cobj = compressor.compressobj()
+                while True:
+                    chunk = src.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    throttle.consume(len(chunk))
+                    digest.update(chunk)
+                    out.write(cobj.compress(chunk))
+                out.write(cobj.flush())
+
+            hexdigest = digest.hexdigest()
+            object_path = self.object_path(hexdigest)
+            if object_path.exists():
+                os.unlink(tmp_name)
+            else:
+                object_path.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(tmp_name, object_path)
+                stored = object_path.stat().st_size
+
+            return hexdigest, stored
+        except BaseException:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+            raise
+
+
+def walk_world(world_dir):
+    for dirpath, _, filenames in os.walk(world_dir):
+        for filename in filenames:
+            if filename in SKIP_FILES:
+                continue
+            path = Path(dirpath) / filename
+            yield path, path.relative_to(world_dir).as_posix()
+
+
+def backup(args):
+    server_dir = Path(args.server_dir)
+    world_dir = get_world_dir(server_dir)
+    if not world_dir.exists():
+        print(f"Error: world directory not found: {world_dir}")
+        sys.exit(1)
+
+    store = BackupStore(args.dest)
+    with store.lock():
+        take_backup(store, world_dir, args)
+
+
+def take_backup(store, world_dir, args):
+    previous = store.latest_manifest()
+    previous_files = previous['files'] if previous else {}
+
+    compressor = zstandard.ZstdCompressor(level=args.level)
+    throttle = Throttle(args.max_rate * 1024 * 1024 if args.max_rate else 0)
+    backup_id = store.new_backup_id()
+    started = time.monotonic()
+
+    files = {}
+    changed = 0
+    stored_bytes = 0
+    total_bytes = 0
+
+    def snapshot():
+        nonlocal changed, stored_bytes, total_bytes
+
+        for path, rel_path in walk_world(world_dir):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+
+            total_bytes += stat.st_size
+            entry = previous_files.get(rel_path)
+
+            if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+                files[rel_path] = entry
+                continue
+
+            digest, stored = store.store_file(path, compressor, throttle)
+            files[rel_path] = {
+                'size': stat.st_size,
+                'mtime_ns': stat.st_mtime_ns,
+                'sha256': digest,
+            }
+            changed += 1
+            stored_bytes += stored
+
+    print(f"Backing up {world_dir} to {store.root}...")
+    if args.no_rcon:
+        snapshot()
+    else:
+        with RconSession(load_env_vars()):
+            snapshot()
+
+    manifest = {
+        'id': backup_id,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'world': world_dir.name,
+        'files': files,
+    }
+
+    store.manifests_dir.mkdir(parents=True, exist_ok=True)
+    with open(store.manifests_dir / f"{backup_id}.json", 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+    elapsed = time.monotonic() - started
+    print(f"✓ Backup {backup_id}: {len(files)} files, {changed} changed, "
+          f"{stored_bytes / 1024 / 1024:.1f} MiB new data "
+          f"(world is {total_bytes / 1024 / 1024:.1f} MiB) in {elapsed:.1f}s")
+
+
+def list_backups(args):
+    store = BackupStore(args.dest)
+    manifests = store.manifests()
+    if not manifests:
+        print("No backups found")
+        return
+
+    for path in manifests:
+        with open(path, 'r') as f:
+            manifest = json.load(f)
+        size = sum(entry['size'] for entry in manifest['files'].values())
+        print(f"{manifest['id']}  {manifest['world']}  {len(manifest['files'])} files  "
+              f"{size / 1024 / 1024:.1f} MiB")
+
+
+def restore(args):
+    store = BackupStore(args.dest)
+    manifest = store.load_manifest(args.backup_id)
+    destination = Path(args.destination)
+
+    if destination.exists() and any(destination.iterdir()):
+        print(f"Error: {destination} is not empty")
+        sys.exit(1)
+
+    decompressor = zstandard.ZstdDecompressor()
+
+    for rel_path, entry in manifest['files'].items():
+        target = destination / rel_path
+        target.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(store.object_path(entry['sha256']), 'rb') as src, open(target, 'wb') as out:
+            decompressor.copy_stream(src, out)
+
+        os.utime(target, ns=(entry['mtime_ns'], entry['mtime_ns']))
+
+    print(f"✓ Restored {len(manifest['files'])} files from {args.backup_id} to {destination}")
+
+
+def prune(args):
+    if args.keep < 1:
+        print("Error: --keep must be at least 1")
+        sys.exit(1)
+
+    store = BackupStore(args.dest)
+    with store.lock():
+        prune_store(store, args.keep)
+
+
+def prune_store(store, keep):
+    manifests = store.manifests()
+    for path in manifests[:-keep]:
+        path.unlink()
+        print(f"✓ Removed backup {path.stem}")
+
+    # Objects no remaining manifest points at can go
+    referenced = set()
+    for path in store.manifests():
+        with open(path, 'r') as f:
+            referenced.update(entry['sha256'] for entry in json.load(f)['files'].values())
+
+    removed = 0
+    freed = 0
+    for object_path in store.objects_dir.glob("*/*.zst"):
+        if object_path.name[:-len(".zst")] not in referenced:
+            freed += object_path.stat().st_size
+            object_path.unlink()
+            removed += 1
+
+    print(f"✓ Removed {removed} unreferenced objects ({freed / 1024 / 1024:.1f} MiB)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incremental, deduplicated world backups")
+    parser.add_argument('--dest', default='backups', help="Backup store directory")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    backup_parser = subparsers.add_parser('backup', help="Take a backup")
+    backup_parser.add_argument('--server-dir', default='server')
+    backup_parser.add_argument('--no-rcon', action='store_true',
+                               help="Don't pause autosave (only safe while the server is stopped)")
+    backup_parser.add_argument('--max-rate', type=float, default=50,
+                               help="Read rate limit in MiB/s (0 for unlimited)")
+    backup_parser.add_argument('--level', type=int, default=3, help="zstd compression level")
+
+    subparsers.add_parser('list', help="List backups")
+
+    restore_parser = subparsers.add_parser('restore', help="Restore a backup into an empty directory")
+    restore_parser.add_argument('backup_id')
+    restore_parser.add_argument('destination')
+
+    prune_parser = subparsers.add_parser('prune', help="Delete old backups and unreferenced data")
+    prune_parser.add_argument('--keep', type=int, required=True)
+
+    args = parser.parse_args()
+
+    commands = {
+        'backup': backup,
+        'list': list_backups,
+        'restore': restore,
+        'prune': prune,
+    }
+    commands[args.command](args)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\n\nCancelled by user.")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n\nError: {e}")
+        sys.exit(1)
@@ -0,0 +1,65 @@
+"""fetch_mods() against a local HTTP stand-in serving jars with injected latency."""
+
+import os
+import json
+import time
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from common import load_script, quiet
+
+MOD_COUNT = 8
+MOD_SIZE = 512 * 1024
+LATENCY = 0.05
+
+
+class ModHandler(BaseHTTPRequestHandler):
+    payload = os.urandom(MOD_SIZE)
+
+    def do_GET(self):
+        time.sleep(LATENCY)
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/java-archive')
+        self.send_header('Content-Length', str(len(self.payload)))
+        self.end_headers()
+        self.wfile.write(self.payload)
+
+    def log_message(self, *args):
+        pass
+
+
+def run(timer):
+    fetch_mods = load_script("fetch-mods.py").fetch_mods
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), ModHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    work_dir = Path(tempfile.mkdtemp(prefix="void-mc-bench-"))
+    try:
+        config_file = work_dir / "mods.json"
+        with open(config_file, 'w') as f:
+            json.dump({'mods': [
+                {'name': f'mod-{i}', 'url': f"{base_url}/data/mod-{i}%2Bmc1.21.jar"}
+                for i in range(MOD_COUNT)
+            ]}, f)
+
+        output_dir = work_dir / "mods"
+
+        def fetch_cold():
+            shutil.rmtree(output_dir, ignore_errors=True)
+            with quiet():
+                fetch_mods(config_file, output_dir)
+
+        def fetch_warm():
+            with quiet():
+                fetch_mods(config_file, output_dir)
+
+        timer.measure("fetch_mods.cold", fetch_cold, network=True)
+        timer.measure("fetch_mods.already_downloaded", fetch_warm)
+    finally:
+        server.shutdown()
+        shutil.rmtree(work_dir, ignore_errors=True)
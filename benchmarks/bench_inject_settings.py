@@ -0,0 +1,50 @@
+"""inject-server-settings.py on a large server.properties."""
+
+import os
+import json
+import shutil
+import tempfile
+from pathlib import Path
+
+from common import load_script, quiet
+
+PROPERTY_COUNT = 20000
+
+
+def run(timer):
+    inject = load_script("inject-server-settings.py")
+
+    work_dir = Path(tempfile.mkdtemp(prefix="void-mc-bench-"))
+    previous_cwd = os.getcwd()
+    try:
+        (work_dir / "server").mkdir()
+        properties = "\n".join(f"custom-property-{i}=value-{i}" for i in range(PROPERTY_COUNT))
+        original = f"#Minecraft server properties\ndifficulty=easy\n{properties}\n"
+
+        settings = {
+            'minecraft_version': '1.21.11',
+            'difficulty': 'hard',
+            'max_players': 20,
+            'motd': 'Benchmark',
+        }
+        settings.update({f'extra_setting_{i}': i for i in range(PROPERTY_COUNT // 10)})
+        with open(work_dir / "server-settings.json", 'w') as f:
+            json.dump(settings, f)
+
+        os.chdir(work_dir)
+        properties_path = work_dir / "server" / "server.properties"
+
+        def inject_changes():
+            properties_path.write_text(original)
+            with quiet():
+                inject.main()
+
+        def inject_up_to_date():
+            with quiet():
+                inject.main()
+
+        timer.measure("inject_settings.with_changes", inject_changes)
+        timer.measure("inject_settings.up_to_date", inject_up_to_date)
+    finally:
+        os.chdir(previous_cwd)
+        shutil.rmtree(work_dir, ignore_errors=True)
@@ -0,0 +1,40 @@
+"""PlayerEventsMonitor._process_line() over a recorded server log."""
+
+from common import import_bot_module
+
+# Representative latest.log excerpt: mostly noise, a few events of each kind
+RECORDED_LOG = """\
+[12:00:01] [Server thread/INFO]: Starting minecraft server version 1.21.11
+[12:00:01] [Server thread/INFO]: Loading properties
+[12:00:02] [Server thread/INFO]: Preparing level "world"
+[12:00:09] [Server thread/INFO]: Done (7.812s)! For help, type "help"
+[12:01:15] [User Authenticator #1/INFO]: UUID of player Steve is 8667ba71-b85a-4004-af54-457a9734eed7
+[12:01:15] [Server thread/INFO]: Steve[/100.64.0.2:51234] logged in with entity id 123 at (0.5, 64.0, 0.5)
+[12:01:15] [Server thread/INFO]: Steve joined the game
+[12:02:40] [Server thread/INFO]: <Steve> anyone on?
+[12:03:02] [Server thread/WARN]: Can't keep up! Is the server overloaded? Running 2150ms or 43 ticks behind
+[12:04:11] [Server thread/INFO]: Steve was slain by Zombie
+[12:05:00] [Server thread/INFO]: [Steve: Set own game mode to Creative Mode]
+[12:05:30] [Chunky-minecraft:overworld Thread/INFO]: [Chunky] Task running for minecraft:overworld. Processed: 1024 chunks (2.56%), ETA: 0:05:12, Rate: 120.5 cps, Current: 10, -3
+[12:06:12] [Server thread/INFO]: Steve fell from a high place
+[12:07:45] [Server thread/INFO]: Alex joined the game
+[12:08:01] [Server thread/INFO]: Alex tried to swim in lava
+[12:08:30] [Server thread/INFO]: Saving the game (this may take a moment!)
+[12:08:31] [Server thread/INFO]: Saved the game
+[12:09:59] [Server thread/INFO]: Alex left the game
+[12:10:00] [Server thread/INFO]: Steve left the game
+""".splitlines(keepends=True)
+
+REPEAT = 500
+
+
+def run(timer):
+    PlayerEventsMonitor = import_bot_module("utils.player_events_monitor").PlayerEventsMonitor
+    monitor = PlayerEventsMonitor(None, 0, "/nonexistent/latest.log")
+    lines = RECORDED_LOG * REPEAT
+
+    def process_all():
+        for line in lines:
+            monitor._process_line(line)
+
+    timer.measure("log_parsing.process_line", process_all, ops=len(lines))
@@ -0,0 +1,163 @@
+"""RCON command and status ping round-trips against a local fake Minecraft server."""
+
+import json
+import asyncio
+import struct
+import threading
+import socketserver
+
+from common import import_bot_module
+
+PASSWORD = "bench"
+ROUND_TRIPS = 200
+
+STATUS = {
+    'version': {'name': '1.21.11', 'protocol': 774},
+    'players': {'max': 20, 'online': 2, 'sample': [
+        {'name': 'Steve', 'id': '8667ba71-b85a-4004-af54-457a9734eed7'},
+        {'name': 'Anonymous Player', 'id': '00000000-0000-0000-0000-000000000000'},
+    ]},
+    'description': {'text': 'A Minecraft Server'},
+}
+
+
+def _recv_exact(sock, size):
+    data = b''
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError
+        data += chunk
+    return data
+
+
+class FakeRconHandler(socketserver.BaseRequestHandler):
+    """
+    Speaks just enough of the RCON protocol: login (type 3), commands (type 2)
+    and "Unknown request" for anything else, like the server.
+    """
+
+    def _send(self, request_id, packet_type, body):
+        payload = struct.pack('<ii', request_id, packet_type) + body.encode() + b'\x00\x00'
+        self.request.sendall(struct.pack('<i', len(payload)) + payload)
+
+    def handle(self):
+        try:
+            while True:
+                length, = struct.unpack('<i', _recv_exact(self.request, 4))
+                payload = _recv_exact(self.request, length)
+                request_id, packet_type = struct.unpack('<ii', payload[:8])
+                body = payload[8:-2].decode()
+
+                if packet_type == 3:
+                    self._send(request_id if body == PASSWORD else -1, 2, '')
+                elif packet_type == 2:
+                    self._send(request_id, 0, f"There are 2 of a max of 20 players online: Steve, {body}")
+                else:
+                    self._send(request_id, 0, f"Unknown request {packet_type:x}")
+        except (ConnectionError, struct.error):
+            pass
+
+
+def _read_varint(sock):
+    value = 0
+    for shift in range(0, 35, 7):
+        byte = _recv_exact(sock, 1)[0]
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value
+    raise ValueError("varint too long")
+
+
+def _varint(value):
+    out = b''
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out += bytes([byte | 0x80])
+        else:
+            return out + bytes([byte])
+
+
+class FakeStatusHandler(socketserver.BaseRequestHandler):
+    """Server List Ping: handshake, status request, optional ping."""
+
+    def _send_packet(self, packet_id, data):
+        body = _varint(packet_id) + data
+        self.request.sendall(_varint(len(body)) + body)
+
+    def handle(self):
+        status = json.dumps(STATUS).encode()
+        try:
+            while True:
+                length = _read_varint(self.request)
+                packet = _recv_exact(self.request, length)
+                packet_id = packet[0]
+
+                if packet_id == 0 and length == 1:
+                    self._send_packet(0, _varint(len(status)) + status)
+                elif packet_id == 1:
+                    self._send_packet(1, packet[1:])
+                # Handshakes (packet 0 with a body) need no reply
+        except (ConnectionError, ValueError, IndexError):
+            pass
+
+
+class ThreadingServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def _serve(handler):
+    server = ThreadingServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run(timer):
+    try:
+        ThreadSafeMCRcon = import_bot_module("utils.thread_safe_mcrcon").ThreadSafeMCRcon
+    except ImportError as e:
+        timer.skip("rcon.command", f"{e.name} not installed")
+    else:
+        server = _serve(FakeRconHandler)
+        port = server.server_address[1]
+
+        # Same as the command-line tools: a fresh connection per command
+        def rcon_round_trips():
+            for _ in range(ROUND_TRIPS):
+                with ThreadSafeMCRcon('127.0.0.1', PASSWORD, port=port) as mcr:
+                    mcr.command("list")
+
+        # Same as MinecraftServer.command: one connection kept open
+        def rcon_reused_round_trips():
+            with ThreadSafeMCRcon('127.0.0.1', PASSWORD, port=port) as mcr:
+                for _ in range(ROUND_TRIPS):
+                    mcr.command("list")
+
+        timer.measure("rcon.command", rcon_round_trips, ops=ROUND_TRIPS, network=True)
+        timer.measure("rcon.command.reused", rcon_reused_round_trips, ops=ROUND_TRIPS, network=True)
+        server.shutdown()
+
+    try:
+        from mcstatus import JavaServer
+    except ImportError:
+        timer.skip("status.ping.async", "mcstatus not installed")
+        return
+
+    server = _serve(FakeStatusHandler)
+    address = f"127.0.0.1:{server.server_address[1]}"
+
+    # Same as MinecraftServer.status: resolved once, then async pings. (It
+    # was status.ping while it timed a blocking lookup and ping each.)
+    async def ping_all():
+        java_server = await JavaServer.async_lookup(address)
+        for _ in range(ROUND_TRIPS):
+            await java_server.async_status()
+
+    def status_round_trips():
+        asyncio.run(ping_all())
+
+    timer.measure("status.ping.async", status_round_trips, ops=ROUND_TRIPS, network=True)
+    server.shutdown()
@@ -0,0 +1,82 @@
+"""Load test of the bot's webhook endpoint with signed requests from a local client."""
+
+import json
+import time
+import asyncio
+import secrets
+import hashlib
+import threading
+
+from common import import_bot_module
+
+REQUESTS = 2000
+CONCURRENCY = 64
+
+
+class FakeClient:
+    """Stands in for the bot: counts what would go to the notifier."""
+
+    def __init__(self):
+        self.notifications = 0
+
+    async def notify(self, message, channel_id=None):
+        self.notifications += 1
+
+
+def run(timer):
+    try:
+        webhooks = import_bot_module("utils.webhooks")
+        import aiohttp
+    except ImportError as e:
+        timer.skip("webhook.event", f"{e.name} not installed")
+        return
+
+    token = secrets.token_urlsafe(32)
+    signing_key = secrets.token_bytes(32)
+    client = FakeClient()
+    receiver = webhooks.WebhookReceiver(client, [{
+        "name": "bench",
+        "token_sha256": hashlib.sha256(token.encode()).hexdigest(),
+        "signing_key": signing_key.hex(),
+        "channel_id": 1,
+        # Only the request path is measured, not the rate limit
+        "rate_per_minute": 1e9,
+        "burst": REQUESTS,
+    }], port=0)
+
+    # The receiver gets its own event loop thread, like the bot's
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    asyncio.run_coroutine_threadsafe(receiver.serve(), loop).result()
+    url = f"http://127.0.0.1:{receiver.port}/webhook/event"
+
+    async def post_events():
+        requests = []
+        for _ in range(REQUESTS):
+            body = json.dumps({
+                "timestamp": int(time.time()),
+                "event_type": "player_join",
+                "data": {"player": "Steve"},
+                # Identical requests would be rejected as replays
+                "nonce": secrets.token_hex(8),
+            }, sort_keys=True).encode()
+            requests.append((body, webhooks.sign(signing_key, body)))
+
+        connector = aiohttp.TCPConnector(limit=CONCURRENCY)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            async def post(body, signature):
+                async with session.post(url, data=body, headers={
+                    "Authorization": f"Bearer {token}",
+                    "X-VMC-Signature": signature,
+                    "Content-Type": "application/json",
+                }) as response:
+                    await response.read()
+                    if response.status != 200:
+                        raise RuntimeError(f"webhook answered {response.status}")
+
+            await asyncio.gather(*(post(body, signature) for body, signature in requests))
+
+    timer.measure("webhook.event", lambda: asyncio.run(post_events()), ops=REQUESTS, network=True)
+
+    asyncio.run_coroutine_threadsafe(receiver.runner.cleanup(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
@@ -0,0 +1,33 @@
+"""Helpers shared by the benchmark modules."""
+
+import io
+import sys
+import contextlib
+import importlib.util
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+BOT_DIR = REPO_ROOT / "discord-bot"
+
+
+def load_script(filename):
+    """Import one of the top-level scripts, whose names aren't valid module names."""
+    path = REPO_ROOT / filename
+    spec = importlib.util.spec_from_file_location(path.stem.replace('-', '_'), path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def import_bot_module(name):
+    """Import a module from discord-bot/ the way the bot does (e.g. 'utils.mc')."""
+    if str(BOT_DIR) not in sys.path:
+        sys.path.insert(0, str(BOT_DIR))
+    return importlib.import_module(name)
+
+
+@contextlib.contextmanager
+def quiet():
+    """Swallow the progress output the scripts print."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Benchmark Runner
+
+Runs the benchmarks in this directory, stores the results per git commit in
+benchmarks/results/ and compares them against a chosen earlier commit.
+Usage: ./benchmarks/run.py [--baseline COMMIT] [--threshold PERCENT] [--only NAME]
+
+With --baseline, exits with status 1 if any benchmark got slower than that
+commit's results by more than the threshold, so it can gate a commit or CI
+job. Benchmarks that go over local sockets are noisier and get a wider
+threshold (--network-threshold).
+
+A benchmark's name stands for what it measures: when a change makes it
+time something else, it gets a new name, so it isn't compared with
+results that aren't comparable.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import importlib
+import statistics
+import subprocess
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+RESULTS_DIR = BENCH_DIR / "results"
+
+# Benchmark modules, each with a run(timer) function
+MODULES = [
+    "bench_log_parsing",
+    "bench_fetch_mods",
+    "bench_inject_settings",
+    "bench_server_protocols",
+    "bench_webhooks",
+]
+
+
+class Timer:
+    """Times callables and collects per-operation results."""
+
+    def __init__(self, repeat):
+        self.repeat = repeat
+        self.results = {}
+
+    def measure(self, name, fn, ops=1, network=False):
+        """
+        Run fn once to warm up, then repeat times; fn performs ops operations
+        per call. network marks benchmarks timing socket round trips.
+        """
+        fn()
+        timings = []
+        for _ in range(self.repeat):
+            started = time.perf_counter()
+            fn()
+            timings.append((time.perf_counter() - started) / ops)
+
+        median = statistics.median(timings)
+        self.results[name] = {
+            'seconds_per_op': median,
+            'ops_per_second': 1 / median if median else 0.0,
+            'spread': (max(timings) - min(timings)) / median if median else 0.0,
+            'network': network,
+        }
+        print(f"  {name:<40} {format_duration(median):>12}/op  {1 / median if median else 0:>12.0f} ops/s")
+
+    def skip(self, name, reason):
+        print(f"  {name:<40} skipped ({reason})")
+
+
+def format_duration(seconds):
+    for unit, scale in (('s', 1), ('ms', 1e3), ('µs', 1e6)):
+        if seconds * scale >= 1:
+            return f"{seconds * scale:.2f}{unit}"
+    return f"{seconds * 1e9:.0f}ns"
+
+
+def git_commit():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, check=True, cwd=BENCH_DIR).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"],
+                               capture_output=True, text=True, cwd=BENCH_DIR).stdout.strip()
+        return f"{commit}-dirty" if dirty else commit
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def stored_commits(current):
+    runs = sorted((p for p in RESULTS_DIR.glob("*.json") if p.stem != current), key=os.path.getmtime)
+    return [p.stem for p in runs]
+
+
+def load_baseline(commit):
+    path = RESULTS_DIR / f"{commit}.json"
+    if not path.exists():
+        print(f"Error: no stored results for {commit}")
+        sys.exit(1)
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def compare(results, baseline, threshold, network_threshold):
+    print()
+    print(f"Compared with {baseline['commit']} "
+          f"(thresholds: {threshold:.0f}%, {network_threshold:.0f}% over sockets):")
+    regressions = []
+
+    for name, result in sorted(results.items()):
+        old = baseline['results'].get(name)
+        if not old:
+            print(f"  {name:<40} new")
+            continue
+
+        change = (result['seconds_per_op'] - old['seconds_per_op']) / old['seconds_per_op'] * 100
+        limit = network_threshold if result.get('network') else threshold
+        marker = ""
+        if change > limit:
+            marker = "  ⚠️ regression"
+            regressions.append(name)
+        elif change < -limit:
+            marker = "  ✓ faster"
+        print(f"  {name:<40} {change:+7.1f}%{marker}")
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run and compare tooling benchmarks")
+    parser.add_argument('--baseline', help="Commit to compare against (see benchmarks/results/)")
+    parser.add_argument('--threshold', type=float, default=15.0, help="Allowed slowdown in percent")
+    parser.add_argument('--network-threshold', type=float, default=50.0,
+                        help="Allowed slowdown in percent for benchmarks over local sockets")
+    parser.add_argument('--repeat', type=int, default=15, help="Timed runs per benchmark (the median counts)")
+    parser.add_argument('--only', help="Only run benchmark modules containing this string")
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(BENCH_DIR))
+    timer = Timer(args.repeat)
+    commit = git_commit()
+
+    print(f"Running benchmarks at {commit}")
+    for module_name in MODULES:
+        if args.only and args.only not in module_name:
+            continue
+        print()
+        print(f"{module_name}:")
+        importlib.import_module(module_name).run(timer)
+
+    # Partial runs (--only) update the stored results instead of replacing them
+    RESULTS_DIR.mkdir(exist_ok=True)
+    results_path = RESULTS_DIR / f"{commit}.json"
+    stored = {}
+    if results_path.exists():
+        with open(results_path, 'r') as f:
+            stored = json.load(f)['results']
+    stored.update(timer.results)
+    with open(results_path, 'w') as f:
+        json.dump({'commit': commit, 'created': time.time(), 'results': stored}, f, indent=2)
+
+    if not args.baseline:
+        print()
+        others = stored_commits(commit)
+        if others:
+            print(f"Stored results for {', '.join(others[-5:])}; compare with --baseline <commit>.")
+        else:
+            print("No earlier results to compare against yet.")
+        return
+
+    regressions = compare(timer.results, load_baseline(args.baseline), args.threshold, args.network_threshold)
+    if regressions:
+        print()
+        print(f"✗ {len(regressions)} benchmark(s) regressed by more than the threshold")
+        sys.exit(1)
+
+    print()
+    print("✓ No regressions")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\n\nCancelled by user.")
+        sys.exit(1)
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Chunky Pre-generation Script
+
+Starts a Chunky pre-generation task over RCON and follows it until it
+finishes, pausing while players are online or the server's MSPT is high.
+Usage: ./chunky-pregen.py <radius> [--world minecraft:overworld] [--center X Z]
+
+The same orchestrator backs the bot's /pregen command (discord-bot/utils/chunky.py).
+"""
+
+import sys
+import asyncio
+import argparse
+from pathlib import Path
+
+try:
+    import mcrcon  # noqa: F401
+except ImportError:
+    print("Error: mcrcon not installed. Please run 'make install-deps' first.")
+    sys.exit(1)
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / "discord-bot"))
+from utils.chunky import ChunkyOrchestrator  # noqa: E402
+from utils.thread_safe_mcrcon import ThreadSafeMCRcon  # noqa: E402
+
+
+def load_env_vars():
+    """Load environment variables from .env file."""
+    env_path = Path(".env")
+    env_vars = {}
+
+    if not env_path.exists():
+        return env_vars
+
+    with open(env_path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            # Skip comments and empty lines
+            if not line or line.startswith('#'):
+                continue
+
+            # Parse KEY=VALUE
+            if '=' in line:
+                key, value = line.split('=', 1)
+                env_vars[key.strip()] = value.strip()
+
+    return env_vars
+
+
+def make_rcon_runner(env_vars):
+    """Return a command runner bound to the RCON settings in .env."""
+    password = env_vars.get('RCON_PASSWORD')
+    if not password:
+        print("Error: RCON_PASSWORD not set in .env")
+        sys.exit(1)
+
+    host = env_vars.get('RCON_HOST', '127.0.0.1')
+    port = int(env_vars.get('RCON_PORT', '25575'))
+
+    def run_command(command):
+        # Called through asyncio.to_thread; plain MCRcon's SIGALRM timeout
+        # only works on the main thread
+        with ThreadSafeMCRcon(host, password, port=port) as mcr:
+            return mcr.command(command)
+
+    return run_command
+
+
+async def print_notification(message):
+    print(message.replace('`', ''))
+
+
+async def pregen(args, run_command):
+    orchestrator = ChunkyOrchestrator(
+        run_command,
+        args.log,
+        notify=print_notification,
+        pause_mspt=args.pause_mspt,
+        resume_mspt=args.resume_mspt,
+        pause_for_players=not args.ignore_players,
+    )
+
+    await orchestrator.start(args.world, args.radius, args.center[0], args.center[1], args.shape)
+    run_task = asyncio.create_task(orchestrator.run())
+
+    try:
+        while orchestrator.running:
+            await asyncio.sleep(args.report_interval)
+            if orchestrator.running:
+                print()
+                print(orchestrator.status_text().replace('`', ''))
+    except asyncio.CancelledError:
+        pass
+    finally:
+        if orchestrator.running:
+            print("\nPausing Chunky so the task can be continued later...")
+            await asyncio.to_thread(run_command, "chunky pause")
+            orchestrator.running = False
+        await run_task
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throttled Chunky pre-generation over RCON")
+    parser.add_argument('radius', type=int, help="Radius in blocks")
+    parser.add_argument('--world', default='minecraft:overworld', help="Dimension to generate")
+    parser.add_argument('--center', type=int, nargs=2, default=[0, 0], metavar=('X', 'Z'))
+    parser.add_argument('--shape', default='square', help="Chunky shape (square, circle, ...)")
+    parser.add_argument('--log', default='server/logs/latest.log', help="Server log to follow")
+    parser.add_argument('--pause-mspt', type=float, default=45.0, help="Pause when MSPT reaches this")
+    parser.add_argument('--resume-mspt', type=float, default=30.0, help="Resume when MSPT drops below this")
+    parser.add_argument('--ignore-players', action='store_true', help="Keep generating while players are online")
+    parser.add_argument('--report-interval', type=int, default=30, help="Seconds between progress reports")
+    args = parser.parse_args()
+
+    run_command = make_rcon_runner(load_env_vars())
+    asyncio.run(pregen(args, run_command))
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\n\nCancelled by user.")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n\nError: {e}")
+        sys.exit(1)
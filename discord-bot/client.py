@@ -1,8 +1,39 @@
+import time
 import discord
+from pathlib import Path
 from discord import app_commands
 from utils.status_monitor import ServerStatusMonitor
 from utils.player_events_monitor import PlayerEventsMonitor
-from config import NOTIFICATIONS_CHANNEL_ID, SERVER_LOG_PATH
+from utils.chunky import ChunkyOrchestrator
+from utils.process_monitor import ProcessResourceMonitor, find_server_pid, process_rss_mb
+from utils.loop_monitor import EventLoopMonitor
+from utils.notifier import Notifier
+from utils.restart_scheduler import RestartScheduler
+from utils.webhooks import WebhookReceiver
+from utils.lag_sampler import LagSampler, ENTITY_TYPES
+from utils.mc import SERVERS
+from config import (
+    NOTIFICATIONS_CHANNEL_ID, SERVER_LOG_PATH,
+    PREGEN_PAUSE_MSPT, PREGEN_RESUME_MSPT, PREGEN_PAUSE_FOR_PLAYERS,
+    SERVER_PROCESS_MATCH, RSS_GROWTH_ALERT_MB_PER_HOUR, LOOP_STALL_THRESHOLD_MS,
+    RESTART_INTERVAL_HOURS, RESTART_MAX_RSS_MB, RESTART_MAX_MSPT,
+    RESTART_WAIT_FOR_EMPTY_MINUTES, RESTART_COUNTDOWN_SECONDS,
+    LAG_SAMPLE_INTERVAL, LAG_ALERT_MSPT, LAG_BREAKDOWN_INTERVAL, LAG_ENTITY_TYPES,
+    WEBHOOKS, WEBHOOK_HOST, WEBHOOK_PORT, WEBHOOK_RATE_PER_MINUTE, WEBHOOK_BURST,
+)
+
+class TimedCommandTree(app_commands.CommandTree):
+    """Times each slash command's handler for the loop monitor, including the ones that fail."""
+    async def interaction_check(self, interaction):
+        # Runs right before the command's callback
+        interaction.extras['started'] = time.monotonic()
+        return True
+
+    async def on_error(self, interaction, error):
+        name = interaction.command.qualified_name if interaction.command else "unknown"
+        self.client.loop_monitor.record_command(name, interaction, failed=True)
+        await super().on_error(interaction, error)
+
 
 class Void(discord.Client):
     """
@@ -16,9 +47,77 @@ class Void(discord.Client):
     """
     def __init__(self):
         super().__init__(intents=discord.Intents.default())
-        self.tree = app_commands.CommandTree(self)
-        self.status_monitor = ServerStatusMonitor(self, NOTIFICATIONS_CHANNEL_ID)
-        self.player_events_monitor = PlayerEventsMonitor(self, NOTIFICATIONS_CHANNEL_ID, SERVER_LOG_PATH)
+        self.tree = TimedCommandTree(self)
+        self.notifier = Notifier(self, NOTIFICATIONS_CHANNEL_ID)
+
+        # One set of monitors per server; they all share the notifier
+        self.status_monitors = {}
+        self.player_events_monitors = {}
+        self.pregens = {}
+        self.restart_schedulers = {}
+        self.lag_samplers = {}
+        self.process_monitors = {}
+        for name, server in SERVERS.items():
+            channel_id = server.notifications_channel_id or NOTIFICATIONS_CHANNEL_ID
+            log_path = server.log_path or SERVER_LOG_PATH
+            # A single server keeps the original death counts file
+            death_counts_file = (
+                f"discord-bot/data/death_counts-{name}.json" if len(SERVERS) > 1
+                else "discord-bot/data/death_counts.json"
+            )
+
+            self.status_monitors[name] = ServerStatusMonitor(self, channel_id, server)
+            self.player_events_monitors[name] = PlayerEventsMonitor(
+                self, channel_id, log_path, label=server.label, death_counts_file=death_counts_file,
+            )
+            self.pregens[name] = ChunkyOrchestrator(
+                server.command, log_path,
+                notify=lambda message, server=server, channel_id=channel_id: self.notify(server.label + message, channel_id),
+                pause_mspt=PREGEN_PAUSE_MSPT, resume_mspt=PREGEN_RESUME_MSPT,
+                pause_for_players=PREGEN_PAUSE_FOR_PLAYERS,
+            )
+            self.restart_schedulers[name] = RestartScheduler(
+                self, channel_id, server,
+                # The server directory, next to logs/
+                marker_path=Path(log_path).parent.parent / ".restart-requested",
+                status_monitor=self.status_monitors[name],
+                interval_hours=RESTART_INTERVAL_HOURS,
+                max_rss_mb=RESTART_MAX_RSS_MB, max_mspt=RESTART_MAX_MSPT,
+                # The JVM running in this server's directory; None for remote servers
+                rss_mb=lambda server_dir=Path(log_path).parent.parent: self._server_rss_mb(server_dir),
+                wait_for_empty=RESTART_WAIT_FOR_EMPTY_MINUTES,
+                countdown=RESTART_COUNTDOWN_SECONDS,
+            )
+            if LAG_SAMPLE_INTERVAL > 0:
+                self.lag_samplers[name] = LagSampler(
+                    self, channel_id, server, check_interval=LAG_SAMPLE_INTERVAL, alert_mspt=LAG_ALERT_MSPT,
+                    entity_types=LAG_ENTITY_TYPES or ENTITY_TYPES, breakdown_interval=LAG_BREAKDOWN_INTERVAL,
+                    samples_file=f"discord-bot/data/lag_samples-{name}.jsonl",
+                )
+            # Remote servers have no local JVM; their monitor just reports it as not found
+            self.process_monitors[name] = ProcessResourceMonitor(
+                self, channel_id, SERVER_PROCESS_MATCH, cwd=Path(log_path).parent.parent, label=server.label,
+                rss_growth_mb_per_hour=RSS_GROWTH_ALERT_MB_PER_HOUR,
+            )
+
+        self.loop_monitor = EventLoopMonitor(slow_threshold=LOOP_STALL_THRESHOLD_MS / 1000)
+        # Remote servers push their events here instead of the bot reading their logs
+        self.webhooks = WebhookReceiver(
+            self, WEBHOOKS, host=WEBHOOK_HOST, port=WEBHOOK_PORT,
+            rate_per_minute=WEBHOOK_RATE_PER_MINUTE, burst=WEBHOOK_BURST,
+        ) if WEBHOOKS else None
+
+    def _server_rss_mb(self, server_dir):
+        # Looked up on each check (one /proc scan a minute), so a restarted
+        # server or a reused pid can't be mistaken for it
+        pid = find_server_pid(SERVER_PROCESS_MATCH, cwd=server_dir)
+        return process_rss_mb(pid) if pid else None
+
+    async def notify(self, message, channel_id=None):
+        self.notifier.send(message, channel_id)
+
+    async def on_app_command_completion(self, interaction, command):
+        self.loop_monitor.record_command(command.qualified_name, interaction)
 
     # Setup code after the client logs in but before it connects to the Discord
     # gateway and starts dispatching events
@@ -31,8 +130,27 @@ class Void(discord.Client):
             print(f"Failed to sync commands: {e}")
 
         print("Bot logged in and setup hook is running!")
-        self.status_monitor.start()
-        print("Server status monitoring started")
-        self.player_events_monitor.start()
+        self.loop_monitor.start()
+        print("Event loop monitoring started")
+        self.notifier.start()
+        for monitor in self.status_monitors.values():
+            monitor.start()
+        print(f"Server status monitoring started for {', '.join(SERVERS)}")
+        for monitor in self.player_events_monitors.values():
+            monitor.start()
         print("Player events monitoring started")
+        for monitor in self.process_monitors.values():
+            monitor.start()
+        print("Server process monitoring started")
+        for scheduler in self.restart_schedulers.values():
+            scheduler.start()
+        print("Restart scheduling started")
+        for sampler in self.lag_samplers.values():
+            sampler.start()
+        if self.lag_samplers:
+            print("Lag sampling started")
+        if self.webhooks:
+            await self.webhooks.serve()
+            print(f"Webhook endpoint listening on {WEBHOOK_HOST}:{self.webhooks.port} "
+                  f"for {len(WEBHOOKS)} server(s)")
 
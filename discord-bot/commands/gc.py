@@ -0,0 +1,18 @@
+import asyncio
+import discord
+from utils.gc_log import analyze_gc_logs, format_summary
+from config import GC_LOG_PATH
+
+def setup(tree):
+    @tree.command(name="gc", description="Summarize JVM garbage collection on the server")
+    async def gc(interaction: discord.Interaction):
+        # Big logs take a moment to read, so defer and parse off the event loop
+        await interaction.response.defer()
+
+        try:
+            summary = await asyncio.to_thread(analyze_gc_logs, GC_LOG_PATH)
+            await interaction.followup.send(f"🗑️ **GC summary**\n```\n{format_summary(summary)}\n```")
+        except FileNotFoundError:
+            await interaction.followup.send("❌ No GC log found. Is the server started with `make run-server`?")
+        except Exception as e:
+            await interaction.followup.send(f"❌ Failed to analyze GC log:\n`{e}`")
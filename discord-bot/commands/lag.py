@@ -0,0 +1,17 @@
+import discord
+from discord import app_commands
+from utils.mc import SERVERS, get_server
+
+SERVER_CHOICES = [app_commands.Choice(name=name, value=name) for name in SERVERS]
+
+def setup(tree, client):
+    @tree.command(name="lag", description="Show loaded entities per dimension and what grew the most")
+    @app_commands.describe(server="Server to check (default: the first one)")
+    @app_commands.choices(server=SERVER_CHOICES)
+    async def lag(interaction: discord.Interaction, server: str = None):
+        # Reads the sampler's latest sample, so this is instant
+        sampler = client.lag_samplers.get(get_server(server).name)
+        if sampler is None:
+            await interaction.response.send_message("Lag sampling is off (`LAG_SAMPLE_INTERVAL=0`).")
+            return
+        await interaction.response.send_message(f"🐢 **Loaded entities**\n```\n{sampler.status_text()}\n```")
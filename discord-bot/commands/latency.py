@@ -0,0 +1,8 @@
+import discord
+
+def setup(tree, client):
+    @tree.command(name="latency", description="Show bot event loop lag, stalls and command latency")
+    async def latency(interaction: discord.Interaction):
+        await interaction.response.send_message(
+            f"⏱️ **Bot latency**\n```\n{client.loop_monitor.report()}\n```"
+        )
@@ -0,0 +1,67 @@
+import asyncio
+import discord
+from pathlib import Path
+from discord import app_commands
+from utils.mc import SERVERS, get_server
+from utils.log_index import LogIndex, parse_time
+from config import SERVER_LOG_PATH
+
+SERVER_CHOICES = [app_commands.Choice(name=name, value=name) for name in SERVERS]
+
+# Room for the summary line within Discord's 2000 characters
+MAX_RESULTS_LENGTH = 1800
+MAX_LINE_LENGTH = 200
+
+def _search(logs_dir, query, since, until, limit):
+    index = LogIndex(logs_dir)
+    # Picks up logs rotated since the last search
+    index.update()
+    return index.search(query, since=since, until=until, limit=limit)
+
+def setup(tree):
+    logs = app_commands.Group(name="logs", description="Server log search")
+
+    @logs.command(name="search", description="Search the current and archived server logs")
+    @app_commands.describe(
+        query="Words to find (whole words; end one with * for a prefix)",
+        since="Only lines after this: 7d, 12h, 2025-01-31, ...",
+        until="Only lines before this",
+        limit="Number of (newest) lines to show",
+        server="Server whose logs to search (default: the first one)",
+    )
+    @app_commands.choices(server=SERVER_CHOICES)
+    async def search(interaction: discord.Interaction, query: str, since: str = None, until: str = None,
+                     limit: app_commands.Range[int, 1, 50] = 20, server: str = None):
+        await interaction.response.defer()
+        logs_dir = Path(get_server(server).log_path or SERVER_LOG_PATH).parent
+
+        try:
+            since_time = parse_time(since) if since else None
+            until_time = parse_time(until, end=True) if until else None
+            # Indexing new archives reads them, so keep it off the event loop
+            result = await asyncio.to_thread(_search, logs_dir, query, since_time, until_time, limit)
+        except Exception as e:
+            await interaction.followup.send(f"❌ Log search failed:\n`{e}`")
+            return
+
+        summary = (f"🔎 {len(result['matches'])} match(es) for `{query}`, "
+                   f"{result['files_scanned']} of {result['files_total']} log file(s) read")
+        if not result['matches']:
+            await interaction.followup.send(summary)
+            return
+
+        # Newest lines matter most, so drop from the oldest end when it doesn't fit
+        lines = []
+        length = 0
+        for timestamp, _, line in reversed(result['matches']):
+            entry = f"{timestamp} {line[:MAX_LINE_LENGTH]}".replace("```", "'''")
+            if length + len(entry) + 1 > MAX_RESULTS_LENGTH:
+                summary += f" (showing the newest {len(lines)})"
+                break
+            lines.append(entry)
+            length += len(entry) + 1
+
+        results = "\n".join(reversed(lines))
+        await interaction.followup.send(f"{summary}\n```\n{results}\n```")
+
+    tree.add_command(logs)
@@ -1,21 +1,25 @@
 import asyncio
 import discord
 from discord import app_commands
-from utils.mc import run_mc_command
-import asyncio
+from utils.mc import SERVERS, get_server
+
+SERVER_CHOICES = [app_commands.Choice(name=name, value=name) for name in SERVERS]
 
 def setup(tree):
     @tree.command(name="player", description="Run a Carpet /player command")
-    @app_commands.describe(name="Bot name", x="X Coordinate", y="Y Coordinate", z="Z Coordinate")
-    async def player(interaction: discord.Interaction, name: str, x: float, y: float, z: float):
+    @app_commands.describe(name="Bot name", x="X Coordinate", y="Y Coordinate", z="Z Coordinate",
+                           server="Server to spawn on (default: the first one)")
+    @app_commands.choices(server=SERVER_CHOICES)
+    async def player(interaction: discord.Interaction, name: str, x: float, y: float, z: float, server: str = None):
         await interaction.response.defer()
+        mc_server = get_server(server)
         mc_command = f"/player {name} spawn at {x} {y} {z}"
         game_mode = f"/gamemode survival {name}"
 
         try:
-            await asyncio.to_thread(run_mc_command, mc_command)
+            await asyncio.to_thread(mc_server.command, mc_command)
             await asyncio.sleep(1)  # 1 second (20 ticks)
-            await asyncio.to_thread(run_mc_command, game_mode)
+            await asyncio.to_thread(mc_server.command, game_mode)
 
             await interaction.followup.send(
                 f"✅ Command executed:\n"
@@ -0,0 +1,52 @@
+import asyncio
+import discord
+from discord import app_commands
+from utils.mc import SERVERS, get_server
+
+SERVER_CHOICES = [app_commands.Choice(name=name, value=name) for name in SERVERS]
+
+def setup(tree, client):
+    pregen = app_commands.Group(name="pregen", description="Chunky world pre-generation")
+
+    @pregen.command(name="start", description="Start a throttled Chunky pre-generation")
+    @app_commands.describe(
+        radius="Radius in blocks",
+        world="Dimension to generate (default minecraft:overworld)",
+        center_x="Center X coordinate",
+        center_z="Center Z coordinate",
+        server="Server to generate on (default: the first one)",
+    )
+    @app_commands.choices(server=SERVER_CHOICES)
+    async def start(interaction: discord.Interaction, radius: int,
+                    world: str = "minecraft:overworld", center_x: int = 0, center_z: int = 0,
+                    server: str = None):
+        await interaction.response.defer()
+        orchestrator = client.pregens[get_server(server).name]
+
+        try:
+            await orchestrator.start(world, radius, center_x, center_z)
+            asyncio.create_task(orchestrator.run())
+            await interaction.followup.send(
+                f"✅ Pre-generation started for `{world}`\n"
+                "It pauses automatically while players are online or MSPT is high."
+            )
+        except Exception as e:
+            await interaction.followup.send(f"❌ Failed to start pre-generation:\n`{e}`")
+
+    @pregen.command(name="status", description="Show pre-generation progress")
+    @app_commands.choices(server=SERVER_CHOICES)
+    async def status(interaction: discord.Interaction, server: str = None):
+        await interaction.response.send_message(client.pregens[get_server(server).name].status_text())
+
+    @pregen.command(name="cancel", description="Cancel the running pre-generation")
+    @app_commands.choices(server=SERVER_CHOICES)
+    async def cancel(interaction: discord.Interaction, server: str = None):
+        await interaction.response.defer()
+
+        try:
+            await client.pregens[get_server(server).name].cancel()
+            await interaction.followup.send("🛑 Pre-generation cancelled")
+        except Exception as e:
+            await interaction.followup.send(f"❌ Failed to cancel pre-generation:\n`{e}`")
+
+    tree.add_command(pregen)
@@ -0,0 +1,34 @@
+import asyncio
+import discord
+from pathlib import Path
+from discord import app_commands
+from utils.mc import SERVERS, get_server
+from utils.spark import run_profiler, summarize_profile, format_summary
+from config import SERVER_LOG_PATH
+
+SERVER_CHOICES = [app_commands.Choice(name=name, value=name) for name in SERVERS]
+
+def setup(tree):
+    @tree.command(name="profile", description="Profile the server with spark and show where tick time goes")
+    @app_commands.describe(
+        seconds="How long to sample (default 30)",
+        server="Server to profile (default: the first one)",
+    )
+    @app_commands.choices(server=SERVER_CHOICES)
+    async def profile(interaction: discord.Interaction, seconds: app_commands.Range[int, 10, 300] = 30,
+                      server: str = None):
+        await interaction.response.defer()
+        mc_server = get_server(server)
+        # spark saves profiles to config/spark/ in the server directory, next to logs/
+        spark_dir = Path(mc_server.log_path or SERVER_LOG_PATH).parent.parent / "config" / "spark"
+
+        try:
+            await interaction.followup.send(f"⏱️ Profiling {mc_server.name} for {seconds}s...")
+            path = await run_profiler(mc_server, spark_dir, seconds)
+            # Big profiles take a moment to decode, so keep it off the event loop
+            summary = await asyncio.to_thread(summarize_profile, path)
+            await interaction.followup.send(
+                f"🔥 **Profile of {mc_server.name}** (`{path.name}`)\n```\n{format_summary(summary)}\n```"
+            )
+        except Exception as e:
+            await interaction.followup.send(f"❌ Profiling failed:\n`{e}`")
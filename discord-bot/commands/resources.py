@@ -0,0 +1,16 @@
+import discord
+from discord import app_commands
+from utils.mc import SERVERS, get_server
+
+SERVER_CHOICES = [app_commands.Choice(name=name, value=name) for name in SERVERS]
+
+def setup(tree, client):
+    @tree.command(name="resources", description="Show the server JVM's memory, CPU and disk usage")
+    @app_commands.describe(server="Server to check (default: the first one)")
+    @app_commands.choices(server=SERVER_CHOICES)
+    async def resources(interaction: discord.Interaction, server: str = None):
+        # Reads the monitor's latest sample, so this is instant
+        monitor = client.process_monitors[get_server(server).name]
+        await interaction.response.send_message(
+            f"📊 **Server process**\n```\n{monitor.status_text()}\n```"
+        )
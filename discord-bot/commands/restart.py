@@ -0,0 +1,36 @@
+import discord
+from discord import app_commands
+from utils.mc import SERVERS, get_server
+
+SERVER_CHOICES = [app_commands.Choice(name=name, value=name) for name in SERVERS]
+
+def setup(tree, client):
+    restart = app_commands.Group(name="restart", description="Player-friendly server restarts")
+
+    @restart.command(name="schedule", description="Restart once the server is empty (or after a countdown)")
+    @app_commands.describe(reason="Shown in the notifications", server="Server to restart (default: the first one)")
+    @app_commands.choices(server=SERVER_CHOICES)
+    async def schedule(interaction: discord.Interaction, reason: str = "manual restart", server: str = None):
+        scheduler = client.restart_schedulers[get_server(server).name]
+        if scheduler.state != "idle":
+            await interaction.response.send_message(f"⚠️ A restart is already in progress ({scheduler.state})")
+            return
+
+        scheduler.request(f"{reason} (requested by {interaction.user.display_name})")
+        await interaction.response.send_message("🔁 Restart requested; it starts within a minute")
+
+    @restart.command(name="status", description="Show restart schedule and thresholds")
+    @app_commands.choices(server=SERVER_CHOICES)
+    async def status(interaction: discord.Interaction, server: str = None):
+        scheduler = client.restart_schedulers[get_server(server).name]
+        await interaction.response.send_message(f"```\n{scheduler.status_text()}\n```")
+
+    @restart.command(name="cancel", description="Cancel a pending restart")
+    @app_commands.choices(server=SERVER_CHOICES)
+    async def cancel(interaction: discord.Interaction, server: str = None):
+        if client.restart_schedulers[get_server(server).name].cancel():
+            await interaction.response.send_message("🛑 Cancelling the restart")
+        else:
+            await interaction.response.send_message("Nothing to cancel; no restart is pending")
+
+    tree.add_command(restart)
@@ -1,18 +1,25 @@
 import discord
+from discord import app_commands
 from itertools import count
 import re
-from utils.mc import get_server_status
+from utils.mc import SERVERS, get_server
+
+SERVER_CHOICES = [app_commands.Choice(name=name, value=name) for name in SERVERS]
 
 def setup(tree):
     @tree.command(name="status", description="Check void-mc server status")
-    async def status(interaction: discord.Interaction):
+    @app_commands.describe(server="Server to check (default: the first one)")
+    @app_commands.choices(server=SERVER_CHOICES)
+    async def status(interaction: discord.Interaction, server: str = None):
         # Discord expects a response within 3 sec, but our ping (unrelated to
         # the ping command) might take longer. Therefore, defer() tells Discord
         # to chill tf out — we got this.
         await interaction.response.defer()
 
+        mc_server = get_server(server)
+
         try:
-            server_status = get_server_status()
+            server_status = await mc_server.status()
             player_list = server_status.players.sample
 
             # Replaces each "Anonymous Player" in text with a sequentially
@@ -29,7 +36,7 @@ def setup(tree):
                 )
 
             msg = (
-                f"🟢**Server is online!**\n"
+                f"🟢**{mc_server.name} is online!**\n"
                 f"Players: {server_status.players.online}/{server_status.players.max}"
             )
 
@@ -40,5 +47,5 @@ def setup(tree):
 
         except Exception:
             await interaction.followup.send(
-                "🔴**Server is offline or unreachable.**"
+                f"🔴**{mc_server.name} is offline or unreachable.**"
             )
\ No newline at end of file
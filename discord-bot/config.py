@@ -1,4 +1,5 @@
 from dotenv import load_dotenv
+import json
 import os
 
 load_dotenv()
@@ -11,3 +12,71 @@ SERVER_LOG_PATH = os.getenv("SERVER_LOG_PATH", "../server/logs/latest.log")
 
 RCON_HOST = SERVER_IP
 RCON_PASSWORD = os.getenv("RCON_PASSWORD")
+
+# Servers the bot watches. SERVERS_FILE lists them (see servers.example.json);
+# without it, the single server from the variables above is used.
+SERVERS_FILE = os.getenv("SERVERS_FILE", "servers.json")
+
+def _load_servers():
+    if os.path.exists(SERVERS_FILE):
+        with open(SERVERS_FILE, 'r') as f:
+            return json.load(f)
+
+    return [{
+        "name": "void-mc",
+        "address": f"{SERVER_IP}:{SERVER_PORT}",
+        "rcon_host": RCON_HOST,
+        "rcon_password": RCON_PASSWORD,
+        "log_path": SERVER_LOG_PATH,
+    }]
+
+SERVERS = _load_servers()
+
+# Chunky pre-generation throttling
+PREGEN_PAUSE_MSPT = float(os.getenv("PREGEN_PAUSE_MSPT", "45"))
+PREGEN_RESUME_MSPT = float(os.getenv("PREGEN_RESUME_MSPT", "30"))
+PREGEN_PAUSE_FOR_PLAYERS = os.getenv("PREGEN_PAUSE_FOR_PLAYERS", "true").lower() == "true"
+
+GC_LOG_PATH = os.getenv("GC_LOG_PATH", "../server/logs/gc.log")
+
+# Server JVM resource monitoring (/proc)
+SERVER_PROCESS_MATCH = os.getenv("SERVER_PROCESS_MATCH", "void-mc-launcher.jar")
+RSS_GROWTH_ALERT_MB_PER_HOUR = float(os.getenv("RSS_GROWTH_ALERT_MB_PER_HOUR", "256"))
+
+# Event loop stalls longer than this are recorded with the blocking stack
+LOOP_STALL_THRESHOLD_MS = float(os.getenv("LOOP_STALL_THRESHOLD_MS", "250"))
+
+# Scheduled restarts (0 disables each trigger). The server has to run under
+# `make serve` to come back up after a restart.
+RESTART_INTERVAL_HOURS = float(os.getenv("RESTART_INTERVAL_HOURS", "0"))
+RESTART_MAX_RSS_MB = float(os.getenv("RESTART_MAX_RSS_MB", "0"))
+RESTART_MAX_MSPT = float(os.getenv("RESTART_MAX_MSPT", "0"))
+RESTART_WAIT_FOR_EMPTY_MINUTES = float(os.getenv("RESTART_WAIT_FOR_EMPTY_MINUTES", "30"))
+RESTART_COUNTDOWN_SECONDS = int(os.getenv("RESTART_COUNTDOWN_SECONDS", "300"))
+
+# Entity/chunk sampling for lag attribution (LAG_SAMPLE_INTERVAL=0 turns
+# sampling off, LAG_ALERT_MSPT=0 just the alert). Each type in LAG_ENTITY_TYPES
+# (comma-separated, empty for the built-in list) is one more entity scan per
+# dimension, taken every LAG_BREAKDOWN_INTERVAL seconds or while MSPT is high.
+LAG_SAMPLE_INTERVAL = int(os.getenv("LAG_SAMPLE_INTERVAL", "60"))
+LAG_ALERT_MSPT = float(os.getenv("LAG_ALERT_MSPT", "40"))
+LAG_BREAKDOWN_INTERVAL = int(os.getenv("LAG_BREAKDOWN_INTERVAL", "600"))
+LAG_ENTITY_TYPES = [t.strip().removeprefix("minecraft:")
+                    for t in os.getenv("LAG_ENTITY_TYPES", "").split(",") if t.strip()]
+
+# Webhook ingestion for remote servers (see INTEGRATION_PLAN.md). WEBHOOKS_FILE
+# lists the registered tokens (see webhooks.example.json); without it the
+# endpoint isn't started.
+WEBHOOKS_FILE = os.getenv("WEBHOOKS_FILE", "webhooks.json")
+WEBHOOK_HOST = os.getenv("WEBHOOK_HOST", "127.0.0.1")
+WEBHOOK_PORT = int(os.getenv("WEBHOOK_PORT", "8080"))
+WEBHOOK_RATE_PER_MINUTE = float(os.getenv("WEBHOOK_RATE_PER_MINUTE", "100"))
+WEBHOOK_BURST = int(os.getenv("WEBHOOK_BURST", "20"))
+
+def _load_webhooks():
+    if not os.path.exists(WEBHOOKS_FILE):
+        return []
+    with open(WEBHOOKS_FILE, 'r') as f:
+        return json.load(f)
+
+WEBHOOKS = _load_webhooks()
@@ -1,11 +1,19 @@
 from client import Void
 from config import DISCORD_TOKEN
-from commands import status, player, ping
+from commands import status, player, ping, pregen, gc, resources, latency, restart, logs, profile, lag
 
 client = Void()
 
 status.setup(client.tree)
 player.setup(client.tree)
 ping.setup(client.tree, client)
+pregen.setup(client.tree, client)
+gc.setup(client.tree)
+resources.setup(client.tree, client)
+latency.setup(client.tree, client)
+restart.setup(client.tree, client)
+logs.setup(client.tree)
+profile.setup(client.tree)
+lag.setup(client.tree, client)
 
 client.run(DISCORD_TOKEN)
@@ -0,0 +1,274 @@
+import asyncio
+import re
+import time
+from pathlib import Path
+
+# Chunky progress lines, e.g.
+# [Chunky] Task running for minecraft:overworld. Processed: 1024 chunks (2.56%), ETA: 0:05:12, Rate: 120.5 cps, ...
+PROGRESS_PATTERN = re.compile(
+    r'\[Chunky\] Task running for (\S+)\. Processed: (\d+) chunks \(([\d.]+)%\)'
+)
+FINISHED_PATTERN = re.compile(r'\[Chunky\] Task finished for (\S+)\.(?: Processed: (\d+) chunks)?')
+CANCELLED_PATTERN = re.compile(r'\[Chunky\] Task (?:cancelled|stopped) for (\S+)\.')
+
+# Responses to `tick query` and `list`, which are vanilla and work over RCON
+MSPT_PATTERN = re.compile(r'Average time per tick: ([\d.]+)ms')
+PLAYERS_PATTERN = re.compile(r'There are (\d+) of a max')
+
+
+class ChunkyOrchestrator:
+    """
+    Drives a Chunky pre-generation task over RCON.
+
+    Progress is read by tailing the server log (Chunky reports there, not in
+    the RCON response). Every check_interval seconds the server's MSPT and
+    player count are polled, and the task is paused when either crosses its
+    threshold and continued once things calm down. resume_mspt is lower than
+    pause_mspt so the task doesn't flap around a single value.
+
+    run_command is a blocking callable (command -> response text), so the
+    same class works with MinecraftServer.command in the bot and a
+    ThreadSafeMCRcon connection from the CLI. notify is an optional coroutine function
+    that gets human readable state changes.
+    """
+    def __init__(self, run_command, log_path, notify=None, pause_mspt=45.0,
+                 resume_mspt=30.0, pause_for_players=True, check_interval=10):
+        self.run_command = run_command
+        self.log_path = Path(log_path)
+        self.notify = notify
+        self.pause_mspt = pause_mspt
+        self.resume_mspt = resume_mspt
+        self.pause_for_players = pause_for_players
+        self.check_interval = check_interval
+
+        self.running = False
+        self.paused = False
+        self.pause_reason = None
+        self.world = None
+        self.processed = 0
+        self.percent = 0.0
+        self.mspt = None
+        self.players = None
+        self.last_position = 0
+
+        # Throughput is measured over time spent actually generating, so
+        # pauses don't drag the rate (and inflate the ETA)
+        self.active_seconds = 0.0
+        self.active_since = None
+        self.start_processed = None
+
+    async def _command(self, command):
+        return await asyncio.to_thread(self.run_command, command)
+
+    async def _notify(self, message):
+        if self.notify:
+            await self.notify(message)
+
+    def _process_line(self, line):
+        match = PROGRESS_PATTERN.search(line)
+        if match:
+            return ("progress", match.group(1), int(match.group(2)), float(match.group(3)))
+
+        match = FINISHED_PATTERN.search(line)
+        if match:
+            processed = int(match.group(2)) if match.group(2) else None
+            return ("finished", match.group(1), processed)
+
+        match = CANCELLED_PATTERN.search(line)
+        if match:
+            return ("cancelled", match.group(1))
+
+        return None
+
+    def _read_new_lines(self):
+        if not self.log_path.exists():
+            return []
+
+        with open(self.log_path, 'r', encoding='utf-8', errors='ignore') as f:
+            f.seek(0, 2)
+            # Log was rotated, start over from the top of the new file
+            if f.tell() < self.last_position:
+                self.last_position = 0
+            f.seek(self.last_position)
+            lines = f.readlines()
+            self.last_position = f.tell()
+
+        return lines
+
+    def _skip_to_log_end(self):
+        if self.log_path.exists():
+            with open(self.log_path, 'rb') as f:
+                f.seek(0, 2)
+                self.last_position = f.tell()
+
+    def chunks_per_second(self):
+        active = self.active_seconds
+        if self.active_since is not None:
+            active += time.monotonic() - self.active_since
+        if active <= 0 or self.start_processed is None:
+            return 0.0
+        return (self.processed - self.start_processed) / active
+
+    def eta_seconds(self):
+        rate = self.chunks_per_second()
+        if rate <= 0 or self.percent <= 0:
+            return None
+        total = self.processed / (self.percent / 100)
+        return max(total - self.processed, 0) / rate
+
+    def status_text(self):
+        if not self.running:
+            return "No pre-generation task is running."
+
+        state = f"⏸️ Paused ({self.pause_reason})" if self.paused else "▶️ Running"
+        eta = self.eta_seconds()
+        eta_text = time.strftime('%H:%M:%S', time.gmtime(eta)) if eta is not None else "unknown"
+        mspt_text = f"{self.mspt:.1f}ms" if self.mspt is not None else "unknown"
+
+        return (
+            f"{state} — `{self.world}`\n"
+            f"Processed: {self.processed} chunks ({self.percent:.2f}%)\n"
+            f"Rate: {self.chunks_per_second():.1f} chunks/s, ETA: {eta_text}\n"
+            f"MSPT: {mspt_text}, players online: {self.players if self.players is not None else 'unknown'}"
+        )
+
+    def _mark_active(self, active):
+        now = time.monotonic()
+        if active and self.active_since is None:
+            self.active_since = now
+        elif not active and self.active_since is not None:
+            self.active_seconds += now - self.active_since
+            self.active_since = None
+
+    async def start(self, world, radius, center_x=0, center_z=0, shape="square"):
+        if self.running:
+            raise RuntimeError("A pre-generation task is already running")
+
+        self._skip_to_log_end()
+
+        await self._command(f"chunky world {world}")
+        await self._command(f"chunky shape {shape}")
+        await self._command(f"chunky center {center_x} {center_z}")
+        await self._command(f"chunky radius {radius}")
+        response = await self._command("chunky start")
+        # Chunky asks for confirmation when a task for this world already exists
+        if response and "confirm" in response.lower():
+            await self._command("chunky confirm")
+
+        self.running = True
+        self.paused = False
+        self.pause_reason = None
+        self.world = world
+        self.processed = 0
+        self.percent = 0.0
+        self.start_processed = None
+        self.active_seconds = 0.0
+        self.active_since = None
+        self._mark_active(True)
+
+        await self._notify(
+            f"🗺️ Pre-generation started for `{world}` (radius {radius} around {center_x}, {center_z})"
+        )
+
+    async def cancel(self):
+        if not self.running:
+            return
+
+        await self._command("chunky cancel")
+        await self._command("chunky confirm")
+        self._finish()
+        await self._notify(f"🛑 Pre-generation cancelled for `{self.world}`")
+
+    def _finish(self):
+        self._mark_active(False)
+        self.running = False
+        self.paused = False
+
+    async def _poll_server(self):
+        response = await self._command("tick query")
+        match = MSPT_PATTERN.search(response or "")
+        self.mspt = float(match.group(1)) if match else None
+
+        response = await self._command("list")
+        match = PLAYERS_PATTERN.search(response or "")
+        self.players = int(match.group(1)) if match else None
+
+    def _pause_reason(self):
+        """Return why the task should be paused right now, or None."""
+        if self.pause_for_players and self.players:
+            return f"{self.players} player(s) online"
+
+        if self.mspt is not None:
+            # Hysteresis: once paused for MSPT, stay paused until below resume_mspt
+            limit = self.resume_mspt if self.paused else self.pause_mspt
+            if self.mspt >= limit:
+                return f"MSPT {self.mspt:.1f}ms"
+
+        return None
+
+    async def _apply_throttle(self):
+        reason = self._pause_reason()
+
+        if reason and not self.paused:
+            await self._command("chunky pause")
+            self.paused = True
+            self.pause_reason = reason
+            self._mark_active(False)
+            await self._notify(f"⏸️ Pre-generation paused: {reason}")
+
+        elif not reason and self.paused:
+            await self._command("chunky continue")
+            self.paused = False
+            self.pause_reason = None
+            self._mark_active(True)
+            await self._notify("▶️ Pre-generation resumed")
+
+        elif reason:
+            self.pause_reason = reason
+
+    async def _handle_event(self, event):
+        event_type = event[0]
+
+        if event_type == "progress":
+            _, world, processed, percent = event
+            # A continued task starts from its saved checkpoint, not zero
+            if self.start_processed is None:
+                self.start_processed = processed
+            self.world = world
+            self.processed = processed
+            self.percent = percent
+
+        elif event_type == "finished":
+            if event[2] is not None:
+                self.processed = event[2]
+            self.percent = 100.0
+            self._finish()
+            await self._notify(
+                f"✅ Pre-generation finished for `{event[1]}` "
+                f"({self.processed} chunks, {self.chunks_per_second():.1f} chunks/s)"
+            )
+
+        elif event_type == "cancelled":
+            self._finish()
+
+    async def run(self):
+        """Track the running task until Chunky reports it finished or cancelled."""
+        last_check = 0.0
+
+        while self.running:
+            try:
+                lines = await asyncio.to_thread(self._read_new_lines)
+                for line in lines:
+                    event = self._process_line(line)
+                    if event:
+                        await self._handle_event(event)
+
+                if self.running and time.monotonic() - last_check >= self.check_interval:
+                    last_check = time.monotonic()
+                    await self._poll_server()
+                    await self._apply_throttle()
+
+            except Exception as e:
+                print(f"Error in pre-generation loop: {e}")
+
+            await asyncio.sleep(1)
@@ -0,0 +1,241 @@
+import glob
+import math
+import os
+import re
+from array import array
+
+# Unified JVM logging (-Xlog:gc*) with the time,uptime,level,tags decorators, e.g.
+# [2025-01-01T12:00:00.000+0000][123.456s][info][gc] GC(42) Pause Young (Normal) (G1 Evacuation Pause) 812M->301M(2048M) 12.345ms
+UPTIME_PATTERN = re.compile(r'\[(\d+(?:\.\d+)?)s\]')
+TAGS_PATTERN = re.compile(r'\]\[(gc(?:,[a-z]+)*)\s*\]')
+PAUSE_PATTERN = re.compile(r'GC\((\d+)\) (?:\w: )?(Pause [A-Za-z ]+?)(?: \(.*\))?(?: [\d.]+[KMG].*)? (\d+(?:\.\d+)?)ms\s*$')
+HEAP_PATTERN = re.compile(r'GC\((\d+)\) .*?(\d+)([KMG])(?:\(\d+%\))?->(\d+)([KMG])(?:\(\d+%\))?(?:\((\d+)([KMG])\))?')
+COLLECTOR_PATTERN = re.compile(r'Using (G1|Serial|Parallel|The Z Garbage Collector|Shenandoah)')
+
+UNITS = {'K': 1 / 1024, 'M': 1, 'G': 1024}
+
+
+def _mb(value, unit):
+    return int(value) * UNITS[unit]
+
+
+def _percentile(sorted_values, percent):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, math.ceil(percent / 100 * len(sorted_values)) - 1)
+    return sorted_values[max(index, 0)]
+
+
+def find_gc_logs(path):
+    """The current log plus its rotated siblings (gc.log.0, gc.log.1, ...), oldest first."""
+    files = [p for p in glob.glob(f"{path}*") if os.path.isfile(p)]
+    return sorted(files, key=os.path.getmtime)
+
+
+class GcLogAnalyzer:
+    """
+    Single streaming pass over one or more GC logs.
+
+    Only pause durations are kept (in a compact array, for percentiles);
+    everything else is folded into running totals as lines go by, so memory
+    stays flat no matter how big the logs get.
+
+    Rotated logs span several JVM runs, and uptime and GC ids start over at
+    each. Whenever uptime goes backwards the totals start over too, so the
+    summary covers the latest run only.
+    """
+    def __init__(self):
+        self.runs = 0
+        self._start_run()
+
+    def _start_run(self):
+        self.runs += 1
+        self.collector = None
+        self.pauses = array('d')
+        self.pause_kinds = {}
+        self.full_gcs = 0
+        self.first_uptime = None
+        self.last_uptime = None
+
+        self.heap_capacity_mb = 0.0
+        self.peak_after_mb = 0.0
+        self.allocated_mb = 0.0
+        self.allocation_seconds = 0.0
+        self.last_after = None
+
+        # Running sums for a least-squares fit of heap-after-GC over uptime
+        self.trend_n = 0
+        self.trend_sx = self.trend_sy = self.trend_sxx = self.trend_sxy = 0.0
+
+        self._last_heap_gc = None
+
+    def feed(self, line):
+        # Cheap filter first; most lines in a gc* log are phase details
+        if 'Pause' not in line and '->' not in line and 'Using' not in line:
+            return
+
+        uptime_match = UPTIME_PATTERN.search(line)
+        uptime = float(uptime_match.group(1)) if uptime_match else None
+        if uptime is not None:
+            # Lines from different threads can be a little out of order; a
+            # new run starts back at a fraction of a second
+            if self.last_uptime is not None and uptime + 1 < self.last_uptime:
+                self._start_run()
+            if self.first_uptime is None:
+                self.first_uptime = uptime
+            self.last_uptime = uptime if self.last_uptime is None else max(self.last_uptime, uptime)
+
+        if self.collector is None:
+            match = COLLECTOR_PATTERN.search(line)
+            if match:
+                self.collector = {'The Z Garbage Collector': 'ZGC'}.get(match.group(1), match.group(1))
+                return
+
+        tags_match = TAGS_PATTERN.search(line)
+        tags = tags_match.group(1) if tags_match else 'gc'
+        if tags not in ('gc', 'gc,phases'):
+            return
+
+        match = PAUSE_PATTERN.search(line)
+        if match:
+            kind = match.group(2).strip()
+            self.pauses.append(float(match.group(3)))
+            self.pause_kinds[kind] = self.pause_kinds.get(kind, 0) + 1
+            if kind.startswith('Pause Full'):
+                self.full_gcs += 1
+
+        if tags != 'gc':
+            return
+
+        match = HEAP_PATTERN.search(line)
+        if match and uptime is not None and match.group(1) != self._last_heap_gc:
+            self._last_heap_gc = match.group(1)
+            self._record_heap(uptime, _mb(match.group(2), match.group(3)),
+                              _mb(match.group(4), match.group(5)),
+                              _mb(match.group(6), match.group(7)) if match.group(6) else None)
+
+    def _record_heap(self, uptime, before, after, capacity):
+        if self.last_after is not None:
+            last_uptime, last_after = self.last_after
+            if uptime > last_uptime and before >= last_after:
+                self.allocated_mb += before - last_after
+                self.allocation_seconds += uptime - last_uptime
+        self.last_after = (uptime, after)
+
+        if capacity:
+            self.heap_capacity_mb = max(self.heap_capacity_mb, capacity)
+        self.peak_after_mb = max(self.peak_after_mb, after)
+
+        hours = uptime / 3600
+        self.trend_n += 1
+        self.trend_sx += hours
+        self.trend_sy += after
+        self.trend_sxx += hours * hours
+        self.trend_sxy += hours * after
+
+    def feed_file(self, path):
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                self.feed(line)
+
+    def heap_trend_mb_per_hour(self):
+        n = self.trend_n
+        denominator = n * self.trend_sxx - self.trend_sx ** 2
+        if n < 3 or denominator == 0:
+            return 0.0
+        return (n * self.trend_sxy - self.trend_sx * self.trend_sy) / denominator
+
+    def summary(self):
+        pauses = sorted(self.pauses)
+        elapsed = (self.last_uptime - self.first_uptime) if self.first_uptime is not None else 0.0
+        total_pause_ms = sum(pauses)
+
+        summary = {
+            'collector': self.collector or 'unknown',
+            'runs': self.runs,
+            'elapsed_seconds': elapsed,
+            'pause_count': len(pauses),
+            'pause_kinds': self.pause_kinds,
+            'full_gcs': self.full_gcs,
+            'pause_ms': {
+                'p50': _percentile(pauses, 50),
+                'p90': _percentile(pauses, 90),
+                'p99': _percentile(pauses, 99),
+                'max': pauses[-1] if pauses else 0.0,
+                'total': total_pause_ms,
+            },
+            'gc_time_percent': total_pause_ms / 10 / elapsed if elapsed else 0.0,
+            'allocation_mb_per_second': self.allocated_mb / self.allocation_seconds if self.allocation_seconds else 0.0,
+            'heap_capacity_mb': self.heap_capacity_mb,
+            'peak_heap_after_gc_mb': self.peak_after_mb,
+            'heap_after_gc_trend_mb_per_hour': self.heap_trend_mb_per_hour(),
+        }
+        summary['recommendations'] = recommend(summary)
+        return summary
+
+
+def recommend(summary):
+    tips = []
+    pause = summary['pause_ms']
+    capacity = summary['heap_capacity_mb']
+    live = summary['peak_heap_after_gc_mb']
+
+    if summary['pause_count'] == 0:
+        return ["No GC pauses found; is -Xlog:gc* enabled?"]
+
+    # G1 and friends want roughly 3x the live set to collect without thrashing
+    if live and capacity and live > capacity * 0.6:
+        suggested = math.ceil(live * 3 / 1024)
+        tips.append(f"Live heap peaks at {live:.0f}MB of {capacity:.0f}MB; raise -Xmx to about {suggested}G.")
+    elif live and capacity and live * 5 < capacity and capacity > 4096:
+        suggested = max(2, math.ceil(live * 3 / 1024))
+        tips.append(f"Live heap never exceeds {live:.0f}MB; -Xmx{suggested}G would be enough.")
+
+    if summary['full_gcs']:
+        tips.append(f"{summary['full_gcs']} full GC(s); these stall the server thread for the whole collection. "
+                    "The heap is too small or fragmented by humongous allocations.")
+
+    if summary['gc_time_percent'] > 5:
+        tips.append(f"{summary['gc_time_percent']:.1f}% of wall time is spent paused; give the heap more headroom.")
+
+    if pause['p99'] > 50 and summary['collector'] in ('G1', 'Parallel', 'Serial', 'unknown'):
+        tips.append(f"p99 pause is {pause['p99']:.0f}ms (a tick is 50ms). Consider ZGC "
+                    "(-XX:+UseZGC -XX:+ZGenerational) for sub-millisecond pauses.")
+
+    if summary['heap_after_gc_trend_mb_per_hour'] > 50 and summary['elapsed_seconds'] > 3 * 3600:
+        tips.append(f"Heap after GC grows by {summary['heap_after_gc_trend_mb_per_hour']:.0f}MB/hour; "
+                    "possible leak (loaded chunks, entities or a mod).")
+
+    if not tips:
+        tips.append("GC looks healthy; stutter is more likely tick overload than GC.")
+
+    return tips
+
+
+def analyze_gc_logs(path):
+    """Analyze a GC log and its rotated siblings; returns the summary dict."""
+    files = find_gc_logs(path)
+    if not files:
+        raise FileNotFoundError(f"no GC logs found at {path}")
+
+    analyzer = GcLogAnalyzer()
+    for file in files:
+        analyzer.feed_file(file)
+    return analyzer.summary()
+
+
+def format_summary(summary):
+    pause = summary['pause_ms']
+    lines = [
+        f"Collector: {summary['collector']} over {summary['elapsed_seconds'] / 3600:.1f}h"
+        + (f" (latest of {summary['runs']} server runs in the logs)" if summary['runs'] > 1 else ""),
+        f"Pauses: {summary['pause_count']} "
+        f"(p50 {pause['p50']:.1f}ms, p90 {pause['p90']:.1f}ms, p99 {pause['p99']:.1f}ms, max {pause['max']:.1f}ms)",
+        f"Time paused: {summary['gc_time_percent']:.2f}%, full GCs: {summary['full_gcs']}",
+        f"Allocation rate: {summary['allocation_mb_per_second']:.0f}MB/s",
+        f"Heap after GC: peak {summary['peak_heap_after_gc_mb']:.0f}MB of {summary['heap_capacity_mb']:.0f}MB, "
+        f"trend {summary['heap_after_gc_trend_mb_per_hour']:+.0f}MB/h",
+        "",
+    ]
+    lines.extend(f"- {tip}" for tip in summary['recommendations'])
+    return "\n".join(lines)
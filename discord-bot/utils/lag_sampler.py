@@ -0,0 +1,317 @@
+import re
+import time
+import json
+import asyncio
+from pathlib import Path
+from collections import deque, Counter
+from utils.chunky import MSPT_PATTERN
+
+DIMENSIONS = ["minecraft:overworld", "minecraft:the_nether", "minecraft:the_end"]
+
+# Entity types that usually pile up in farms or as leftovers (LAG_ENTITY_TYPES
+# overrides them); the rest of each dimension's entities are counted as "other"
+ENTITY_TYPES = [
+    "item", "experience_orb", "arrow", "falling_block",
+    "zombie", "zombified_piglin", "skeleton", "creeper", "slime", "magma_cube", "guardian",
+    "iron_golem", "villager", "cow", "chicken", "sheep", "pig", "bee",
+    "armor_stand", "item_frame", "hopper_minecart", "chest_minecart",
+]
+
+# Responses to `execute if entity`, `forceload query`, Carpet's `spawn mobcaps` and `data get entity ... Pos`
+COUNT_PATTERN = re.compile(r'Test passed, count: (\d+)')
+FORCELOAD_PATTERN = re.compile(r'(?:(\d+)|A) force loaded chunks? (?:were|was) found in \S+ at: (.*)$')
+MOBCAP_PATTERN = re.compile(r'(\w+): (\d+|-)\s*/\s*(\d+)')
+POSITION_PATTERN = re.compile(r'\[(-?[\d.]+)d, (-?[\d.]+)d, (-?[\d.]+)d\]')
+
+# Vanilla's mob cap is 70 monsters per 17x17 = 289 spawnable chunks
+MONSTER_CAP_PER_CHUNK = 70 / 289
+# Random entities looked up per contributor to find where they are
+POSITION_SAMPLES = 5
+
+
+def _short(dimension):
+    return dimension.split(":", 1)[-1]
+
+
+class LagSampler:
+    """
+    Samples what a server has loaded, to find the farm or item pile behind
+    a lag spike.
+
+    Every check_interval seconds it counts the entities per dimension
+    (`execute in <dim> run execute if entity @e`), force-loaded chunks,
+    Carpet's mob caps (which grow with the number of chunks mobs can spawn
+    in; skipped without Carpet) and MSPT. Vanilla has no command that counts
+    entities by type in one pass, so each type in entity_types is one more
+    scan of the dimension's entities on the server thread: the breakdown by
+    type is only taken every breakdown_interval seconds, and on every sample
+    while MSPT is at or above alert_mspt. The commands go over the server's
+    persistent RCON connection, one batch per dimension. A window
+    of samples is kept in memory and appended to samples_file (one JSON
+    line each), so a bot restart picks the window up again.
+
+    When MSPT stays at or above alert_mspt for alert_checks samples, the
+    counts are compared with the calmest earlier breakdown and the types
+    that grew the most are posted, with where a few of their entities are.
+    """
+    def __init__(self, client, channel_id, server, check_interval=60, window=3600, alert_mspt=40,
+                 alert_checks=2, alert_cooldown=1800, dimensions=DIMENSIONS, entity_types=ENTITY_TYPES,
+                 breakdown_interval=600, samples_file=None):
+        self.client = client
+        self.channel_id = channel_id
+        self.server = server
+        self.check_interval = check_interval
+        self.alert_mspt = alert_mspt
+        self.alert_checks = alert_checks
+        self.alert_cooldown = alert_cooldown
+        self.dimensions = dimensions
+        self.entity_types = entity_types
+        self.breakdown_interval = breakdown_interval
+        self.last_breakdown = None
+        self.monitoring = False
+
+        self.window = window
+        self.samples = deque(maxlen=max(2, window // check_interval))
+        self.samples_file = Path(samples_file) if samples_file else None
+        self.appended = 0
+        self.high_mspt_count = 0
+        self.last_alert = None
+        # Carpet's commands answer "Unknown or incomplete command" without it
+        self.has_carpet = True
+
+        self._load_samples()
+
+    @staticmethod
+    def _to_json(sample):
+        record = {key: value for key, value in sample.items() if key != 'time'}
+        record['entities'] = [[dim, entity_type, count] for (dim, entity_type), count in sample['entities'].items()]
+        return json.dumps(record)
+
+    def _load_samples(self):
+        """Samples from the last window, with monotonic times relative to now."""
+        if not self.samples_file:
+            return
+        if not self.samples_file.exists():
+            self.samples_file.parent.mkdir(parents=True, exist_ok=True)
+            return
+
+        now, wall_now = time.monotonic(), time.time()
+        try:
+            with open(self.samples_file, 'r') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # a line cut short by a crash
+                    if wall_now - record['wall_time'] > self.window:
+                        continue
+                    record['time'] = now - (wall_now - record['wall_time'])
+                    record['entities'] = {(dim, t): count for dim, t, count in record['entities']}
+                    # Lines written before breakdowns were spaced out all have one
+                    record.setdefault('breakdown', True)
+                    if 'totals' not in record:
+                        totals = Counter()
+                        for (dim, _), count in record['entities'].items():
+                            totals[dim] += count
+                        record['totals'] = dict(totals)
+                    if record['breakdown']:
+                        self.last_breakdown = record['time']
+                    self.samples.append(record)
+        except (OSError, KeyError, ValueError) as e:
+            print(f"Error loading lag samples ({self.server.name}): {e}")
+        self._rewrite_samples()
+
+    def _rewrite_samples(self):
+        """Replace the file with the samples in memory, so it doesn't grow past the window."""
+        try:
+            tmp_path = self.samples_file.with_suffix(".tmp")
+            tmp_path.write_text("".join(self._to_json(s) + "\n" for s in self.samples))
+            tmp_path.replace(self.samples_file)
+            self.appended = 0
+        except OSError as e:
+            print(f"Error saving lag samples ({self.server.name}): {e}")
+
+    def _store(self, sample):
+        self.samples.append(sample)
+        if not self.samples_file:
+            return
+        if self.appended >= self.samples.maxlen:
+            self._rewrite_samples()
+            return
+        try:
+            with open(self.samples_file, 'a') as f:
+                f.write(self._to_json(sample) + "\n")
+            self.appended += 1
+        except OSError as e:
+            print(f"Error saving lag samples ({self.server.name}): {e}")
+
+    def _dimension_commands(self, dimension, breakdown):
+        prefix = f"execute in {dimension} run"
+        commands = [f"{prefix} execute if entity @e"]
+        if breakdown:
+            commands += [f"{prefix} execute if entity @e[type=minecraft:{t}]" for t in self.entity_types]
+        commands.append(f"{prefix} forceload query")
+        if self.has_carpet:
+            commands.append(f"{prefix} spawn mobcaps")
+        return commands
+
+    def _wants_breakdown(self, now, mspt):
+        if self.alert_mspt and mspt is not None and mspt >= self.alert_mspt:
+            return True
+        return self.last_breakdown is None or now - self.last_breakdown >= self.breakdown_interval
+
+    def _sample(self):
+        """One sample; blocking, so run it in a thread."""
+        sample = {'time': time.monotonic(), 'wall_time': time.time(), 'mspt': None, 'breakdown': False,
+                  'totals': {}, 'entities': {}, 'forceloaded': {}, 'spawn_chunks': {}}
+
+        match = MSPT_PATTERN.search(self.server.command("tick query") or "")
+        if match:
+            sample['mspt'] = float(match.group(1))
+        sample['breakdown'] = self._wants_breakdown(sample['time'], sample['mspt'])
+
+        for dimension in self.dimensions:
+            # A batch per dimension, so other commands aren't held up for the whole sample
+            responses = self.server.commands(self._dimension_commands(dimension, sample['breakdown']))
+            types = len(self.entity_types) if sample['breakdown'] else 0
+            counts = [int(m.group(1)) if (m := COUNT_PATTERN.search(r or "")) else 0
+                      for r in responses[:types + 1]]
+            total, by_type = counts[0], counts[1:]
+            sample['totals'][dimension] = total
+            for entity_type, count in zip(self.entity_types, by_type):
+                if count:
+                    sample['entities'][(dimension, entity_type)] = count
+            other = total - sum(by_type)
+            if sample['breakdown'] and other > 0:
+                sample['entities'][(dimension, "other")] = other
+
+            forceload = FORCELOAD_PATTERN.search(responses[types + 1] or "")
+            if forceload:
+                sample['forceloaded'][dimension] = (int(forceload.group(1) or 1), forceload.group(2))
+
+            if self.has_carpet:
+                mobcaps = responses[-1] or ""
+                if "Unknown or incomplete command" in mobcaps:
+                    self.has_carpet = False
+                for group, _, cap in MOBCAP_PATTERN.findall(mobcaps):
+                    if group == "monster":
+                        sample['spawn_chunks'][dimension] = round(int(cap) / MONSTER_CAP_PER_CHUNK)
+
+        if sample['breakdown']:
+            self.last_breakdown = sample['time']
+        return sample
+
+    def _breakdowns(self):
+        return [s for s in self.samples if s['breakdown']]
+
+    def _baseline(self):
+        """The breakdown with the lowest MSPT before the latest one."""
+        earlier = [s for s in self._breakdowns()[:-1] if s['mspt'] is not None]
+        return min(earlier, key=lambda s: s['mspt']) if earlier else None
+
+    def contributors(self, top=5):
+        """(dimension, type, count, growth) for the types that grew the most since the calmest breakdown."""
+        breakdowns = self._breakdowns()
+        if not breakdowns:
+            return []
+        latest = breakdowns[-1]
+        baseline = self._baseline()
+        ranked = []
+        for (dimension, entity_type), count in latest['entities'].items():
+            growth = count - (baseline['entities'].get((dimension, entity_type), 0) if baseline else 0)
+            ranked.append((dimension, entity_type, count, growth))
+        ranked.sort(key=lambda item: (item[3], item[2]), reverse=True)
+        return ranked[:top]
+
+    def _locate(self, dimension, entity_type):
+        """Rough location of most of a type's entities, from a few random ones."""
+        commands = [f"execute in {dimension} run data get entity "
+                    f"@e[type=minecraft:{entity_type},limit=1,sort=random] Pos"] * POSITION_SAMPLES
+        positions = [tuple(float(v) for v in m.groups())
+                     for r in self.server.commands(commands) if (m := POSITION_PATTERN.search(r or ""))]
+        if not positions:
+            return None
+
+        # Most entities of a farm are in the same area, so take the busiest 128-block cell
+        cells = Counter((int(x // 128), int(z // 128)) for x, _, z in positions)
+        cell, hits = cells.most_common(1)[0]
+        in_cell = [p for p in positions if (int(p[0] // 128), int(p[2] // 128)) == cell]
+        x, y, z = (sum(axis) / len(in_cell) for axis in zip(*in_cell))
+        return f"around {x:.0f} {y:.0f} {z:.0f} ({hits}/{len(positions)} sampled)"
+
+    async def send_notification(self, message):
+        await self.client.notify(self.server.label + message, self.channel_id)
+
+    async def _check_alert(self):
+        mspt = self.samples[-1]['mspt']
+        self.high_mspt_count = self.high_mspt_count + 1 if mspt and mspt >= self.alert_mspt else 0
+        if self.high_mspt_count < self.alert_checks:
+            return
+        now = time.monotonic()
+        if self.last_alert is not None and now - self.last_alert < self.alert_cooldown:
+            return
+        self.last_alert = now
+
+        lines = [f"🐢 **MSPT at {mspt:.1f}ms**, biggest changes in loaded entities:"]
+        ranked = self.contributors()
+        for dimension, entity_type, count, growth in [c for c in ranked if c[3] > 0] or ranked:
+            location = None
+            if entity_type != "other" and growth > 0:
+                location = await asyncio.to_thread(self._locate, dimension, entity_type)
+            lines.append(f"• **{entity_type}** in {_short(dimension)}: {count:,} ({growth:+,})"
+                         + (f", {location}" if location else ""))
+        await self.send_notification("\n".join(lines))
+
+    def status_text(self, top=8):
+        if not self.samples:
+            return "No samples yet."
+
+        latest = self.samples[-1]
+        age = time.monotonic() - latest['time']
+        mspt = f"{latest['mspt']:.1f}ms" if latest['mspt'] is not None else "unknown"
+        lines = [f"MSPT {mspt}, sampled {age:.0f}s ago"]
+
+        for dimension in self.dimensions:
+            details = [f"{latest['totals'].get(dimension, 0):,} entities"]
+            if dimension in latest['forceloaded']:
+                details.append(f"{latest['forceloaded'][dimension][0]} force-loaded chunks")
+            if dimension in latest['spawn_chunks']:
+                details.append(f"~{latest['spawn_chunks'][dimension]:,} mob-spawning chunks")
+            lines.append(f"{_short(dimension)}: {', '.join(details)}")
+
+        baseline = self._baseline()
+        since = f" vs {time.strftime('%H:%M', time.localtime(baseline['wall_time']))}" if baseline else ""
+        lines.append("")
+        breakdowns = self._breakdowns()
+        if breakdowns and breakdowns[-1] is not latest:
+            since += f", counted {time.monotonic() - breakdowns[-1]['time']:.0f}s ago"
+        lines.append(f"Top entity types (change{since}):")
+        for dimension, entity_type, count, growth in self.contributors(top):
+            lines.append(f"  {entity_type:<18} {_short(dimension):<10} {count:>7,} ({growth:+,})")
+        return "\n".join(lines)
+
+    async def monitor_loop(self):
+        self.monitoring = True
+        await self.client.wait_until_ready()
+
+        while self.monitoring:
+            try:
+                sample = await asyncio.to_thread(self._sample)
+                self._store(sample)
+                if self.alert_mspt:
+                    await self._check_alert()
+
+            except OSError:
+                pass  # server is down; the status monitor reports that
+
+            except Exception as e:
+                print(f"Error in lag sampler loop ({self.server.name}): {e}")
+
+            await asyncio.sleep(self.check_interval)
+
+    def start(self):
+        if not self.monitoring:
+            asyncio.create_task(self.monitor_loop())
+
+    def stop(self):
+        self.monitoring = False
@@ -0,0 +1,287 @@
+import re
+import gzip
+import bisect
+import sqlite3
+from pathlib import Path
+from datetime import date, datetime, timedelta
+
+INDEX_NAME = ".log-index.sqlite"
+
+# [12:34:56] [Server thread/INFO]: ...
+TIME_PREFIX = re.compile(r'^\[(\d\d:\d\d:\d\d)\]', re.MULTILINE)
+# Rotated logs: 2025-01-31-1.log.gz, named after the day of their last line
+ARCHIVE_PATTERN = re.compile(r'^(\d{4}-\d{2}-\d{2})-\d+\.log\.gz$')
+# Words that go into the index; shorter ones are only matched while scanning
+TOKEN_PATTERN = re.compile(r'[a-z0-9_]{3,}')
+RELATIVE_TIME_PATTERN = re.compile(r'^(\d+)([mhd])$')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    name TEXT UNIQUE NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    start TEXT NOT NULL,
+    end TEXT NOT NULL,
+    lines INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS postings (
+    token TEXT NOT NULL,
+    file_id INTEGER NOT NULL,
+    PRIMARY KEY (token, file_id)
+) WITHOUT ROWID;
+"""
+
+
+def parse_time(value, end=False):
+    """
+    '7d', '12h', '30m' (ago), '2025-01-31' or '2025-01-31 18:00' as an index
+    timestamp. A bare date as the end of a range includes the whole day.
+    """
+    match = RELATIVE_TIME_PATTERN.match(value.strip())
+    if match:
+        amount, unit = int(match.group(1)), match.group(2)
+        delta = {'m': timedelta(minutes=amount), 'h': timedelta(hours=amount), 'd': timedelta(days=amount)}[unit]
+        return (datetime.now() - delta).strftime("%Y-%m-%d %H:%M:%S")
+
+    try:
+        parsed = datetime.fromisoformat(value.strip())
+    except ValueError:
+        raise ValueError(f"Can't read time '{value}' (use e.g. 7d, 12h, 2025-01-31 or '2025-01-31 18:00')")
+    if end and len(value.strip()) == 10:
+        parsed += timedelta(days=1, seconds=-1)
+    return parsed.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _read(path):
+    data = path.read_bytes()
+    if path.suffix == '.gz':
+        data = gzip.decompress(data)
+    return data.decode('utf-8', errors='replace')
+
+
+def _end_date(path):
+    match = ARCHIVE_PATTERN.match(path.name)
+    if match:
+        return date.fromisoformat(match.group(1))
+    return date.fromtimestamp(path.stat().st_mtime)
+
+
+def _count_rollovers(times):
+    return sum(1 for previous, time in zip(times, times[1:]) if time < previous)
+
+
+class _LineTimes:
+    """
+    Timestamps for lines of one log, looked up by character offset.
+
+    Lines only carry the time of day, so days are counted back from the
+    file's last day wherever the time goes backwards. Lines without a time
+    (stack traces) get the previous line's.
+    """
+    def __init__(self, text, end_date):
+        self.offsets = []
+        self.times = []
+        self.days = []
+        day = 0
+        previous = "00:00:00"
+        for match in TIME_PREFIX.finditer(text):
+            time = match.group(1)
+            if time < previous:
+                day += 1
+            previous = time
+            self.offsets.append(match.start())
+            self.times.append(time)
+            self.days.append(day)
+        self.first_day = end_date - timedelta(days=day)
+
+    def at(self, offset):
+        i = bisect.bisect_right(self.offsets, offset) - 1
+        if i < 0:
+            return f"{self.first_day} 00:00:00"
+        return f"{self.first_day + timedelta(days=self.days[i])} {self.times[i]}"
+
+
+def _parse_query(query):
+    """
+    Each whitespace-separated word has to appear in a line as a whole word
+    (case-insensitive); a trailing * matches it as a prefix instead.
+    """
+    terms = []
+    for word in query.lower().split():
+        prefix = word.endswith('*')
+        word = word.rstrip('*')
+        if not word:
+            continue
+        pattern = r'(?<![a-z0-9_])' + re.escape(word) + ('' if prefix else r'(?![a-z0-9_])')
+        tokens = TOKEN_PATTERN.findall(word)
+        prefix_token = tokens.pop() if prefix and tokens and word.endswith(tokens[-1]) else None
+        terms.append((word, re.compile(pattern), tokens, prefix_token))
+    return terms
+
+
+class LogIndex:
+    """
+    Token index over a server's rotated logs (logs/*.log.gz), kept in an
+    SQLite file next to them.
+
+    update() indexes archives added since the last run (rotated logs never
+    change, so size and mtime identify them) with their time range and the
+    set of words they contain. search() asks the index which archives
+    contain every word of the query within the time range, and only
+    decompresses those, newest first, until it has enough matches.
+    latest.log is still being written, so it's always scanned directly.
+    """
+    def __init__(self, logs_dir):
+        self.logs_dir = Path(logs_dir)
+        self.path = self.logs_dir / INDEX_NAME
+
+    def _connect(self):
+        db = sqlite3.connect(self.path, timeout=30)
+        db.executescript(SCHEMA)
+        return db
+
+    def update(self):
+        """Index new or changed archives; returns (indexed, total)."""
+        # Only latest.log's archives: others (debug-N.log.gz from an older
+        # server/log4j2.xml) repeat its lines in a different format
+        archives = sorted(path for path in self.logs_dir.glob("*.log.gz")
+                          if ARCHIVE_PATTERN.match(path.name))
+        db = self._connect()
+        try:
+            known = {name: (size, mtime_ns) for name, size, mtime_ns
+                     in db.execute("SELECT name, size, mtime_ns FROM files")}
+            indexed = 0
+            for path in archives:
+                stat = path.stat()
+                if known.get(path.name) != (stat.st_size, stat.st_mtime_ns):
+                    self._index_file(db, path, stat)
+                    indexed += 1
+                    # Keep progress if a big first run is interrupted
+                    db.commit()
+
+            names = {path.name for path in archives}
+            for name in set(known) - names:
+                self._remove_file(db, name)
+            db.commit()
+        finally:
+            db.close()
+        return indexed, len(archives)
+
+    def _remove_file(self, db, name):
+        db.execute("DELETE FROM postings WHERE file_id IN (SELECT id FROM files WHERE name = ?)", (name,))
+        db.execute("DELETE FROM files WHERE name = ?", (name,))
+
+    def _index_file(self, db, path, stat):
+        text = _read(path)
+        end_date = _end_date(path)
+        times = TIME_PREFIX.findall(text) or ["00:00:00"]
+        first_day = end_date - timedelta(days=_count_rollovers(times))
+
+        self._remove_file(db, path.name)
+        file_id = db.execute(
+            "INSERT INTO files (name, size, mtime_ns, start, end, lines) VALUES (?, ?, ?, ?, ?, ?)",
+            (path.name, stat.st_size, stat.st_mtime_ns, f"{first_day} {times[0]}", f"{end_date} {times[-1]}",
+             text.count("\n")),
+        ).lastrowid
+
+        # Lines repeat a lot: tokenizing each distinct word once is faster
+        # than running the pattern over the whole text
+        tokens = set(TOKEN_PATTERN.findall(" ".join(set(text.lower().split()))))
+        db.executemany("INSERT INTO postings (token, file_id) VALUES (?, ?)",
+                       ((token, file_id) for token in tokens))
+
+    def _candidates(self, db, terms, since, until):
+        sql = "SELECT name FROM files WHERE 1 = 1"
+        params = []
+        if since:
+            sql += " AND end >= ?"
+            params.append(since)
+        if until:
+            sql += " AND start <= ?"
+            params.append(until)
+
+        for _, _, tokens, prefix_token in terms:
+            for token in set(tokens):
+                sql += " AND id IN (SELECT file_id FROM postings WHERE token = ?)"
+                params.append(token)
+            if prefix_token:
+                # A range over the primary key, so prefixes use the index too
+                sql += " AND id IN (SELECT file_id FROM postings WHERE token >= ? AND token < ?)"
+                params += [prefix_token, prefix_token[:-1] + chr(ord(prefix_token[-1]) + 1)]
+
+        sql += " ORDER BY end DESC"
+        return [self.logs_dir / name for name, in db.execute(sql, params)]
+
+    def _scan(self, path, terms, since, until):
+        text = _read(path)
+        lowered = text.lower()
+        if not all(word in lowered for word, _, _, _ in terms):
+            return []
+        # Lowercasing a few non-ASCII characters changes the length, and with it the offsets
+        original_lines = text.split("\n") if len(lowered) != len(text) else None
+
+        # Only look at lines containing the longest (likely rarest) word
+        anchor = max((word for word, _, _, _ in terms), key=len)
+        line_times = None
+        matches = []
+        position = lowered.find(anchor)
+        while position != -1:
+            start = lowered.rfind("\n", 0, position) + 1
+            end = lowered.find("\n", position)
+            if end == -1:
+                end = len(lowered)
+
+            line = lowered[start:end]
+            if all(word in line and pattern.search(line) for word, pattern, _, _ in terms):
+                if line_times is None:
+                    line_times = _LineTimes(lowered, _end_date(path))
+                time = line_times.at(start)
+                if not (since and time < since or until and time > until):
+                    if original_lines is not None:
+                        line = original_lines[lowered.count("\n", 0, start)]
+                    else:
+                        line = text[start:end]
+                    matches.append((time, path.name, line.rstrip("\r")))
+            position = lowered.find(anchor, end)
+        return matches
+
+    def search(self, query, since=None, until=None, limit=50):
+        """
+        The newest `limit` lines matching query, oldest first, plus how many
+        files were scanned out of how many there are.
+        """
+        terms = _parse_query(query)
+        if not terms:
+            raise ValueError("Empty search query")
+
+        db = self._connect()
+        try:
+            candidates = self._candidates(db, terms, since, until)
+            total = db.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+        finally:
+            db.close()
+
+        latest = self.logs_dir / "latest.log"
+        if latest.exists():
+            candidates.insert(0, latest)
+            total += 1
+
+        matches = []
+        scanned = 0
+        for path in candidates:
+            if len(matches) >= limit:
+                break
+            scanned += 1
+            try:
+                found = self._scan(path, terms, since, until)
+            except FileNotFoundError:
+                continue  # rotated away or deleted since the index was updated
+            matches = found[-(limit - len(matches)):] + matches if found else matches
+
+        return {
+            'matches': matches,
+            'files_scanned': scanned,
+            'files_total': total,
+            'truncated': len(matches) >= limit,
+        }
@@ -0,0 +1,163 @@
+import asyncio
+import bisect
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import datetime, timezone
+
+# Command latency histogram bucket upper bounds, in ms. Discord gives up on
+# interactions that haven't been responded to (or deferred) within 3000ms.
+LATENCY_BUCKETS = [50, 100, 250, 500, 1000, 2000, 3000, 5000, 10000, 30000, float('inf')]
+
+
+class LatencyHistogram:
+    def __init__(self):
+        self.counts = [0] * len(LATENCY_BUCKETS)
+        self.total = 0
+        self.failed = 0
+        self.max_ms = 0.0
+
+    def record(self, ms):
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS, ms)] += 1
+        self.total += 1
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, percent):
+        """Upper bound of the bucket the percentile falls in."""
+        if not self.total:
+            return 0.0
+        target = percent / 100 * self.total
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS, self.counts):
+            seen += count
+            if seen >= target:
+                return min(bound, self.max_ms)
+        return self.max_ms
+
+
+class EventLoopMonitor:
+    """
+    Watches the bot's event loop for stalls.
+
+    A ticker task sleeps for interval and records how late it woke up
+    (the loop lag). A watchdog thread checks the ticker's heartbeat; when the
+    loop hasn't come back within slow_threshold, whatever is blocking it is
+    still on the stack, so the loop thread's current frames are captured.
+    That pins blocking calls (sync I/O, RCON, status pings) to a line.
+
+    Slash command latency (handler start -> done, so defer to followup for
+    deferred commands) is recorded per command, on the bot's monotonic
+    clock, by the client's command tree and on_app_command_completion;
+    failed commands count too.
+    """
+    def __init__(self, interval=0.5, slow_threshold=0.25, max_stalls=20, lag_window=600):
+        self.interval = interval
+        self.slow_threshold = slow_threshold
+        self.monitoring = False
+
+        self.lags = deque(maxlen=max(1, int(lag_window / interval)))
+        self.stalls = deque(maxlen=max_stalls)
+        self.command_latency = {}
+
+        self._heartbeat = time.monotonic()
+        self._loop_thread_id = None
+        self._current_stall = None
+        self._lock = threading.Lock()
+
+    async def _ticker(self):
+        while self.monitoring:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self.lags.append(max(now - expected, 0.0))
+
+            with self._lock:
+                self._heartbeat = now
+                if self._current_stall:
+                    stall = self._current_stall
+                    stall['duration'] = now - stall['started']
+                    print(f"Event loop stalled for {stall['duration'] * 1000:.0f}ms in:\n{stall['stack']}")
+                    self._current_stall = None
+
+    def _watchdog(self):
+        while self.monitoring:
+            time.sleep(self.slow_threshold / 2)
+
+            with self._lock:
+                # The ticker is due once per interval; only time beyond that counts as a stall
+                blocked = time.monotonic() - self._heartbeat - self.interval
+                if blocked < self.slow_threshold or self._current_stall:
+                    continue
+
+                frame = sys._current_frames().get(self._loop_thread_id)
+                if frame is None:
+                    continue
+
+                stack = "".join(traceback.format_stack(frame)[-8:])
+                self._current_stall = {
+                    'at': datetime.now(timezone.utc),
+                    'started': self._heartbeat + self.interval,
+                    'duration': blocked,
+                    'stack': stack,
+                }
+                self.stalls.append(self._current_stall)
+
+    def record_command(self, name, interaction, failed=False):
+        started = interaction.extras.get('started')
+        if started is None:
+            return  # failed before the handler ran (e.g. a check)
+        histogram = self.command_latency.setdefault(name, LatencyHistogram())
+        histogram.record((time.monotonic() - started) * 1000)
+        if failed:
+            histogram.failed += 1
+
+    def lag_stats(self):
+        lags = sorted(self.lags)
+        if not lags:
+            return {'p50': 0.0, 'p99': 0.0, 'max': 0.0}
+        return {
+            'p50': lags[len(lags) // 2] * 1000,
+            'p99': lags[min(len(lags) - 1, int(len(lags) * 0.99))] * 1000,
+            'max': lags[-1] * 1000,
+        }
+
+    def report(self, stall_count=3):
+        lag = self.lag_stats()
+        lines = [
+            f"Event loop lag: p50 {lag['p50']:.1f}ms, p99 {lag['p99']:.1f}ms, max {lag['max']:.1f}ms",
+            f"Stalls over {self.slow_threshold * 1000:.0f}ms: {len(self.stalls)}",
+        ]
+
+        if self.command_latency:
+            lines.append("")
+            lines.append("Command latency (handler start -> done):")
+            for name, histogram in sorted(self.command_latency.items()):
+                lines.append(
+                    f"  /{name}: n={histogram.total} p50≤{histogram.percentile(50):.0f}ms "
+                    f"p95≤{histogram.percentile(95):.0f}ms max {histogram.max_ms:.0f}ms"
+                    + (f" ({histogram.failed} failed)" if histogram.failed else "")
+                )
+
+        for stall in list(self.stalls)[-stall_count:]:
+            # The innermost frame is the one doing the blocking
+            innermost = stall['stack'].strip().splitlines()[-2:]
+            lines.append("")
+            lines.append(f"Stall {stall['duration'] * 1000:.0f}ms at {stall['at']:%H:%M:%S}:")
+            lines.extend(f"  {line.strip()}" for line in innermost)
+
+        return "\n".join(lines)
+
+    def start(self):
+        if self.monitoring:
+            return
+
+        self.monitoring = True
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        asyncio.create_task(self._ticker())
+        threading.Thread(target=self._watchdog, name="loop-watchdog", daemon=True).start()
+
+    def stop(self):
+        self.monitoring = False
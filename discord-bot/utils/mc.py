@@ -1,12 +1,114 @@
+import threading
 from mcstatus import JavaServer
-from utils.thread_safe_mcrcon import ThreadSafeMCRcon
-from config import SERVER_IP, SERVER_PORT, RCON_HOST, RCON_PASSWORD
+from utils.thread_safe_mcrcon import ThreadSafeMCRcon, RconNotSent
+from config import SERVERS as SERVER_CONFIGS, SERVERS_FILE
 
 # Keeps Discord code and Minecraft code separate
-def get_server_status():
-    server = JavaServer.lookup(f"{SERVER_IP}:{SERVER_PORT}")
-    return server.status()
+class MinecraftServer:
+    """
+    One server the bot watches.
+
+    Status pings are async, so any number of servers can be polled from the
+    event loop without threads. RCON reuses one connection per server instead
+    of logging in for every command; the server handles RCON requests one at
+    a time anyway, so a lock serializes them.
+    """
+    def __init__(self, name, address, rcon_host, rcon_password, rcon_port=25575,
+                 log_path=None, notifications_channel_id=None):
+        self.name = name
+        self.address = address
+        self.rcon_host = rcon_host
+        self.rcon_port = rcon_port
+        self.rcon_password = rcon_password
+        self.log_path = log_path
+        self.notifications_channel_id = notifications_channel_id
+        # Prefix for notifications, so messages from different servers can be told apart
+        self.label = ""
+
+        self._status_server = None
+        self._rcon = None
+        self._rcon_lock = threading.Lock()
+
+    async def status(self):
+        if self._status_server is None:
+            self._status_server = await JavaServer.async_lookup(self.address)
+
+        try:
+            return await self._status_server.async_status()
+        except Exception:
+            # The address may resolve somewhere else by the next check
+            self._status_server = None
+            raise
+
+    def command(self, command, timeout=None):
+        """
+        Run an RCON command. Blocking, so call it through asyncio.to_thread.
+        timeout (seconds) replaces the usual 5s for slow commands.
+        """
+        with self._rcon_lock:
+            return self._locked_command(command, timeout)
+
+    def commands(self, commands):
+        """
+        Run several RCON commands back to back and return their responses.
+        One lock (and thread hop) for the batch instead of one per command.
+        """
+        with self._rcon_lock:
+            return [self._locked_command(command) for command in commands]
+
+    def _locked_command(self, command, timeout=None):
+        # A kept-alive connection goes stale when the server restarts
+        if self._rcon is not None and self._rcon.is_stale():
+            self._close_rcon()
+
+        reused = self._rcon is not None
+        try:
+            return self._rcon_command(command, timeout)
+        except RconNotSent:
+            # Only retried when the command never reached the server: once
+            # it did, it may have run, and `stop` or `say` mustn't run twice
+            if not reused:
+                raise
+        return self._rcon_command(command, timeout)
+
+    def _rcon_command(self, command, timeout=None):
+        if self._rcon is None:
+            rcon = ThreadSafeMCRcon(self.rcon_host, self.rcon_password, port=self.rcon_port)
+            rcon.connect()
+            self._rcon = rcon
+
+        try:
+            return self._rcon.command(command, timeout)
+        except Exception:
+            self._close_rcon()
+            raise
+
+    def _close_rcon(self):
+        if self._rcon is not None:
+            self._rcon.disconnect()
+            self._rcon = None
+
+
+SERVERS = {}
+for _config in SERVER_CONFIGS:
+    _server = MinecraftServer(**_config)
+    SERVERS[_server.name] = _server
+
+if len(SERVERS) > 1:
+    for _server in SERVERS.values():
+        _server.label = f"[{_server.name}] "
+
+if not SERVERS:
+    raise ValueError(f"No servers configured: {SERVERS_FILE} is empty (see servers.example.json)")
+
+DEFAULT_SERVER = next(iter(SERVERS.values()))
+
+
+def get_server(name=None):
+    """Look up a configured server by name; None means the first one."""
+    if name is None:
+        return DEFAULT_SERVER
+    if name not in SERVERS:
+        raise ValueError(f"Unknown server '{name}' (configured: {', '.join(SERVERS)})")
+    return SERVERS[name]
 
-def run_mc_command(command):
-    with ThreadSafeMCRcon(RCON_HOST, RCON_PASSWORD, port=25575) as mcr:
-        return mcr.command(command)
@@ -0,0 +1,83 @@
+import asyncio
+
+# Discord's message length limit
+MAX_MESSAGE_LENGTH = 2000
+
+
+class Notifier:
+    """
+    The one queue every monitor posts notifications through.
+
+    A single task drains it. Messages queued for the same channel within
+    batch_window are merged into one message, so a burst of events across
+    several servers is a couple of API calls instead of one each (and
+    doesn't run into Discord's rate limits).
+    """
+    def __init__(self, client, default_channel_id, batch_window=1.0):
+        self.client = client
+        self.default_channel_id = default_channel_id
+        self.batch_window = batch_window
+        self.queue = asyncio.Queue()
+        self.monitoring = False
+
+    def send(self, message, channel_id=None):
+        channel_id = channel_id or self.default_channel_id
+        if channel_id == 0:
+            return
+        self.queue.put_nowait((channel_id, message))
+
+    def _drain(self, first):
+        batches = {}
+        item = first
+        while item is not None:
+            channel_id, message = item
+            batches.setdefault(channel_id, []).append(message)
+            item = self.queue.get_nowait() if not self.queue.empty() else None
+        return batches
+
+    @staticmethod
+    def _merge(messages):
+        merged = []
+        current = ""
+        for message in messages:
+            if current and len(current) + 1 + len(message) > MAX_MESSAGE_LENGTH:
+                merged.append(current)
+                current = ""
+            current = f"{current}\n{message}" if current else message
+        if current:
+            merged.append(current)
+        return merged
+
+    async def _send_batch(self, channel_id, messages):
+        channel = self.client.get_channel(channel_id)
+        if not channel:
+            print(f"Warning: Could not find channel with ID {channel_id}")
+            return
+
+        for message in self._merge(messages):
+            try:
+                await channel.send(message)
+            except Exception as e:
+                print(f"Failed to send notification: {e}")
+
+    async def monitor_loop(self):
+        self.monitoring = True
+        await self.client.wait_until_ready()
+
+        while self.monitoring:
+            try:
+                first = await self.queue.get()
+                await asyncio.sleep(self.batch_window)
+
+                for channel_id, messages in self._drain(first).items():
+                    await self._send_batch(channel_id, messages)
+
+            except Exception as e:
+                print(f"Error in notifier loop: {e}")
+
+    def start(self):
+        if not self.monitoring:
+            asyncio.create_task(self.monitor_loop())
+
+    def stop(self):
+        self.monitoring = False
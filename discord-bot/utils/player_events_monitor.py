@@ -5,14 +5,15 @@ import json
 from pathlib import Path
 
 class PlayerEventsMonitor:
-    def __init__(self, client, channel_id, log_path):
+    def __init__(self, client, channel_id, log_path, label="", death_counts_file="discord-bot/data/death_counts.json"):
         self.client = client
         self.channel_id = channel_id
         self.log_path = Path(log_path)
+        self.label = label
         self.monitoring = False
         self.last_position = 0
         self.death_counts = {}
-        self.death_counts_file = Path("discord-bot/data/death_counts.json")
+        self.death_counts_file = Path(death_counts_file)
         
         # Regex patterns for Minecraft log events
         self.join_pattern = re.compile(r'\[Server thread/INFO\]: (\w+) joined the game')
@@ -61,18 +62,7 @@ class PlayerEventsMonitor:
         return self.death_counts[player]
 
     async def send_notification(self, message):
-        if self.channel_id == 0:
-            return
-
-        channel = self.client.get_channel(self.channel_id)
-        if not channel:
-            print(f"Warning: Could not find channel with ID {self.channel_id}")
-            return
-
-        try:
-            await channel.send(message)
-        except Exception as e:
-            print(f"Failed to send player event notification: {e}")
+        await self.client.notify(self.label + message, self.channel_id)
 
     def _process_line(self, line):
         # Check for player join
@@ -0,0 +1,295 @@
+import asyncio
+import os
+import time
+from collections import deque
+
+CLOCK_TICKS = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+# Thread name prefixes (as truncated to 15 chars by the kernel) -> category
+THREAD_CATEGORIES = [
+    ("Server thread", "server"),
+    ("c2me", "c2me"),
+    ("C2ME", "c2me"),
+    ("GC Thread", "gc"),
+    ("G1 ", "gc"),
+    ("ZWorker", "gc"),
+    ("ZDriver", "gc"),
+    ("ZDirector", "gc"),
+    ("VM Thread", "gc"),
+    ("C1 CompilerThre", "jit"),
+    ("C2 CompilerThre", "jit"),
+    ("Worker-Main", "workers"),
+    ("IO-Worker", "io"),
+    ("Netty ", "network"),
+]
+
+
+def _thread_category(name):
+    for prefix, category in THREAD_CATEGORIES:
+        if name.startswith(prefix):
+            return category
+    return "other"
+
+
+def _read(path):
+    with open(path, 'r') as f:
+        return f.read()
+
+
+def _parse_stat(text):
+    """Return (name, fields after the name) from a /proc stat line; names may contain spaces."""
+    start = text.index('(')
+    end = text.rindex(')')
+    return text[start + 1:end], text[end + 2:].split()
+
+
+def _executable_name(pid, argv):
+    try:
+        return os.path.basename(os.readlink(f'/proc/{pid}/exe'))
+    except OSError:
+        # Other users' processes can't be read; their argv[0] can
+        return os.path.basename(argv[0])
+
+
+def find_server_pid(match, cwd=None):
+    """
+    Find the server JVM: a java process with match in its arguments and,
+    if given, cwd as its working directory (to tell servers apart).
+
+    Checking the executable rather than the whole command line skips the
+    `sh -c "... java ... -jar void-mc-launcher.jar"` wrapper make starts
+    the server through, which would otherwise be found first.
+    """
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/cmdline', 'rb') as f:
+                argv = f.read().decode(errors='ignore').split('\0')
+        except OSError:
+            continue
+        if not argv[0] or _executable_name(entry, argv) != 'java':
+            continue
+        if not any(match in arg for arg in argv[1:]):
+            continue
+        if cwd is not None:
+            try:
+                if os.readlink(f'/proc/{entry}/cwd') != os.path.realpath(cwd):
+                    continue
+            except OSError:
+                continue
+        return int(entry)
+    return None
+
+
+def _status_kb(text, key):
+    """A "Key:   1234 kB" value from /proc/<pid>/status."""
+    for line in text.splitlines():
+        if line.startswith(key + ':'):
+            return int(line.split()[1])
+    return None
+
+
+def process_rss_mb(pid):
+    """Current RSS of a process in MB, or None if it's gone."""
+    try:
+        rss_kb = _status_kb(_read(f'/proc/{pid}/status'), 'VmRSS')
+    except OSError:
+        return None
+    return rss_kb / 1024 if rss_kb is not None else None
+
+
+def _linear_slope(points):
+    """Least-squares slope of (x, y) points."""
+    n = len(points)
+    if n < 2:
+        return 0.0
+    mean_x = sum(x for x, _ in points) / n
+    mean_y = sum(y for _, y in points) / n
+    denominator = sum((x - mean_x) ** 2 for x, _ in points)
+    if denominator == 0:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / denominator
+
+
+class ProcessResourceMonitor:
+    """
+    Samples the server JVM from /proc: RSS, CPU per thread category (server
+    thread, c2me workers, GC, JIT, ...), disk I/O and open files.
+
+    cwd is the server's directory, to find its JVM among several servers
+    (None takes the first JVM matching process_match). One sample is a handful of small /proc reads plus one per thread, done
+    off the event loop. Samples are kept for window seconds; when RSS or the
+    number of open files keeps climbing across the window, a notification
+    is sent (at most once per alert_cooldown).
+    """
+    def __init__(self, client, channel_id, process_match, cwd=None, label="", check_interval=15, window=1800,
+                 rss_growth_mb_per_hour=256, fd_growth_per_hour=500, alert_cooldown=3600):
+        self.client = client
+        self.channel_id = channel_id
+        self.process_match = process_match
+        self.cwd = cwd
+        self.label = label
+        self.check_interval = check_interval
+        self.rss_growth_mb_per_hour = rss_growth_mb_per_hour
+        self.fd_growth_per_hour = fd_growth_per_hour
+        self.alert_cooldown = alert_cooldown
+        self.monitoring = False
+
+        self.pid = None
+        self.samples = deque(maxlen=max(2, window // check_interval))
+        self.latest = None
+        self.last_alert = {}
+
+        # Previous cumulative counters, to turn them into rates
+        self._previous = None
+
+    def _sample(self):
+        if self.pid is None or not os.path.exists(f'/proc/{self.pid}'):
+            self.pid = find_server_pid(self.process_match, cwd=self.cwd)
+            self._previous = None
+            self.samples.clear()
+            if self.pid is None:
+                return None
+
+        pid = self.pid
+        now = time.monotonic()
+
+        _, fields = _parse_stat(_read(f'/proc/{pid}/stat'))
+        # Fields are numbered from 3 (state) in proc(5), so subtract 3
+        process_ticks = int(fields[11]) + int(fields[12])
+        # status gives VmRSS in kB; stat's rss is in pages, so it's only the fallback
+        rss_kb = _status_kb(_read(f'/proc/{pid}/status'), 'VmRSS')
+        rss_bytes = rss_kb * 1024 if rss_kb is not None else int(fields[21]) * PAGE_SIZE
+
+        io = {}
+        try:
+            for line in _read(f'/proc/{pid}/io').splitlines():
+                key, _, value = line.partition(':')
+                io[key] = int(value)
+        except OSError:
+            pass
+
+        try:
+            open_files = len(os.listdir(f'/proc/{pid}/fd'))
+        except OSError:
+            open_files = None
+
+        tids = os.listdir(f'/proc/{pid}/task')
+        thread_ticks = {}
+        for tid in tids:
+            try:
+                name, fields = _parse_stat(_read(f'/proc/{pid}/task/{tid}/stat'))
+            except OSError:
+                continue  # thread exited between listdir and read
+            ticks = int(fields[11]) + int(fields[12])
+            category = _thread_category(name)
+            thread_ticks[category] = thread_ticks.get(category, 0) + ticks
+
+        sample = {
+            'time': now,
+            'pid': pid,
+            'rss_mb': rss_bytes / 1024 / 1024,
+            'threads': len(tids),
+            'open_files': open_files,
+            'cpu_percent': None,
+            'thread_cpu_percent': {},
+            'read_mb_per_second': None,
+            'write_mb_per_second': None,
+        }
+
+        previous = self._previous
+        if previous and now > previous['time']:
+            elapsed = now - previous['time']
+            sample['cpu_percent'] = (process_ticks - previous['process_ticks']) / CLOCK_TICKS / elapsed * 100
+            sample['thread_cpu_percent'] = {
+                category: max(ticks - previous['thread_ticks'].get(category, 0), 0) / CLOCK_TICKS / elapsed * 100
+                for category, ticks in thread_ticks.items()
+            }
+            if io and previous['io']:
+                sample['read_mb_per_second'] = (io['read_bytes'] - previous['io']['read_bytes']) / elapsed / 1024 / 1024
+                sample['write_mb_per_second'] = (io['write_bytes'] - previous['io']['write_bytes']) / elapsed / 1024 / 1024
+
+        self._previous = {
+            'time': now,
+            'process_ticks': process_ticks,
+            'thread_ticks': thread_ticks,
+            'io': io,
+        }
+
+        return sample
+
+    def _growth_per_hour(self, key):
+        points = [(s['time'] / 3600, s[key]) for s in self.samples if s[key] is not None]
+        # Only judge once at least half the window has been observed
+        if len(points) < self.samples.maxlen // 2:
+            return 0.0
+        return _linear_slope(points)
+
+    async def send_notification(self, message):
+        await self.client.notify(self.label + message, self.channel_id)
+
+    async def _check_alerts(self):
+        checks = [
+            ('rss_mb', self.rss_growth_mb_per_hour, "🧠 **Server memory keeps growing**: RSS {value:.0f}MB, +{rate:.0f}MB/hour"),
+            ('open_files', self.fd_growth_per_hour, "📂 **Server open files keep growing**: {value:.0f} open, +{rate:.0f}/hour"),
+        ]
+
+        now = time.monotonic()
+        for key, threshold, message in checks:
+            rate = self._growth_per_hour(key)
+            if rate < threshold:
+                continue
+            if now - self.last_alert.get(key, -self.alert_cooldown) < self.alert_cooldown:
+                continue
+            self.last_alert[key] = now
+            await self.send_notification(message.format(value=self.latest[key], rate=rate))
+
+    def status_text(self):
+        sample = self.latest
+        if sample is None:
+            return "Server JVM not found."
+
+        summary = (f"PID {sample['pid']}: RSS {sample['rss_mb']:.0f}MB "
+                   f"({self._growth_per_hour('rss_mb'):+.0f}MB/h), {sample['threads']} threads")
+        # /proc/<pid>/fd is only readable for our own processes
+        if sample['open_files'] is not None:
+            summary += f", {sample['open_files']} open files"
+        lines = [summary]
+
+        if sample['cpu_percent'] is not None:
+            lines.append(f"CPU: {sample['cpu_percent']:.0f}% (100% = one core)")
+            busiest = sorted(sample['thread_cpu_percent'].items(), key=lambda item: item[1], reverse=True)
+            lines.extend(f"  {category}: {percent:.0f}%" for category, percent in busiest if percent >= 0.5)
+
+        if sample['read_mb_per_second'] is not None:
+            lines.append(f"Disk: read {sample['read_mb_per_second']:.1f}MB/s, "
+                         f"write {sample['write_mb_per_second']:.1f}MB/s")
+
+        return "\n".join(lines)
+
+    async def monitor_loop(self):
+        self.monitoring = True
+        await self.client.wait_until_ready()
+
+        while self.monitoring:
+            try:
+                sample = await asyncio.to_thread(self._sample)
+                self.latest = sample
+                if sample:
+                    self.samples.append(sample)
+                    await self._check_alerts()
+
+            except Exception as e:
+                print(f"{self.label}Error in process monitor loop: {e}")
+                self.pid = None
+
+            await asyncio.sleep(self.check_interval)
+
+    def start(self):
+        if not self.monitoring:
+            asyncio.create_task(self.monitor_loop())
+
+    def stop(self):
+        self.monitoring = False
@@ -0,0 +1,278 @@
+import asyncio
+import time
+from pathlib import Path
+from utils.chunky import MSPT_PATTERN, PLAYERS_PATTERN
+
+# In-game warnings before a restart, in seconds left
+COUNTDOWN_WARNINGS = [300, 60, 30, 10, 5]
+
+# RCON's usual 5s timeout is far too short for flushing a large world
+FLUSH_TIMEOUT = 600
+
+
+def _format_duration(seconds):
+    if seconds >= 60:
+        return f"{seconds // 60} minute{'s' if seconds >= 120 else ''}"
+    return f"{seconds} second{'s' if seconds != 1 else ''}"
+
+
+class RestartScheduler:
+    """
+    Restarts a server every interval_hours, or early when its memory or
+    MSPT stays above a threshold, without surprising the players.
+
+    When a restart is due, it waits up to wait_for_empty minutes for the
+    server to empty out and otherwise counts down in chat. A plain save-all
+    runs at the start of the countdown so the final save-all flush has
+    little left to write. marker_path (server/.restart-requested) tells the
+    `make serve` loop to start the server again after `stop`; the scheduler
+    then posts how long the server was down.
+
+    rss_mb is an optional callable for the server's current RSS (None when
+    its JVM isn't found). MSPT has to stay above max_mspt for mspt_checks
+    checks in a row, so one lag spike doesn't restart anything, and the
+    server only counts as down (restarting the interval) after down_after
+    failed status pings in a row.
+    """
+    def __init__(self, client, channel_id, server, marker_path, status_monitor=None, interval_hours=0,
+                 max_rss_mb=0, max_mspt=0, rss_mb=None, wait_for_empty=30, countdown=300,
+                 check_interval=60, mspt_checks=5, startup_timeout=600, down_after=3):
+        self.client = client
+        self.channel_id = channel_id
+        self.server = server
+        self.status_monitor = status_monitor
+        self.interval = interval_hours * 3600
+        self.max_rss_mb = max_rss_mb
+        self.max_mspt = max_mspt
+        self.rss_mb = rss_mb
+        self.wait_for_empty = wait_for_empty * 60
+        self.countdown = countdown
+        self.check_interval = check_interval
+        self.mspt_checks = mspt_checks
+        self.startup_timeout = startup_timeout
+        self.down_after = down_after
+        self.monitoring = False
+
+        self.marker_path = Path(marker_path)
+        # When the server was last seen coming up; None while it's down
+        self.up_since = None
+        self.failed_pings = 0
+        self.high_mspt_count = 0
+        self.pending_reason = None
+        self.state = "idle"
+        self.cancelled = False
+        self.last_restart = None
+
+    async def _command(self, command, timeout=None):
+        return await asyncio.to_thread(self.server.command, command, timeout)
+
+    async def send_notification(self, message):
+        await self.client.notify(self.server.label + message, self.channel_id)
+
+    async def _player_count(self):
+        match = PLAYERS_PATTERN.search(await self._command("list") or "")
+        return int(match.group(1)) if match else 0
+
+    async def _due_reason(self):
+        if self.pending_reason:
+            return self.pending_reason
+
+        uptime = time.monotonic() - self.up_since
+        if self.interval and uptime >= self.interval:
+            return f"scheduled restart after {uptime / 3600:.0f}h"
+
+        if self.max_rss_mb and self.rss_mb:
+            rss = self.rss_mb()
+            if rss and rss >= self.max_rss_mb:
+                return f"memory at {rss:.0f}MB (limit {self.max_rss_mb:.0f}MB)"
+
+        if self.max_mspt:
+            match = MSPT_PATTERN.search(await self._command("tick query") or "")
+            mspt = float(match.group(1)) if match else 0.0
+            self.high_mspt_count = self.high_mspt_count + 1 if mspt >= self.max_mspt else 0
+            if self.high_mspt_count >= self.mspt_checks:
+                return f"MSPT at {mspt:.1f}ms for {self.high_mspt_count} checks (limit {self.max_mspt:.0f}ms)"
+
+        return None
+
+    async def _wait_for_empty(self):
+        """True once nobody is online, False if wait_for_empty runs out first."""
+        deadline = time.monotonic() + self.wait_for_empty
+        while not self.cancelled:
+            if await self._player_count() == 0:
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            await asyncio.sleep(min(self.check_interval, 30))
+        return False
+
+    async def _count_down(self):
+        remaining = self.countdown
+        # The first warning always comes at the start, whatever the countdown
+        warnings = [self.countdown] + [w for w in COUNTDOWN_WARNINGS if w < self.countdown]
+        for warning in warnings + [0]:
+            await asyncio.sleep(remaining - warning)
+            remaining = warning
+            if self.cancelled:
+                return
+            if warning:
+                await self._command(f"say Server restarting in {_format_duration(warning)}")
+            # Everyone may have left in the meantime
+            if warning and await self._player_count() == 0:
+                return
+
+    async def _wait_until(self, online, timeout):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                await self.server.status()
+                is_online = True
+            except Exception:
+                is_online = False
+            if is_online == online:
+                return True
+            await asyncio.sleep(2)
+        return False
+
+    async def restart(self, reason):
+        self.state = "waiting"
+        self.cancelled = False
+        await self.send_notification(f"🔁 **Restart pending**: {reason}")
+
+        if not await self._wait_for_empty() and not self.cancelled:
+            self.state = "counting down"
+            await self.send_notification(f"⏳ Players are online; restarting in {_format_duration(self.countdown)}")
+            # Get most of the saving done while players are still playing
+            await self._command("save-all")
+            await self._count_down()
+
+        if self.cancelled:
+            await self._command("say Server restart cancelled")
+            await self.send_notification("🛑 Restart cancelled")
+            self.pending_reason = None
+            self.state = "idle"
+            return
+
+        self.state = "restarting"
+        if self.status_monitor:
+            self.status_monitor.suppressed = True
+        stopped = False
+        try:
+            try:
+                await self._command("save-all flush", timeout=FLUSH_TIMEOUT)
+            except OSError as e:
+                # The server is still running; keep the reason so the next check tries again
+                self.pending_reason = reason
+                await self.send_notification(
+                    f"⚠️ **Restart failed**: the final save didn't complete ({e}). "
+                    "Trying again at the next check."
+                )
+                return
+
+            self.marker_path.touch()
+            stopped_at = time.monotonic()
+            stopped = True
+            try:
+                await self._command("stop")
+            except OSError:
+                pass  # the server may close the connection before answering
+            await self.send_notification("💾 Saved and stopped, starting again...")
+
+            await self._wait_until(False, 120)
+            if await self._wait_until(True, self.startup_timeout):
+                downtime = time.monotonic() - stopped_at
+                self.last_restart = (time.time(), downtime)
+                await self.send_notification(f"✅ **Server is back** after {downtime:.0f}s of downtime")
+            else:
+                await self.send_notification(
+                    f"⚠️ **Server did not come back** within {self.startup_timeout // 60} minutes. "
+                    "Is it running under `make serve`?"
+                )
+        finally:
+            if self.status_monitor:
+                # Forget the state seen during the restart instead of announcing it
+                self.status_monitor.is_online = None
+                self.status_monitor.suppressed = False
+            if stopped:
+                self.up_since = None
+                self.high_mspt_count = 0
+                self.pending_reason = None
+            self.state = "idle"
+
+    def request(self, reason):
+        """Ask for a restart at the next check (used by /restart)."""
+        self.pending_reason = reason
+
+    def cancel(self):
+        if self.state in ("waiting", "counting down"):
+            self.cancelled = True
+            return True
+        if self.pending_reason:
+            self.pending_reason = None
+            return True
+        return False
+
+    def status_text(self):
+        lines = [f"State: {self.state}" + (f" ({self.pending_reason})" if self.pending_reason else "")]
+        if self.interval and self.up_since is not None:
+            remaining = max(self.interval - (time.monotonic() - self.up_since), 0)
+            lines.append(f"Next scheduled restart in {remaining / 3600:.1f}h")
+        limits = []
+        if self.max_rss_mb:
+            limits.append(f"RSS {self.max_rss_mb:.0f}MB")
+        if self.max_mspt:
+            limits.append(f"MSPT {self.max_mspt:.0f}ms")
+        if limits:
+            lines.append(f"Early restart at: {', '.join(limits)}")
+        if self.last_restart:
+            at, downtime = self.last_restart
+            lines.append(f"Last restart: {time.strftime('%Y-%m-%d %H:%M', time.localtime(at))}, "
+                         f"{downtime:.0f}s downtime")
+        return "\n".join(lines)
+
+    async def monitor_loop(self):
+        self.monitoring = True
+        await self.client.wait_until_ready()
+
+        while self.monitoring:
+            try:
+                await self.server.status()
+            except (OSError, asyncio.TimeoutError):
+                # Server is down; cadence counts from when it comes back. A
+                # single lost ping doesn't count, or it would never be due.
+                self.failed_pings += 1
+                if self.failed_pings >= self.down_after:
+                    self.up_since = None
+                await asyncio.sleep(self.check_interval)
+                continue
+            except Exception as e:
+                print(f"Error pinging the server in restart scheduler ({self.server.name}): {e}")
+                await asyncio.sleep(self.check_interval)
+                continue
+
+            self.failed_pings = 0
+            if self.up_since is None:
+                self.up_since = time.monotonic()
+
+            try:
+                reason = await self._due_reason()
+                if reason:
+                    await self.restart(reason)
+
+            except (OSError, asyncio.TimeoutError) as e:
+                # An RCON hiccup; the server answered the ping, so try again next check
+                print(f"RCON error in restart scheduler ({self.server.name}): {e}")
+                self.state = "idle"
+
+            except Exception as e:
+                print(f"Error in restart scheduler loop ({self.server.name}): {e}")
+                self.state = "idle"
+
+            await asyncio.sleep(self.check_interval)
+
+    def start(self):
+        if not self.monitoring:
+            asyncio.create_task(self.monitor_loop())
+
+    def stop(self):
+        self.monitoring = False
@@ -0,0 +1,248 @@
+import gzip
+import time
+import struct
+import asyncio
+from pathlib import Path
+from collections import defaultdict
+
+# What the server answers when spark isn't installed, or is busy
+UNKNOWN_COMMAND = "Unknown or incomplete command"
+ALREADY_RUNNING = "already running"
+
+# Frames without a source (class_sources) are vanilla or the JDK
+VANILLA = "minecraft/java"
+
+
+# .sparkprofile files are a spark SamplerData protobuf message. Only the
+# handful of fields needed for a summary are read, straight from the wire
+# format, so the bot doesn't need the protobuf package and spark's schema.
+
+def _varint(data, pos):
+    result = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+
+
+def _fields(data):
+    """(field number, wire type, value) for each field of one message."""
+    pos = 0
+    end = len(data)
+    while pos < end:
+        key, pos = _varint(data, pos)
+        field, wire = key >> 3, key & 7
+        if wire == 0:
+            value, pos = _varint(data, pos)
+        elif wire == 1:
+            value = data[pos:pos + 8]
+            pos += 8
+        elif wire == 2:
+            length, pos = _varint(data, pos)
+            value = data[pos:pos + length]
+            pos += length
+        elif wire == 5:
+            value = data[pos:pos + 4]
+            pos += 4
+        else:
+            raise ValueError(f"Unsupported protobuf wire type {wire}")
+        yield field, wire, value
+
+
+def _doubles(wire, value):
+    if wire == 1:
+        return struct.unpack('<d', value)
+    # Packed repeated double
+    return struct.unpack(f'<{len(value) // 8}d', value)
+
+
+def _ints(wire, value):
+    if wire == 0:
+        return [value]
+    # Packed repeated int32
+    ints = []
+    pos = 0
+    while pos < len(value):
+        number, pos = _varint(value, pos)
+        ints.append(number)
+    return ints
+
+
+class _Node:
+    __slots__ = ("class_name", "method_name", "time", "refs", "children")
+
+    def __init__(self):
+        self.class_name = ""
+        self.method_name = ""
+        self.time = 0.0
+        self.refs = []
+        self.children = []
+
+
+def _parse_node(data):
+    """
+    StackTraceNode. Current spark versions store a time per time window (8)
+    and children as indexes into the thread's node list (9); older ones a
+    single time (1) and nested children (2).
+    """
+    node = _Node()
+    for field, wire, value in _fields(data):
+        if field == 3:
+            node.class_name = bytes(value).decode()
+        elif field == 4:
+            node.method_name = bytes(value).decode()
+        elif field in (1, 8):
+            node.time += sum(_doubles(wire, value))
+        elif field == 9:
+            node.refs.extend(_ints(wire, value))
+        elif field == 2:
+            node.children.append(_parse_node(value))
+    return node
+
+
+def _parse_thread(data):
+    name = ""
+    time = 0.0
+    nodes = []
+    root_refs = []
+    nested = []
+    for field, wire, value in _fields(data):
+        if field == 1:
+            name = bytes(value).decode()
+        elif field in (2, 4):
+            time += sum(_doubles(wire, value))
+        elif field == 5:
+            nodes.append(_parse_node(value))
+        elif field == 6:
+            root_refs.extend(_ints(wire, value))
+        elif field == 3:
+            nested.append(_parse_node(value))
+
+    for node in nodes:
+        node.children = [nodes[i] for i in node.refs]
+    roots = [nodes[i] for i in root_refs] if root_refs else nested or nodes
+    return name, time or sum(root.time for root in roots), roots
+
+
+def _parse_map_entry(data):
+    key = value = ""
+    for field, _, raw in _fields(data):
+        if field == 1:
+            key = bytes(raw).decode()
+        elif field == 2:
+            value = bytes(raw).decode()
+    return key, value
+
+
+def parse_profile(path):
+    """Threads (name, total time, root nodes) and class -> mod sources of a .sparkprofile."""
+    data = Path(path).read_bytes()
+    if data[:2] == b'\x1f\x8b':
+        data = gzip.decompress(data)
+    data = memoryview(data)
+
+    threads = []
+    class_sources = {}
+    for field, _, value in _fields(data):
+        if field == 2:
+            threads.append(_parse_thread(value))
+        elif field == 3:
+            key, source = _parse_map_entry(value)
+            class_sources[key] = source
+    return threads, class_sources
+
+
+def summarize_profile(path, top=10):
+    """
+    Hottest methods by self time, and time per mod, as a share of the
+    sampled time. A frame's time goes to the closest mod class on its
+    stack, so mod shares add up; frames only under vanilla code count as
+    vanilla.
+    """
+    threads, class_sources = parse_profile(path)
+    method_times = defaultdict(float)
+    method_sources = {}
+    mod_times = defaultdict(float)
+    total = 0.0
+
+    for _, thread_time, roots in threads:
+        total += thread_time
+        # Iterative, since stacks can be deeper than the recursion limit
+        stack = [(root, VANILLA) for root in roots]
+        while stack:
+            node, source = stack.pop()
+            source = class_sources.get(node.class_name, source)
+            self_time = max(node.time - sum(child.time for child in node.children), 0.0)
+            if self_time:
+                method = f"{node.class_name.rsplit('.', 1)[-1]}.{node.method_name}()"
+                method_times[method] += self_time
+                method_sources[method] = source
+                mod_times[source] += self_time
+            stack.extend((child, source) for child in node.children)
+
+    def share(items):
+        ranked = sorted(items, key=lambda item: item[1], reverse=True)[:top]
+        return [(name, time / total * 100 if total else 0.0) for name, time in ranked]
+
+    return {
+        'threads': [name for name, _, _ in threads],
+        'sampled_ms': total,
+        'methods': [(method, percent, method_sources[method])
+                    for method, percent in share(method_times.items())],
+        'mods': share(mod_times.items()),
+    }
+
+
+def format_summary(summary, max_method_length=44):
+    lines = [f"Sampled {summary['sampled_ms'] / 1000:.1f}s of {', '.join(summary['threads']) or 'no threads'}"]
+    lines.append("")
+    lines.append("Hottest methods (self time):")
+    for method, percent, source in summary['methods']:
+        if len(method) > max_method_length:
+            method = "…" + method[-(max_method_length - 1):]
+        lines.append(f"  {percent:5.1f}%  {method:<{max_method_length}}  {source}")
+    lines.append("")
+    lines.append("Time by mod:")
+    for mod, percent in summary['mods']:
+        lines.append(f"  {percent:5.1f}%  {mod}")
+    return "\n".join(lines)
+
+
+async def run_profiler(server, spark_dir, seconds, save_timeout=60):
+    """
+    Run spark's sampler on a server for `seconds` and return the saved
+    .sparkprofile. --save-to-file keeps the result on the server instead of
+    uploading it to spark's public viewer; --ignore-sleeping leaves out the
+    time the server thread waits for the next tick.
+    """
+    spark_dir = Path(spark_dir)
+    before = set(spark_dir.glob("*.sparkprofile")) if spark_dir.exists() else set()
+
+    response = await asyncio.to_thread(
+        server.command, f"spark profiler start --timeout {seconds} --ignore-sleeping --save-to-file"
+    ) or ""
+    if UNKNOWN_COMMAND in response:
+        raise RuntimeError("spark is not installed on the server (see \"Profiling Lag\" in the README)")
+    if ALREADY_RUNNING in response:
+        raise RuntimeError("A spark profiler is already running on the server")
+
+    await asyncio.sleep(seconds)
+
+    # spark saves the file once the sampler stopped; wait until it's complete
+    deadline = time.monotonic() + save_timeout
+    last_size = None
+    while time.monotonic() < deadline:
+        new = set(spark_dir.glob("*.sparkprofile")) - before if spark_dir.exists() else set()
+        if new:
+            path = max(new, key=lambda p: p.stat().st_mtime)
+            size = path.stat().st_size
+            if size and size == last_size:
+                return path
+            last_size = size
+        await asyncio.sleep(1)
+
+    raise TimeoutError(f"spark didn't save a profile in {spark_dir} within {save_timeout}s")
@@ -1,39 +1,33 @@
 import asyncio
-from utils.mc import get_server_status
 
 class ServerStatusMonitor:
-    def __init__(self, client, channel_id, check_interval=30):
+    def __init__(self, client, channel_id, server, check_interval=30):
         self.client = client
         self.channel_id = channel_id
+        self.server = server
         self.check_interval = check_interval
         self.is_online = None
         self.monitoring = False
+        # Set during planned restarts, which announce themselves
+        self.suppressed = False
 
-    def _check_server_online(self):
+    async def _check_server_online(self):
         try:
-            get_server_status()
+            await self.server.status()
             return True
         except Exception:
             return False
 
     async def send_notification(self, is_online):
-        if self.channel_id == 0:
-            return
-
-        channel = self.client.get_channel(self.channel_id)
-        if not channel:
-            print(f"Warning: Could not find channel with ID {self.channel_id}")
+        if self.suppressed:
             return
 
         if is_online:
-            message = "@everyone 🟢 **void-mc server is now ONLINE!**"
+            message = f"@everyone 🟢 **{self.server.name} server is now ONLINE!**"
         else:
-            message = "@everyone 🔴 **void-mc server is now OFFLINE.**"
+            message = f"@everyone 🔴 **{self.server.name} server is now OFFLINE.**"
 
-        try:
-            await channel.send(message)
-        except Exception as e:
-            print(f"Failed to send status notification: {e}")
+        await self.client.notify(message, self.channel_id)
 
     async def monitor_loop(self):
         self.monitoring = True
@@ -41,7 +35,7 @@ class ServerStatusMonitor:
 
         while self.monitoring:
             try:
-                current_status = self._check_server_online()
+                current_status = await self._check_server_online()
 
                 if self.is_online is None:
                     self.is_online = current_status
@@ -52,7 +46,7 @@ class ServerStatusMonitor:
                 await asyncio.sleep(self.check_interval)
 
             except Exception as e:
-                print(f"Error in status monitor loop: {e}")
+                print(f"Error in status monitor loop ({self.server.name}): {e}")
                 await asyncio.sleep(self.check_interval)
 
     def start(self):
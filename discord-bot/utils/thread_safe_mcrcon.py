@@ -1,8 +1,20 @@
 import platform
+import select
+import socket
+import ssl
+import struct
 import threading
-from mcrcon import MCRcon as BaseMCRcon, timeout_handler
+from mcrcon import MCRcon as BaseMCRcon, MCRconException, timeout_handler
 import signal
 
+COMMAND = 2
+# Any type the server doesn't know; it answers with "Unknown request" and the same id
+SENTINEL = 0
+
+
+class RconNotSent(ConnectionError):
+    """The connection failed before the command reached the server, so it's safe to retry."""
+
 class ThreadSafeMCRcon(BaseMCRcon):
     def __init__(self, host, password, port=25575, tlsmode=0, timeout=5):
         self.host = host
@@ -10,7 +22,97 @@ class ThreadSafeMCRcon(BaseMCRcon):
         self.port = port
         self.tlsmode = tlsmode
         self.timeout = timeout
+        self.request_id = 0
 
         # Only register SIGALRM on non-Windows main thread
         if platform.system() != "Windows" and threading.current_thread() is threading.main_thread():
             signal.signal(signal.SIGALRM, timeout_handler)
+
+    def connect(self):
+        # Same as the base class, but with the timeout set before logging in
+        self.socket = socket.create_connection((self.host, self.port), timeout=self.timeout)
+
+        if self.tlsmode > 0:
+            ctx = ssl.create_default_context()
+            if self.tlsmode > 1:
+                ctx.check_hostname = False
+                ctx.verify_mode = ssl.CERT_NONE
+            self.socket = ctx.wrap_socket(self.socket, server_hostname=self.host)
+
+        self._send(3, self.password)
+
+    def _read(self, length):
+        # Socket timeouts instead of SIGALRM, which only works on the main
+        # thread. An empty read means the server closed the connection; the
+        # base class would spin on it forever.
+        data = b""
+        while len(data) < length:
+            chunk = self.socket.recv(length - len(data))
+            if not chunk:
+                raise ConnectionError("RCON connection closed by the server")
+            data += chunk
+        return data
+
+    def _write(self, request_id, request_type, data):
+        payload = struct.pack("<ii", request_id, request_type) + data.encode("utf8") + b"\x00\x00"
+        self.socket.sendall(struct.pack("<i", len(payload)) + payload)
+
+    def _read_packet(self):
+        (length,) = struct.unpack("<i", self._read(4))
+        payload = self._read(length)
+        if payload[-2:] != b"\x00\x00":
+            raise MCRconException("Incorrect padding")
+        request_id, _ = struct.unpack("<ii", payload[:8])
+        return request_id, payload[8:-2]
+
+    def is_stale(self):
+        """True if the server closed the connection (or left unread data on it) while it sat idle."""
+        if self.socket is None:
+            return True
+        readable, _, _ = select.select([self.socket], [], [], 0)
+        return bool(readable)
+
+    def command(self, command, timeout=None):
+        """
+        Run a command and return its whole response. timeout overrides the
+        connection's timeout for this command (e.g. a long save-all flush).
+
+        The server splits long responses (a big `list` or `data get`) over
+        several packets, and the base class stops reading at the first
+        moment nothing is buffered, which leaves the rest to be taken as the
+        next command's response. Instead, once the first packet is in, a
+        request the server doesn't know is sent after it: the server answers
+        requests in order, so everything before that answer is this
+        command's. (It's only sent then, because the server handles one
+        packet per socket read, MC-72390.)
+        """
+        if self.socket is None:
+            raise MCRconException("Must connect before sending data")
+
+        self.request_id = self.request_id % 0x7FFFFFF0 + 2
+        command_id, sentinel_id = self.request_id, self.request_id + 1
+        try:
+            self._write(command_id, COMMAND, command)
+        except OSError as e:
+            raise RconNotSent(f"Sending the RCON command failed: {e}") from e
+
+        if timeout is not None:
+            self.socket.settimeout(timeout)
+        try:
+            response = b""
+            sentinel_sent = False
+            while True:
+                request_id, data = self._read_packet()
+                if request_id == -1:
+                    raise MCRconException("Login failed")
+                if request_id == sentinel_id:
+                    return response.decode("utf8")
+                if request_id != command_id:
+                    raise MCRconException(f"Unexpected RCON response id {request_id} (expected {command_id})")
+                response += data
+                if not sentinel_sent:
+                    self._write(sentinel_id, SENTINEL, "")
+                    sentinel_sent = True
+        finally:
+            if timeout is not None and self.socket is not None:
+                self.socket.settimeout(self.timeout)
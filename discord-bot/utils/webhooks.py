@@ -0,0 +1,226 @@
+import re
+import json
+import hmac
+import math
+import time
+import asyncio
+import hashlib
+from collections import deque
+from aiohttp import web
+
+# Larger bodies are rejected before they're read
+MAX_BODY_SIZE = 64 * 1024
+
+SIGNATURE_PATTERN = re.compile(r'[0-9a-f]{64}')
+
+# Notification text per event type (see INTEGRATION_PLAN.md)
+EVENT_FORMATS = {
+    "server_started": "🟢 **Server started** (v{version})",
+    "server_stopped": "🔴 **Server stopped** ({reason})",
+    "server_restarted": "🔁 **Server restarted** ({reason})",
+    "player_join": "➡️ **{player}** joined the server",
+    "player_leave": "⬅️ **{player}** left the server",
+    "player_death": "💀 **{player}** {message}\n*Total deaths: {death_count}*",
+    "low_tps": "🐢 **Low TPS**: {tps} (threshold {threshold})",
+    "high_memory": "🧠 **High memory**: {usage_percent}% (threshold {threshold}%)",
+    "backup_started": "💾 Backup started: {backup_name}",
+    "backup_completed": "✅ Backup completed: {backup_name} ({size_mb} MB)",
+    "backup_failed": "⚠️ **Backup failed**: {backup_name}: {error}",
+}
+
+
+class WebhookError(Exception):
+    def __init__(self, status, error, message, headers=None):
+        super().__init__(message)
+        self.status = status
+        self.error = error
+        self.message = message
+        self.headers = headers
+
+
+class TokenBucket:
+    """Allows burst requests at once, refilled at rate per second."""
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def take(self, now):
+        """0 if the request may go ahead, otherwise the seconds until it may."""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class Registration:
+    """One remote server allowed to post events, from the webhooks file."""
+    def __init__(self, name, token_sha256, signing_key, channel_id, rate_per_minute, burst):
+        self.name = name
+        self.token_sha256 = token_sha256
+        self.signing_key = bytes.fromhex(signing_key)
+        self.channel_id = channel_id
+        self.label = f"[{name}] "
+        self.bucket = TokenBucket(rate_per_minute / 60, burst)
+        # Signatures seen within the timestamp window, to reject replays
+        self.seen = set()
+        self.seen_order = deque()
+
+    def remember(self, signature, now, window):
+        """False if the signature was already used within window seconds."""
+        while self.seen_order and self.seen_order[0][0] < now - window:
+            self.seen.discard(self.seen_order.popleft()[1])
+        if signature in self.seen:
+            return False
+        self.seen.add(signature)
+        self.seen_order.append((now, signature))
+        return True
+
+
+def sign(signing_key, body):
+    return hmac.new(signing_key, body, hashlib.sha256).hexdigest()
+
+
+def _escape_mentions(value):
+    # Event data must not be able to ping @everyone in the channel
+    return value.replace("@", "@\u200b") if isinstance(value, str) else value
+
+
+class WebhookReceiver:
+    """
+    HTTP endpoint for servers that push their events to the bot instead of
+    having it read their log (see INTEGRATION_PLAN.md):
+
+        POST /webhook/event
+        Authorization: Bearer <token>
+        X-VMC-Signature: <hex HMAC-SHA256 of the body with the signing key>
+
+        {"timestamp": 1703462400, "nonce": "<random>", "event_type": "player_join", "data": {"player": "Steve"}}
+
+    The cheap checks run first: the token is looked up by its SHA-256 and
+    rate limited with a token bucket before the body is read, so a flood
+    from one token costs little. The signature may cover the body as sent,
+    which is checked before the body is parsed, or json.dumps(payload,
+    sort_keys=True), as in the plan's client. Timestamps older than max_skew seconds, and
+    signatures already seen within that window, are rejected as replays.
+    Clients must put a unique nonce in every event: timestamps are whole
+    seconds, so two identical events in the same second would otherwise
+    have the same signature and the second would be dropped.
+
+    Accepted events go into the client's notifier, which batches them per
+    channel, and are answered right away with 200 {"status": "queued"}.
+    """
+    def __init__(self, client, registrations, host="127.0.0.1", port=8080, rate_per_minute=100,
+                 burst=20, max_skew=60):
+        self.client = client
+        self.host = host
+        self.port = port
+        self.max_skew = max_skew
+        self.registrations = {}
+        for config in registrations:
+            registration = Registration(
+                config["name"], config["token_sha256"], config["signing_key"], config["channel_id"],
+                config.get("rate_per_minute", rate_per_minute), config.get("burst", burst),
+            )
+            self.registrations[registration.token_sha256] = registration
+        self.runner = None
+
+    def _registration(self, authorization):
+        if not authorization.startswith("Bearer "):
+            raise WebhookError(401, "unauthorized", "Missing bearer token")
+        token = authorization[7:]
+        # Tokens are ASCII; aiohttp decodes other header bytes into characters that may not encode
+        if not token.isascii():
+            raise WebhookError(401, "unauthorized", "Invalid or revoked token")
+        # Looked up by hash, so the comparison doesn't leak the token through timing
+        token_hash = hashlib.sha256(token.encode()).hexdigest()
+        registration = self.registrations.get(token_hash)
+        if registration is None:
+            raise WebhookError(401, "unauthorized", "Invalid or revoked token")
+
+        retry_after = registration.bucket.take(time.monotonic())
+        if retry_after:
+            raise WebhookError(429, "rate_limit_exceeded", f"Retry in {retry_after:.1f}s",
+                               headers={"Retry-After": str(math.ceil(retry_after))})
+        return registration
+
+    def _verify(self, registration, signature, body):
+        # Checked first, so compare_digest only ever sees ASCII hex
+        signature = signature.lower()
+        if not SIGNATURE_PATTERN.fullmatch(signature):
+            raise WebhookError(401, "unauthorized", "Invalid signature")
+
+        # The body as sent is checked before it's parsed; only a body that doesn't
+        # match is parsed, to check the signature against its canonical form
+        signed_as_sent = hmac.compare_digest(sign(registration.signing_key, body), signature)
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            if not signed_as_sent:
+                raise WebhookError(401, "unauthorized", "Invalid signature")
+            raise WebhookError(400, "bad_request", "Body must be a JSON object")
+        if not signed_as_sent:
+            canonical = json.dumps(payload, sort_keys=True).encode()
+            if not hmac.compare_digest(sign(registration.signing_key, canonical), signature):
+                raise WebhookError(401, "unauthorized", "Invalid signature")
+        if not isinstance(payload, dict):
+            raise WebhookError(400, "bad_request", "Body must be a JSON object")
+
+        timestamp = payload.get("timestamp")
+        now = time.time()
+        if not isinstance(timestamp, (int, float)) or abs(now - timestamp) > self.max_skew:
+            raise WebhookError(400, "expired", "Timestamp missing or too far from the bot's clock")
+        if not registration.remember(signature, now, self.max_skew * 2):
+            raise WebhookError(400, "replayed", "Request was already received (send a unique nonce per event)")
+        return payload
+
+    @staticmethod
+    def format_event(payload):
+        event_type = payload.get("event_type")
+        if event_type not in EVENT_FORMATS:
+            raise WebhookError(400, "bad_request", f"Unknown event type: {event_type}")
+        data = payload.get("data")
+        if not isinstance(data, dict):
+            raise WebhookError(400, "bad_request", "data must be an object")
+        try:
+            return EVENT_FORMATS[event_type].format(**{k: _escape_mentions(v) for k, v in data.items()})
+        except KeyError as e:
+            raise WebhookError(400, "bad_request", f"{event_type} needs data.{e.args[0]}")
+
+    async def handle_event(self, request):
+        try:
+            registration = self._registration(request.headers.get("Authorization", ""))
+            body = await request.read()
+            payload = self._verify(registration, request.headers.get("X-VMC-Signature", ""), body)
+            message = self.format_event(payload)
+        except WebhookError as e:
+            return web.json_response({"error": e.error, "message": e.message}, status=e.status,
+                                     headers=e.headers)
+
+        await self.client.notify(registration.label + message, registration.channel_id)
+        return web.json_response({"status": "queued"})
+
+    async def handle_health(self, request):
+        return web.json_response({"status": "ok"})
+
+    async def serve(self):
+        app = web.Application(client_max_size=MAX_BODY_SIZE)
+        app.router.add_post("/webhook/event", self.handle_event)
+        app.router.add_get("/health", self.handle_health)
+
+        # No access log: formatting a line per request costs more than handling it
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        await web.TCPSite(self.runner, self.host, self.port).start()
+        # Port 0 picks a free one
+        self.port = self.runner.addresses[0][1]
+
+    def stop(self):
+        if self.runner is not None:
+            asyncio.create_task(self.runner.cleanup())
+            self.runner = None
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Modpack Export Script
+
+Builds a Modrinth modpack (.mrpack) from client-mods.json, so players can
+import one small file into a launcher (Prism, Modrinth App, ATLauncher, ...)
+instead of fetching every mod themselves.
+Usage: ./export-modpack.py [--output void-mc.mrpack] [--bundle]
+
+The pack lists each mod with its download URL, size and SHA-1/SHA-512, as
+the format requires. Jars missing from client/mods are downloaded first.
+Hashing runs in parallel, and hashes are cached by file size and mtime, so
+re-exporting only hashes jars that changed. --bundle puts the jars
+themselves into the pack (overrides/mods) for players without a launcher
+that downloads.
+
+Launchers check the hashes against what the URL serves, so a stale or
+truncated local jar must not end up in the pack. Modrinth jars are checked
+against the hashes Modrinth publishes (from resolve-mods.py's metadata
+cache) and downloaded again if they differ. Linked jars without published
+hashes are downloaded again once; the hash cache then remembers that the
+jar is what its URL serves for as long as the file is unchanged.
+"""
+
+import os
+import sys
+import json
+import hashlib
+import zipfile
+import argparse
+import urllib.parse
+import urllib.request
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+HASH_CACHE_FILE = Path(".cache/modpack-hashes.json")
+# Written by resolve-mods.py
+MODRINTH_INDEX_FILE = Path(".cache/modrinth/index.json")
+
+# Launchers only download pack files from these hosts; anything else is bundled
+ALLOWED_DOWNLOAD_HOSTS = {
+    "cdn.modrinth.com",
+    "github.com",
+    "raw.githubusercontent.com",
+    "gitlab.com",
+}
+
+
+def load_mod_config(config_file):
+    if not config_file.exists():
+        print(f"Error: Configuration file not found: {config_file}")
+        print("Please run 'make generate-config' first.")
+        sys.exit(1)
+
+    with open(config_file, 'r') as f:
+        return json.load(f)
+
+
+def jar_name(url):
+    return urllib.parse.unquote(os.path.basename(urllib.parse.urlparse(url).path))
+
+
+def download(url, destination):
+    tmp_path = destination.with_suffix(destination.suffix + '.part')
+    with urllib.request.urlopen(url, timeout=60) as response, open(tmp_path, 'wb') as f:
+        while True:
+            chunk = response.read(1024 * 1024)
+            if not chunk:
+                break
+            f.write(chunk)
+    os.replace(tmp_path, destination)
+
+
+def hash_file(path):
+    sha1 = hashlib.sha1()
+    sha512 = hashlib.sha512()
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(1024 * 1024)
+            if not chunk:
+                break
+            sha1.update(chunk)
+            sha512.update(chunk)
+    return {'sha1': sha1.hexdigest(), 'sha512': sha512.hexdigest()}
+
+
+def published_hashes(index_file=MODRINTH_INDEX_FILE):
+    """SHA-1/SHA-512 per download URL, from the versions in resolve-mods.py's Modrinth cache."""
+    if not index_file.exists():
+        return {}
+    try:
+        with open(index_file, 'r') as f:
+            index = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+    hashes = {}
+    for key, entry in index.items():
+        if key.startswith('version:'):
+            versions = [entry['data']]
+        elif key.startswith('compatible:'):
+            versions = entry['data']
+        else:
+            continue
+        for version in versions:
+            for file in version.get('files', []):
+                # A version's files never change, so any cached entry is good regardless of age
+                hashes[urllib.parse.unquote(file['url'])] = {
+                    'sha1': file['hashes']['sha1'],
+                    'sha512': file['hashes']['sha512'],
+                }
+    return hashes
+
+
+class HashCache:
+    """
+    SHA-1/SHA-512 per jar, reused while the file's size and mtime are
+    unchanged, and the URL the jar was last downloaded from (so verified).
+    """
+    def __init__(self, path=HASH_CACHE_FILE):
+        self.path = path
+        self.entries = {}
+        if path.exists():
+            try:
+                with open(path, 'r') as f:
+                    self.entries = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                self.entries = {}
+
+    def _entry(self, path):
+        stat = path.stat()
+        entry = self.entries.get(str(path.resolve()))
+        if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+            return entry
+        return None
+
+    def get(self, path):
+        entry = self._entry(path)
+        return entry['hashes'] if entry else None
+
+    def verified(self, path, url):
+        entry = self._entry(path)
+        return bool(entry) and entry.get('verified_url') == url
+
+    def mark_verified(self, path, url):
+        entry = self._entry(path)
+        if entry:
+            entry['verified_url'] = url
+
+    def put(self, path, hashes):
+        stat = path.stat()
+        self.entries[str(path.resolve())] = {
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'hashes': hashes,
+        }
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'w') as f:
+            json.dump(self.entries, f, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the client mods as a Modrinth modpack")
+    parser.add_argument('--config', default='client-mods.json', help="Mod list (default: client-mods.json)")
+    parser.add_argument('--mods-dir', default='client/mods', help="Where the jars are (downloaded if missing)")
+    parser.add_argument('--output', help="Pack file (default: void-mc-<minecraft version>.mrpack)")
+    parser.add_argument('--name', default='void-mc', help="Pack name shown in launchers")
+    parser.add_argument('--version', dest='pack_version', default='1.0.0', help="Pack version")
+    parser.add_argument('--bundle', action='store_true', help="Put the jars into the pack")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="Parallel hash/download workers")
+    args = parser.parse_args()
+
+    config = load_mod_config(Path(args.config))
+    minecraft = config['minecraft']['version']
+    loader = config['fabric']['loader']
+    mods = config.get('mods', [])
+    if not mods:
+        print("No mods found in configuration file")
+        return
+
+    mods_dir = Path(args.mods_dir)
+    mods_dir.mkdir(parents=True, exist_ok=True)
+    output = Path(args.output or f"{args.name}-{minecraft}.mrpack")
+
+    jars = [(mod, mods_dir / jar_name(mod['url'])) for mod in mods]
+
+    def fetch(items):
+        with ThreadPoolExecutor(max_workers=args.workers) as executor:
+            list(executor.map(lambda item: download(item[0]['url'], item[1]), items))
+
+    def is_linked(mod):
+        return not args.bundle and urllib.parse.urlparse(mod['url']).hostname in ALLOWED_DOWNLOAD_HOSTS
+
+    cache = HashCache()
+
+    def hash_jars(downloaded=()):
+        uncached = [path for _, path in jars if cache.get(path) is None]
+        # hashlib releases the GIL on large buffers, so threads hash in parallel
+        with ThreadPoolExecutor(max_workers=args.workers) as executor:
+            for path, hashes in zip(uncached, executor.map(hash_file, uncached)):
+                cache.put(path, hashes)
+        # Straight from the URL, so the hashes are what launchers will get
+        for mod, path in downloaded:
+            cache.mark_verified(path, mod['url'])
+        cache.save()
+        return len(uncached)
+
+    missing = [(mod, path) for mod, path in jars if not path.exists()]
+    if missing:
+        print(f"Downloading {len(missing)} missing jar(s)...")
+        fetch(missing)
+    hashed = hash_jars(missing)
+    unchanged = len(jars) - hashed
+
+    # Jars without published hashes are downloaded again once, unless the
+    # cache says this exact file came from the URL
+    published = published_hashes()
+    unverified = [(mod, path) for mod, path in jars
+                  if is_linked(mod) and urllib.parse.unquote(mod['url']) not in published
+                  and not cache.verified(path, mod['url'])]
+    if unverified:
+        print(f"Downloading {len(unverified)} jar(s) without published hashes again "
+              "to check them (once per jar)...")
+        fetch(unverified)
+        hashed += hash_jars(unverified)
+
+    def mismatched():
+        stale = []
+        for mod, path in jars:
+            expected = published.get(urllib.parse.unquote(mod['url']))
+            if is_linked(mod) and expected and cache.get(path) != expected:
+                stale.append((mod, path))
+        return stale
+
+    stale = mismatched()
+    if stale:
+        print(f"⚠️  {len(stale)} jar(s) don't match Modrinth's hashes (stale or truncated), downloading again...")
+        fetch(stale)
+        hashed += hash_jars(stale)
+        stale = mismatched()
+        if stale:
+            names = ", ".join(path.name for _, path in stale)
+            raise RuntimeError(f"downloaded jar(s) still don't match Modrinth's hashes: {names}")
+    print(f"✓ Hashed {hashed} jar(s), {unchanged} unchanged")
+
+    index = {
+        'formatVersion': 1,
+        'game': 'minecraft',
+        'versionId': args.pack_version,
+        'name': args.name,
+        'files': [],
+        'dependencies': {
+            'minecraft': minecraft,
+            'fabric-loader': loader,
+        },
+    }
+
+    bundled = []
+    for mod, path in jars:
+        if not is_linked(mod):
+            bundled.append(path)
+            continue
+
+        index['files'].append({
+            'path': f"mods/{path.name}",
+            'hashes': cache.get(path),
+            'env': {'client': 'required', 'server': 'unsupported'},
+            'downloads': [mod['url']],
+            'fileSize': path.stat().st_size,
+        })
+
+    tmp_output = output.with_suffix(output.suffix + '.tmp')
+    with zipfile.ZipFile(tmp_output, 'w', compression=zipfile.ZIP_DEFLATED) as pack:
+        pack.writestr('modrinth.index.json', json.dumps(index, indent=2))
+        for path in bundled:
+            # Jars are already compressed
+            pack.write(path, f"overrides/mods/{path.name}", compress_type=zipfile.ZIP_STORED)
+    os.replace(tmp_output, output)
+
+    size_kb = output.stat().st_size / 1024
+    print(f"✓ Wrote {output} ({size_kb:.0f} KiB): "
+          f"{len(index['files'])} linked, {len(bundled)} bundled, "
+          f"Minecraft {minecraft}, Fabric loader {loader}")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\n\nCancelled by user.")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n\nError: {e}")
+        sys.exit(1)
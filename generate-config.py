@@ -8,6 +8,7 @@ Reads config.toml and generates JSON configuration files for:
 - server-settings.json (server.properties generation)
 """
 
+import os
 import sys
 import json
 from pathlib import Path
@@ -22,6 +23,8 @@ except ImportError:
         print("Error: tomli not installed. Please run 'make install-deps' first.")
         sys.exit(1)
 
+from modrinth import DEFAULT_API, ModrinthClient, best_version, primary_file  # noqa: E402
+
 
 def load_config():
     """Load configuration from config.toml."""
@@ -53,10 +56,48 @@ def extract_mods_from_toml(config, mod_type):
     return mods
 
 
+def resolve_modrinth_urls(mods, minecraft):
+    """
+    Fill in the url of mods listed by Modrinth project (modrinth = "spark")
+    with the newest Fabric file for the Minecraft version. Metadata comes
+    from resolve-mods.py's cache when it's fresh, or any age when offline.
+    Mods that can't be resolved are left out with a warning.
+    """
+    pending = [mod for mod in mods if 'modrinth' in mod and not mod.get('url')]
+    if not pending:
+        return mods
+
+    client = ModrinthClient(os.environ.get('MODRINTH_API', DEFAULT_API))
+    unresolved = []
+    try:
+        for mod in pending:
+            try:
+                versions = client.compatible_versions(mod['modrinth'], minecraft, 'fabric')
+            except OSError:
+                # No network; whatever is cached will do
+                client.offline = True
+                try:
+                    versions = client.compatible_versions(mod['modrinth'], minecraft, 'fabric')
+                except RuntimeError:
+                    versions = []
+            version = best_version(versions)
+            file = primary_file(version) if version else None
+            if file:
+                mod['url'] = file['url']
+                print(f"✓ {mod['name']}: {version['version_number']} from Modrinth")
+            else:
+                print(f"⚠️  {mod['name']}: no Modrinth file for Minecraft {minecraft} found, leaving it out")
+                unresolved.append(mod)
+    finally:
+        client.save()
+
+    return [mod for mod in mods if mod not in unresolved]
+
+
 def generate_mod_json(config, mod_type, output_file):
     """Generate JSON file for mod fetching."""
     versions = config.get('versions', {})
-    mods = extract_mods_from_toml(config, mod_type)
+    mods = resolve_modrinth_urls(extract_mods_from_toml(config, mod_type), versions.get('minecraft', '1.21.1'))
 
     mod_config = {
         'minecraft': {
@@ -104,6 +145,12 @@ def generate_server_settings_json(config, output_file):
             else:
                 server_settings[key] = value
 
+    # Runtime settings that live in the world rather than server.properties
+    # (applied over RCON by reconcile-config.py)
+    for section in ['gamerules', 'carpet', 'whitelist']:
+        if section in config:
+            server_settings[section] = config[section]
+
     output_path = Path(output_file)
     with open(output_path, 'w') as f:
         json.dump(server_settings, f, indent=2)
@@ -91,6 +91,58 @@ def convert_value_for_properties(value):
     return str(value)
 
 
+# Map JSON keys to server.properties keys
+PROPERTY_MAPPING = {
+    'level_seed': 'level-seed',
+    'difficulty': 'difficulty',
+    'gamemode': 'gamemode',
+    'max_players': 'max-players',
+    'view_distance': 'view-distance',
+    'pvp': 'pvp',
+    'online_mode': 'online-mode',
+    'spawn_protection': 'spawn-protection',
+    'motd': 'motd',
+}
+
+# Sections of server-settings.json that aren't server.properties values
+# (applied over RCON by reconcile-config.py)
+NON_PROPERTY_KEYS = ['minecraft_version', 'gamerules', 'carpet', 'whitelist']
+
+
+def desired_properties(settings, env_vars):
+    """The server.properties values the settings and .env ask for."""
+    desired = {}
+
+    for json_key, prop_key in PROPERTY_MAPPING.items():
+        if json_key in settings:
+            desired[prop_key] = convert_value_for_properties(settings[json_key])
+
+    # Handle any additional properties from JSON that aren't in the mapping
+    for key, value in settings.items():
+        if key not in PROPERTY_MAPPING and key not in NON_PROPERTY_KEYS:
+            # Convert underscores to hyphens for property names
+            desired[key.replace('_', '-')] = convert_value_for_properties(value)
+
+    whitelist = settings.get('whitelist', {})
+    if 'enabled' in whitelist:
+        desired['white-list'] = convert_value_for_properties(whitelist['enabled'])
+
+    # Inject SERVER_IP from .env if available
+    if 'SERVER_IP' in env_vars:
+        server_ip_value = env_vars['SERVER_IP']
+        # Parse IP and port (format: "0.0.0.0:25565")
+        if ':' in server_ip_value:
+            server_ip, server_port = server_ip_value.rsplit(':', 1)
+        else:
+            server_ip = server_ip_value
+            server_port = '25565'  # Default Minecraft port
+
+        desired['server-ip'] = server_ip
+        desired['server-port'] = server_port
+
+    return desired
+
+
 def main():
     """Main injection function."""
     server_dir = Path("server")
@@ -115,67 +167,14 @@ def main():
     # Load existing properties
     properties = parse_properties_file(properties_path)
 
-    # Map JSON keys to server.properties keys
-    property_mapping = {
-        'level_seed': 'level-seed',
-        'difficulty': 'difficulty',
-        'gamemode': 'gamemode',
-        'max_players': 'max-players',
-        'view_distance': 'view-distance',
-        'pvp': 'pvp',
-        'online_mode': 'online-mode',
-        'spawn_protection': 'spawn-protection',
-        'motd': 'motd',
-    }
-
     # Update properties with settings
     updated_count = 0
-    for json_key, prop_key in property_mapping.items():
-        if json_key in settings:
-            old_value = properties.get(prop_key)
-            new_value = convert_value_for_properties(settings[json_key])
-
-            if old_value != new_value:
-                properties[prop_key] = new_value
-                updated_count += 1
-                print(f"✓ Updated {prop_key}: {old_value} → {new_value}")
-
-    # Handle any additional properties from JSON that aren't in the mapping
-    for key, value in settings.items():
-        if key not in property_mapping and key != 'minecraft_version':
-            # Convert underscores to hyphens for property names
-            prop_key = key.replace('_', '-')
-            old_value = properties.get(prop_key)
-            new_value = convert_value_for_properties(value)
-
-            if old_value != new_value:
-                properties[prop_key] = new_value
-                updated_count += 1
-                print(f"✓ Updated {prop_key}: {old_value} → {new_value}")
-
-    # Inject SERVER_IP from .env if available
-    if 'SERVER_IP' in env_vars:
-        server_ip_value = env_vars['SERVER_IP']
-        # Parse IP and port (format: "0.0.0.0:25565")
-        if ':' in server_ip_value:
-            server_ip, server_port = server_ip_value.rsplit(':', 1)
-        else:
-            server_ip = server_ip_value
-            server_port = '25565'  # Default Minecraft port
-
-        # Update server-ip
-        old_ip = properties.get('server-ip')
-        if old_ip != server_ip:
-            properties['server-ip'] = server_ip
-            updated_count += 1
-            print(f"✓ Updated server-ip: {old_ip} → {server_ip}")
-
-        # Update server-port
-        old_port = properties.get('server-port')
-        if old_port != server_port:
-            properties['server-port'] = server_port
+    for prop_key, new_value in desired_properties(settings, env_vars).items():
+        old_value = properties.get(prop_key)
+        if old_value != new_value:
+            properties[prop_key] = new_value
             updated_count += 1
-            print(f"✓ Updated server-port: {old_port} → {server_port}")
+            print(f"✓ Updated {prop_key}: {old_value} → {new_value}")
 
     # Write updated properties
     if updated_count > 0:
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Launcher Cache Script
+
+Speeds up server starts in two ways:
+- The vanilla server jar, libraries and Fabric's remapped jars that
+  void-mc-launcher.jar downloads/builds on first run are cached per
+  [versions] in config.toml, so switching versions or rebuilding server/
+  doesn't download and remap everything again.
+- A JVM Class Data Sharing (AppCDS) archive is generated on the first run
+  and reused afterwards. Its name is derived from the versions, the server
+  mod list and the Java version, so it is regenerated whenever any of
+  those change.
+
+Usage:
+  ./launcher-cache.py sync       Cache what the launcher downloaded / restore what's missing
+  ./launcher-cache.py jvm-args   Print the JVM flags for the CDS archive
+  ./launcher-cache.py prewarm    Read the server's jars into the page cache before a start
+  ./launcher-cache.py clear      Remove the cache and CDS archives
+"""
+
+import os
+import sys
+import json
+import shutil
+import hashlib
+import subprocess
+from pathlib import Path
+
+# Handle TOML library imports (Python 3.11+ has tomllib built-in)
+try:
+    import tomllib
+except ImportError:
+    try:
+        import tomli as tomllib
+    except ImportError:
+        print("Error: tomli not installed. Please run 'make install-deps' first.")
+        sys.exit(1)
+
+SERVER_DIR = Path("server")
+CDS_DIR = SERVER_DIR / ".cds"
+CACHE_KEY_FILE = SERVER_DIR / ".launcher-cache-key"
+
+# Everything the launcher fetches or generates that only depends on the versions
+ARTIFACTS = [
+    "server.jar",
+    "libraries",
+    "versions",
+    ".fabric/remappedJars",
+]
+
+
+def get_cache_root():
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "void-mc" / "launcher"
+
+
+def load_versions():
+    """Read [versions] from config.toml, falling back to server-mods.json for what it doesn't set."""
+    minecraft = loader = None
+    config_path = Path("config.toml")
+    if config_path.exists():
+        with open(config_path, 'rb') as f:
+            versions = tomllib.load(f).get('versions', {})
+        minecraft, loader = versions.get('minecraft'), versions.get('fabric_loader')
+
+    mods_path = Path("server-mods.json")
+    if not (minecraft and loader) and mods_path.exists():
+        with open(mods_path, 'r') as f:
+            config = json.load(f)
+        minecraft = minecraft or config['minecraft']['version']
+        loader = loader or config['fabric']['loader']
+
+    if minecraft and loader:
+        return minecraft, loader
+
+    if config_path.exists():
+        print("Error: [versions] minecraft and fabric_loader are not set in config.toml.")
+    else:
+        print("Error: config.toml not found.")
+    print("Please run 'make setup' and 'make generate-config' first.")
+    sys.exit(1)
+
+
+def get_cache_key():
+    minecraft, loader = load_versions()
+    return f"{minecraft}-fabric-{loader}"
+
+
+def get_java_version():
+    try:
+        result = subprocess.run(["java", "-version"], capture_output=True, text=True)
+        return result.stderr.strip()
+    except OSError:
+        return ""
+
+
+def get_cds_fingerprint():
+    """Hash of everything that decides which classes the server loads."""
+    digest = hashlib.sha256()
+    digest.update(get_cache_key().encode())
+    digest.update(get_java_version().encode())
+
+    mods_path = Path("server-mods.json")
+    if mods_path.exists():
+        with open(mods_path, 'r') as f:
+            mods = json.load(f).get('mods', [])
+        for mod in sorted(mods, key=lambda mod: mod['url']):
+            digest.update(mod['url'].encode())
+
+    return digest.hexdigest()[:16]
+
+
+def copy_artifact(source, destination):
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    if source.is_dir():
+        shutil.copytree(source, destination, dirs_exist_ok=True)
+    else:
+        shutil.copy2(source, destination)
+
+
+def remove_artifact(path):
+    if path.is_dir():
+        shutil.rmtree(path)
+    elif path.exists():
+        path.unlink()
+
+
+def save_artifacts(cache_dir):
+    saved = 0
+    for artifact in ARTIFACTS:
+        source = SERVER_DIR / artifact
+        destination = cache_dir / artifact
+        if source.exists() and not destination.exists():
+            copy_artifact(source, destination)
+            saved += 1
+    return saved
+
+
+def sync():
+    """Cache freshly downloaded artifacts and restore missing ones for the configured versions."""
+    if not SERVER_DIR.exists():
+        print("Error: server directory not found.")
+        sys.exit(1)
+
+    key = get_cache_key()
+    cache_root = get_cache_root()
+    previous_key = CACHE_KEY_FILE.read_text().strip() if CACHE_KEY_FILE.exists() else None
+
+    if previous_key and previous_key != key:
+        # Versions changed: keep the old artifacts in their own cache slot and
+        # clear them out so the launcher doesn't pick up the wrong ones
+        save_artifacts(cache_root / previous_key)
+        for artifact in ARTIFACTS:
+            remove_artifact(SERVER_DIR / artifact)
+        print(f"✓ Stashed launcher artifacts for {previous_key}")
+
+    cache_dir = cache_root / key
+    saved = save_artifacts(cache_dir) if previous_key == key else 0
+
+    restored = 0
+    for artifact in ARTIFACTS:
+        source = cache_dir / artifact
+        destination = SERVER_DIR / artifact
+        if source.exists() and not destination.exists():
+            copy_artifact(source, destination)
+            restored += 1
+
+    CACHE_KEY_FILE.write_text(key + "\n")
+
+    if restored:
+        print(f"✓ Restored {restored} cached launcher artifact(s) for {key}")
+    elif saved:
+        print(f"✓ Cached {saved} launcher artifact(s) for {key}")
+    else:
+        print(f"✓ Launcher cache up to date for {key}")
+
+
+def jvm_args():
+    """
+    Print CDS flags, with the archive path relative to the server directory.
+
+    -XX:+AutoCreateSharedArchive (JDK 19+, and Minecraft 1.21 needs 21) maps
+    the archive if it is valid and dumps a new one at exit otherwise. Only
+    classes from the JDK and the -jar classpath are archived; Minecraft and
+    the mods are loaded (and mixin-transformed) by Fabric's Knot class
+    loader, which CDS can't share. Archives for other fingerprints are left
+    over from old mod sets and removed.
+    """
+    fingerprint = get_cds_fingerprint()
+    archive_name = f"{fingerprint}.jsa"
+
+    CDS_DIR.mkdir(parents=True, exist_ok=True)
+    for archive in CDS_DIR.glob("*.jsa"):
+        if archive.name != archive_name:
+            archive.unlink()
+
+    archive_path = (CDS_DIR / archive_name).relative_to(SERVER_DIR)
+    print(f"-XX:+AutoCreateSharedArchive -XX:SharedArchiveFile={archive_path}")
+
+
+def prewarm():
+    """
+    Pull the jars and CDS archive the server loads at start into the page
+    cache, so a restart doesn't wait on the disk for them.
+    """
+    paths = [SERVER_DIR / artifact for artifact in ARTIFACTS]
+    paths += [SERVER_DIR / "mods", SERVER_DIR / "void-mc-launcher.jar", CDS_DIR]
+
+    files = []
+    for path in paths:
+        if path.is_dir():
+            files.extend(p for p in path.rglob("*") if p.is_file())
+        elif path.is_file():
+            files.append(path)
+
+    total = 0
+    for path in files:
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if hasattr(os, 'posix_fadvise'):
+                # Asynchronous readahead; returns immediately
+                os.posix_fadvise(f.fileno(), 0, size, os.POSIX_FADV_WILLNEED)
+            else:
+                while f.read(1024 * 1024):
+                    pass
+        total += size
+
+    print(f"✓ Pre-warmed {len(files)} file(s), {total / 1024 / 1024:.0f} MiB")
+
+
+def clear():
+    remove_artifact(get_cache_root())
+    remove_artifact(CDS_DIR)
+    if CACHE_KEY_FILE.exists():
+        CACHE_KEY_FILE.unlink()
+    print("✓ Launcher cache and CDS archives removed")
+
+
+def main():
+    commands = {
+        'sync': sync,
+        'jvm-args': jvm_args,
+        'prewarm': prewarm,
+        'clear': clear,
+    }
+
+    if len(sys.argv) != 2 or sys.argv[1] not in commands:
+        print("Usage: launcher-cache.py <sync|jvm-args|prewarm|clear>")
+        sys.exit(1)
+
+    commands[sys.argv[1]]()
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\n\nCancelled by user.")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n\nError: {e}")
+        sys.exit(1)
@@ -0,0 +1,149 @@
+"""
+Modrinth API client shared by resolve-mods.py and generate-config.py.
+
+Project and version metadata is kept in a local index
+(.cache/modrinth/index.json) with the time it was fetched, so repeated
+lookups don't hit the API.
+"""
+
+import os
+import json
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from pathlib import Path
+
+DEFAULT_API = "https://api.modrinth.com/v2"
+USER_AGENT = "nathantebbs/void-mc"
+CACHE_FILE = Path(".cache/modrinth/index.json")
+
+# Ids per batched request; keeps URLs well under server limits
+BATCH_SIZE = 100
+# Release before beta before alpha
+VERSION_TYPE_RANK = {'release': 0, 'beta': 1, 'alpha': 2}
+
+
+class ModrinthClient:
+    """
+    Modrinth API client backed by a local metadata index.
+
+    Every project, version and compatible-version list is stored with the
+    time it was fetched; entries younger than ttl are served from the index
+    without a request. offline serves any cached entry regardless of age.
+    """
+    def __init__(self, api_base, cache_file=CACHE_FILE, ttl_hours=24, offline=False, refresh=False):
+        self.api_base = api_base.rstrip('/')
+        self.cache_file = cache_file
+        self.ttl = ttl_hours * 3600
+        self.offline = offline
+        self.refresh = refresh
+        self.requests = 0
+
+        self.index = {}
+        if cache_file.exists():
+            try:
+                with open(cache_file, 'r') as f:
+                    self.index = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                self.index = {}
+
+    def save(self):
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_file.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(self.index, f)
+        os.replace(tmp_path, self.cache_file)
+
+    def _cached(self, key):
+        entry = self.index.get(key)
+        if entry is None or self.refresh:
+            return None
+        if self.offline or time.time() - entry['fetched_at'] < self.ttl:
+            return entry
+        return None
+
+    def _store(self, key, data):
+        self.index[key] = {'fetched_at': time.time(), 'data': data}
+
+    def _get(self, path, **params):
+        if self.offline:
+            raise RuntimeError(f"{path} is not cached and --offline was given")
+
+        query = urllib.parse.urlencode({k: json.dumps(v) for k, v in params.items()})
+        url = f"{self.api_base}{path}" + (f"?{query}" if query else "")
+        request = urllib.request.Request(url, headers={'User-Agent': USER_AGENT})
+        self.requests += 1
+
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                return json.load(response)
+        except urllib.error.HTTPError as e:
+            if e.code == 404:
+                return None
+            raise
+
+    def projects(self, ids):
+        """Projects by id or slug, as {requested id: project}; unknown ids are left out."""
+        found = {}
+        missing = []
+        for project_id in ids:
+            entry = self._cached(f"project:{project_id}")
+            if entry:
+                found[project_id] = entry['data']
+            else:
+                missing.append(project_id)
+
+        for start in range(0, len(missing), BATCH_SIZE):
+            batch = missing[start:start + BATCH_SIZE]
+            for project in self._get("/projects", ids=batch) or []:
+                self._store(f"project:{project['id']}", project)
+                self._store(f"project:{project['slug']}", project)
+                for requested in batch:
+                    if requested in (project['id'], project['slug']):
+                        found[requested] = project
+
+        return found
+
+    def versions(self, ids):
+        """Versions by id, as {id: version}."""
+        found = {}
+        missing = []
+        for version_id in ids:
+            entry = self._cached(f"version:{version_id}")
+            if entry:
+                found[version_id] = entry['data']
+            else:
+                missing.append(version_id)
+
+        for start in range(0, len(missing), BATCH_SIZE):
+            for version in self._get("/versions", ids=missing[start:start + BATCH_SIZE]) or []:
+                self._store(f"version:{version['id']}", version)
+                found[version['id']] = version
+
+        return found
+
+    def compatible_versions(self, project_id, minecraft, loader):
+        key = f"compatible:{project_id}:{minecraft}:{loader}"
+        entry = self._cached(key)
+        if entry:
+            return entry['data']
+
+        versions = self._get(f"/project/{project_id}/version",
+                             loaders=[loader], game_versions=[minecraft]) or []
+        self._store(key, versions)
+        return versions
+
+
+def best_version(versions):
+    """Newest release, falling back to the newest beta, then alpha."""
+    if not versions:
+        return None
+    # ISO timestamps sort correctly as strings; min() keeps the first (newest) of the best type
+    newest_first = sorted(versions, key=lambda v: v['date_published'], reverse=True)
+    return min(newest_first, key=lambda v: VERSION_TYPE_RANK.get(v['version_type'], 3))
+
+
+def primary_file(version):
+    files = version.get('files', [])
+    return next((f for f in files if f.get('primary')), files[0] if files else None)
@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+Startup Profiling Script
+
+Breaks the server's last boot down into phases and per-mod time, from the
+timestamps in its log, and compares it with earlier boots.
+
+Usage:
+  ./profile-startup.py [--logs server/logs] [--no-save]
+  ./profile-startup.py list
+  ./profile-startup.py compare [<run-id>] [<run-id>]
+
+logs/debug.log is preferred: its lines carry milliseconds and the name of
+the logger, which tells which mod logged them. The server only writes it
+with the log config in server/log4j2.xml, which `make run-server` passes
+to Java. latest.log only has whole seconds and no logger, so with it only
+the phases are timed.
+
+Each boot is saved as a JSON file in server/startup-profiles/ with the mod
+list Fabric reported, and compared with the previous saved boot, so the
+mods added or updated between them can be matched with the time they cost.
+"""
+
+import re
+import sys
+import json
+import argparse
+from datetime import date, datetime
+from pathlib import Path
+
+PROFILES_DIR = Path("server") / "startup-profiles"
+
+# debug.log as written with server/log4j2.xml:
+# [2026-10-19 12:34:56.789] [main/INFO] (FabricLoader) ...
+# (or the vanilla client's [19Oct2026 12:34:56.789], which has the same fields)
+DEBUG_LINE = re.compile(r'^\[(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\.\d{3}|\d{2}\w{3}\d{4} \d{2}:\d{2}:\d{2}\.\d{3})\] '
+                        r'\[([^\]]*)/(\w+)\] \(([^)]*)\) (.*)$')
+# [12:34:56] [main/INFO]: ...
+LATEST_LINE = re.compile(r'^\[(\d{2}:\d{2}:\d{2})\] \[([^\]]*)/(\w+)\]: (.*)$')
+# By the length of the timestamp
+TIME_FORMATS = {23: "%Y-%m-%d %H:%M:%S.%f", 21: "%d%b%Y %H:%M:%S.%f", 8: "%H:%M:%S"}
+
+BOOT_PATTERN = re.compile(r'Loading Minecraft (\S+) with Fabric Loader (\S+)')
+MOD_COUNT_PATTERN = re.compile(r'Loading (\d+) mods:')
+# "\t- lithium 0.21.1" for mods, "\t   |-- fabric-api-base 0.4.62" for jars bundled in them
+MOD_PATTERN = re.compile(r'^\s+- (\S+) (\S+)')
+BUNDLED_MOD_PATTERN = re.compile(r'^\s+\|-- (\S+) (\S+)')
+DONE_PATTERN = re.compile(r'Done \(([\d.]+)s\)!')
+
+# Each phase runs from the first line matching its pattern to the start of
+# the next phase found; the last one ends at "Done". In the order the
+# server logs them.
+PHASES = [
+    ("Loader and mod discovery", BOOT_PATTERN),
+    ("Mixins and mod initializers", re.compile(r'SpongePowered MIXIN Subsystem')),
+    ("Data packs and registries", re.compile(r'^Environment: ')),
+    ("Server init (properties, network)", re.compile(r'^Starting minecraft server version')),
+    ("World loading", re.compile(r'^Preparing level "')),
+    ("Spawn preparation", re.compile(r'^Preparing (?:start region|spawn area)')),
+]
+
+# Loggers that aren't a mod's, by what they're charged to
+LOGGER_OWNERS = {
+    "mixin": "mixin",
+    "net.minecraft": "minecraft",
+    "com.mojang": "minecraft",
+    "net.fabricmc.loader": "fabricloader",
+}
+
+
+def _read_boot(path, pattern):
+    """Lines of the last boot in one log, or None if it has none in the expected format."""
+    lines = []
+    mod_lines = []
+    started = None
+    previous = None
+    day_offset = 0
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for raw in f:
+            match = pattern.match(raw)
+            if not match:
+                # Continuation lines; the mod list is logged as one multi-line message
+                if lines and MOD_COUNT_PATTERN.search(lines[-1][2]):
+                    mod_lines.append(raw)
+                continue
+
+            timestamp = match.group(1)
+            logged = datetime.strptime(timestamp, TIME_FORMATS[len(timestamp)])
+            message = match.group(match.lastindex).rstrip()
+            logger = match.group(4) if pattern is DEBUG_LINE else ""
+
+            # debug.log keeps growing until it's rotated by size; start over at each boot
+            boot = BOOT_PATTERN.search(message)
+            if boot:
+                started = logged
+                previous = logged
+                day_offset = 0
+                lines = []
+                mod_lines = []
+            if started is None:
+                continue
+
+            # latest.log only has the time of day
+            if pattern is LATEST_LINE and logged < previous:
+                day_offset += 86400
+            previous = logged
+            lines.append(((logged - started).total_seconds() + day_offset, logger, message))
+
+    if started is None:
+        return None
+    if pattern is LATEST_LINE:
+        # Close enough for naming the run, unless it booted just before midnight
+        started = datetime.combine(date.fromtimestamp(path.stat().st_mtime), started.time())
+    return lines, mod_lines, started
+
+
+def read_log(logs_dir):
+    """
+    Lines of the last boot as (seconds since boot, logger, message), the mod
+    lines, when it started and the log's name. debug.log is only used if
+    it has the last boot in server/log4j2.xml's format; otherwise (the
+    server was started without it, or it's another tool's debug.log)
+    latest.log is.
+    """
+    debug_log = logs_dir / "debug.log"
+    latest_log = logs_dir / "latest.log"
+    if not debug_log.exists() and not latest_log.exists():
+        raise FileNotFoundError(f"No debug.log or latest.log in {logs_dir}")
+
+    # Both get the same lines while the server runs; a debug.log that
+    # stopped well before latest.log is from an earlier boot
+    if debug_log.exists():
+        if latest_log.exists() and debug_log.stat().st_mtime < latest_log.stat().st_mtime - 60:
+            problem = "is older than latest.log"
+        else:
+            boot = _read_boot(debug_log, DEBUG_LINE)
+            if boot:
+                return (*boot, debug_log.name)
+            problem = "has no boot in the expected format"
+        print(f"⚠️  {debug_log} {problem}, using latest.log "
+              "(per-mod times need the server started with server/log4j2.xml, see the README)")
+        print()
+
+    if latest_log.exists():
+        boot = _read_boot(latest_log, LATEST_LINE)
+        if boot:
+            return (*boot, latest_log.name)
+    raise ValueError(f"No server boot found in {logs_dir}")
+
+
+def parse_mods(mod_lines):
+    """Mods as {id: version}, and the ids of everything loaded including bundled jars."""
+    mods = {}
+    all_ids = set()
+    for line in mod_lines:
+        match = MOD_PATTERN.match(line)
+        if match:
+            mods[match.group(1)] = match.group(2)
+            all_ids.add(match.group(1))
+            continue
+        match = BUNDLED_MOD_PATTERN.match(line)
+        if match:
+            all_ids.add(match.group(1))
+    return mods, all_ids
+
+
+def logger_owner(logger, mod_ids, cache):
+    """The mod a logger belongs to: its name, or a part of its package, is the mod id."""
+    if logger in cache:
+        return cache[logger]
+
+    owner = None
+    lowered = logger.lower()
+    parts = re.split(r'[./:]', lowered)
+    if lowered in mod_ids:
+        owner = lowered
+    else:
+        for part in parts:
+            if part in mod_ids and part not in ("java", "minecraft"):
+                owner = part
+                break
+    if owner is None:
+        for prefix, name in LOGGER_OWNERS.items():
+            if lowered.startswith(prefix.lower()):
+                owner = name
+                break
+    cache[logger] = owner or f"other ({logger})"
+    return cache[logger]
+
+
+def profile_boot(lines, mod_lines, with_loggers):
+    mods, mod_ids = parse_mods(mod_lines)
+    done = next((i for i, (_, _, message) in enumerate(lines) if DONE_PATTERN.search(message)), None)
+    if done is None:
+        raise ValueError("The last boot hasn't finished yet (no \"Done\" line); run this again once it has")
+    lines = lines[:done + 1]
+    total = lines[-1][0]
+
+    # Phase start times, in log order; phases the server didn't log are skipped
+    starts = []
+    for name, pattern in PHASES:
+        start = next((t for t, _, message in lines if pattern.search(message)), None)
+        if start is not None and (not starts or start >= starts[-1][1]):
+            starts.append((name, start))
+    phases = {name: round(end - start, 3) for (name, start), (_, end)
+              in zip(starts, starts[1:] + [(None, total)])}
+
+    # The time since the previous line is charged to whoever logs the next
+    # one: mods mostly log once they've loaded their config or finished
+    # initializing. Lines from vanilla and the loader keep the rest apart.
+    mod_times = {}
+    if with_loggers:
+        cache = {}
+        previous = 0.0
+        for t, logger, _ in lines:
+            owner = logger_owner(logger, mod_ids, cache)
+            mod_times[owner] = mod_times.get(owner, 0.0) + t - previous
+            previous = t
+        mod_times = {owner: round(seconds, 3) for owner, seconds in mod_times.items()}
+
+    return {
+        'total': round(total, 3),
+        'phases': phases,
+        'mod_times': mod_times,
+        'mods': mods,
+    }
+
+
+def load_profiles():
+    if not PROFILES_DIR.exists():
+        return []
+    return [json.loads(path.read_text()) for path in sorted(PROFILES_DIR.glob("*.json"))]
+
+
+def save_profile(profile):
+    PROFILES_DIR.mkdir(parents=True, exist_ok=True)
+    path = PROFILES_DIR / f"{profile['id']}.json"
+    if path.exists():
+        return None
+    path.write_text(json.dumps(profile, indent=2) + "\n")
+    return path
+
+
+def _delta(seconds):
+    return f"{seconds:+.1f}s" if abs(seconds) >= 0.05 else "   ±0"
+
+
+def print_profile(profile, top):
+    print(f"Boot {profile['id']} ({profile['source']}): Minecraft {profile['minecraft']}, "
+          f"Fabric Loader {profile['loader']}, {len(profile['mods'])} mods")
+    print(f"Total: {profile['total']:.1f}s")
+    print()
+    print("Phases:")
+    for name, seconds in profile['phases'].items():
+        share = seconds / profile['total'] * 100 if profile['total'] else 0
+        print(f"  {name:<36} {seconds:7.1f}s  {share:5.1f}%")
+
+    if profile['mod_times']:
+        print()
+        print("Slowest (time before their log lines):")
+        ranked = sorted(profile['mod_times'].items(), key=lambda item: item[1], reverse=True)[:top]
+        for owner, seconds in ranked:
+            print(f"  {owner:<36} {seconds:7.1f}s")
+    else:
+        print()
+        print("⚠️  Per-mod times need logs/debug.log, written when the server runs with server/log4j2.xml")
+
+
+def print_comparison(old, new, top):
+    print(f"Compared with boot {old['id']} ({old['total']:.1f}s): {_delta(new['total'] - old['total'])}")
+
+    added = sorted(set(new['mods']) - set(old['mods']))
+    removed = sorted(set(old['mods']) - set(new['mods']))
+    updated = sorted(mod for mod in set(new['mods']) & set(old['mods']) if new['mods'][mod] != old['mods'][mod])
+    for mod in added:
+        print(f"  + {mod} {new['mods'][mod]}")
+    for mod in removed:
+        print(f"  - {mod} {old['mods'][mod]}")
+    for mod in updated:
+        print(f"  ~ {mod} {old['mods'][mod]} → {new['mods'][mod]}")
+    if (new['minecraft'], new['loader']) != (old['minecraft'], old['loader']):
+        print(f"  ~ Minecraft {old['minecraft']} → {new['minecraft']}, "
+              f"Fabric Loader {old['loader']} → {new['loader']}")
+    if not (added or removed or updated):
+        print("  (same mods)")
+
+    print()
+    print("Phases:")
+    for name in dict.fromkeys(list(new['phases']) + list(old['phases'])):
+        before, after = old['phases'].get(name, 0.0), new['phases'].get(name, 0.0)
+        print(f"  {name:<36} {before:7.1f}s → {after:7.1f}s  {_delta(after - before)}")
+
+    if new['mod_times'] and old['mod_times']:
+        changes = {owner: new['mod_times'].get(owner, 0.0) - old['mod_times'].get(owner, 0.0)
+                   for owner in set(new['mod_times']) | set(old['mod_times'])}
+        ranked = sorted(changes.items(), key=lambda item: abs(item[1]), reverse=True)[:top]
+        print()
+        print("Biggest changes per mod:")
+        for owner, change in ranked:
+            print(f"  {owner:<36} {old['mod_times'].get(owner, 0.0):7.1f}s → "
+                  f"{new['mod_times'].get(owner, 0.0):7.1f}s  {_delta(change)}")
+
+
+def find_profile(profiles, run_id):
+    for profile in profiles:
+        if profile['id'] == run_id:
+            return profile
+    print(f"Error: no saved boot {run_id} (see ./profile-startup.py list)")
+    sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the server's startup per phase and per mod")
+    parser.add_argument('--logs', default='server/logs', help="Log directory (default: server/logs)")
+    parser.add_argument('--no-save', action='store_true', help="Don't save the boot to compare later")
+    parser.add_argument('--top', type=int, default=15, help="How many mods to show")
+    subparsers = parser.add_subparsers(dest='command')
+
+    subparsers.add_parser('list', help="List saved boots")
+
+    compare_parser = subparsers.add_parser('compare', help="Compare two saved boots (default: the last two)")
+    compare_parser.add_argument('runs', nargs='*', help="Boot ids, older first")
+
+    args = parser.parse_args()
+
+    if args.command == 'list':
+        profiles = load_profiles()
+        if not profiles:
+            print(f"No saved boots in {PROFILES_DIR}")
+        for profile in profiles:
+            print(f"{profile['id']}  {profile['total']:7.1f}s  Minecraft {profile['minecraft']}, "
+                  f"{len(profile['mods'])} mods")
+        return
+
+    if args.command == 'compare':
+        profiles = load_profiles()
+        if len(args.runs) > 2:
+            parser.error("compare takes at most two boot ids")
+        if len(args.runs) == 2:
+            old, new = (find_profile(profiles, run_id) for run_id in args.runs)
+        elif len(args.runs) == 1:
+            old, new = find_profile(profiles, args.runs[0]), profiles[-1]
+        elif len(profiles) >= 2:
+            old, new = profiles[-2], profiles[-1]
+        else:
+            print("Need at least two saved boots to compare")
+            sys.exit(1)
+        print_profile(new, args.top)
+        print()
+        print_comparison(old, new, args.top)
+        return
+
+    logs_dir = Path(args.logs)
+    lines, mod_lines, started, source = read_log(logs_dir)
+    boot = BOOT_PATTERN.search(lines[0][2])
+    profile = {
+        'id': started.strftime("%Y%m%d-%H%M%S"),
+        'source': source,
+        'minecraft': boot.group(1),
+        'loader': boot.group(2),
+    }
+    profile.update(profile_boot(lines, mod_lines, with_loggers=source == "debug.log"))
+
+    previous = [p for p in load_profiles() if p['id'] < profile['id']]
+    print_profile(profile, args.top)
+
+    if not args.no_save:
+        path = save_profile(profile)
+        if path:
+            print()
+            print(f"✓ Saved to {path}")
+
+    if previous:
+        print()
+        print_comparison(previous[-1], profile, args.top)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\n\nCancelled by user.")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n\nError: {e}")
+        sys.exit(1)
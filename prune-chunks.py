@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Chunk Pruning Script
+
+Deletes chunks players have (almost) never been in, judged by each chunk's
+InhabitedTime, and rewrites the remaining region files compacted. Pruned
+chunks are regenerated from the seed if anyone ever goes there.
+Usage: ./prune-chunks.py [world-dir] [--min-inhabited TICKS] [--apply]
+
+Without --apply this is a dry run that only reports how much space would be
+freed. The server must be stopped to apply; take a backup first
+(make backup). Chunk payloads are only decompressed as far as the
+InhabitedTime tag, and region files are processed in parallel.
+"""
+
+import os
+import sys
+import mmap
+import fcntl
+import argparse
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+from regionfile import (
+    SECTOR_SIZE, HEADER_SIZE, EXTERNAL_FLAG,
+    region_coords, read_header, read_chunk_header, read_root_long,
+    write_region, sectors_for, external_chunk_path,
+)
+
+# Per-chunk data the game keeps outside the terrain region files
+COMPANION_DIRS = ('entities', 'poi')
+
+
+def server_is_running(world_dir):
+    """The server holds an fcntl lock on session.lock while the world is open."""
+    lock_path = world_dir / "session.lock"
+    if not lock_path.exists():
+        return False
+
+    with open(lock_path, 'a') as f:
+        try:
+            fcntl.lockf(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            return True
+        fcntl.lockf(f, fcntl.LOCK_UN)
+    return False
+
+
+def chunk_payload(mm, path, coords, index, offset, length, compression):
+    """Return (payload, compression) for a chunk, following .mcc files for external chunks."""
+    if compression & EXTERNAL_FLAG:
+        with open(external_chunk_path(path, *coords, index), 'rb') as f:
+            return f.read(), compression & ~EXTERNAL_FLAG
+
+    start = offset * SECTOR_SIZE + 5
+    return mm[start:start + length - 1], compression
+
+
+def find_prunable(path, min_inhabited):
+    """
+    Return (drop, keep, unreadable) index sets for a terrain region file.
+
+    Chunks whose InhabitedTime can't be read (LZ4 compression, corruption)
+    are always kept.
+    """
+    coords = region_coords(Path(path)) or (0, 0)
+    drop, keep, unreadable = set(), set(), set()
+
+    if os.path.getsize(path) < HEADER_SIZE:
+        return drop, keep, unreadable
+
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for index, offset, _, _ in read_header(mm):
+            try:
+                length, compression = read_chunk_header(mm, offset)
+                data, compression = chunk_payload(mm, path, coords, index, offset, length, compression)
+                inhabited = read_root_long(data, compression, 'InhabitedTime')
+            except Exception:
+                unreadable.add(index)
+                keep.add(index)
+                continue
+
+            if inhabited is not None and inhabited < min_inhabited:
+                drop.add(index)
+            else:
+                keep.add(index)
+
+    return drop, keep, unreadable
+
+
+def rewrite_without(path, drop, apply):
+    """
+    Remove the chunks in drop from a region file.
+
+    Returns (old_size, new_size). Only writes anything when apply is set; the
+    new file is written next to the old one and renamed over it.
+    """
+    path = Path(path)
+    if not path.exists():
+        return 0, 0
+
+    old_size = path.stat().st_size
+    if old_size < HEADER_SIZE:
+        return old_size, old_size
+
+    coords = region_coords(path) or (0, 0)
+    kept = []
+    kept_count = 0
+    new_size = HEADER_SIZE
+
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for index, offset, sector_count, timestamp in read_header(mm):
+            header = read_chunk_header(mm, offset)
+            if header is None:
+                # find_prunable keeps what it can't read, so copy its sectors
+                # through as they are (nothing to copy if they're past the end)
+                kept_count += 1
+                new_size += sector_count * SECTOR_SIZE
+                start = offset * SECTOR_SIZE
+                if apply and start < len(mm):
+                    kept.append((index, mm[start:start + sector_count * SECTOR_SIZE], timestamp))
+                continue
+            length, compression = header
+
+            if index in drop:
+                if apply and compression & EXTERNAL_FLAG:
+                    mcc = external_chunk_path(path, *coords, index)
+                    if os.path.exists(mcc):
+                        os.unlink(mcc)
+                continue
+
+            kept_count += 1
+            new_size += sectors_for(length) * SECTOR_SIZE
+            if apply:
+                start = offset * SECTOR_SIZE
+                kept.append((index, mm[start:start + length + 4], timestamp))
+
+    if apply:
+        if kept:
+            tmp_path = path.with_suffix('.mca.tmp')
+            write_region(tmp_path, kept)
+            os.replace(tmp_path, path)
+        else:
+            path.unlink()
+
+    # Dropping every chunk deletes the region file entirely
+    return old_size, new_size if kept_count else 0
+
+
+def prune_region(task):
+    """Prune one terrain region and the matching entities/poi regions. Runs in a worker process."""
+    path, min_inhabited, apply = task
+    path = Path(path)
+
+    drop, keep, unreadable = find_prunable(path, min_inhabited)
+    result = {
+        'path': str(path),
+        'dropped': len(drop),
+        'kept': len(keep),
+        'unreadable': len(unreadable),
+        'old_bytes': 0,
+        'new_bytes': 0,
+    }
+
+    if not drop:
+        size = path.stat().st_size
+        result['old_bytes'] = result['new_bytes'] = size
+        return result
+
+    targets = [path] + [path.parent.parent / name / path.name for name in COMPANION_DIRS]
+    for target in targets:
+        old_size, new_size = rewrite_without(target, drop, apply)
+        result['old_bytes'] += old_size
+        result['new_bytes'] += new_size
+
+    return result
+
+
+def find_terrain_regions(world_dir):
+    """Region files of every dimension (region/, DIM-1/region/, dimensions/*/*/region/)."""
+    return sorted(
+        path for path in world_dir.rglob("region/r.*.mca")
+        if path.parent.name == 'region'
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prune chunks players have never spent time in")
+    parser.add_argument('world', nargs='?', default='server/world', help="World directory")
+    parser.add_argument('--min-inhabited', type=int, default=200,
+                        help="Keep chunks with at least this many ticks of InhabitedTime (20 ticks = 1s)")
+    parser.add_argument('--apply', action='store_true', help="Actually rewrite region files")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="Worker processes")
+    args = parser.parse_args()
+
+    world_dir = Path(args.world)
+    if not world_dir.exists():
+        print(f"Error: world directory not found: {world_dir}")
+        sys.exit(1)
+
+    if args.apply and server_is_running(world_dir):
+        print("Error: the server is running. Stop it before pruning chunks.")
+        sys.exit(1)
+
+    regions = find_terrain_regions(world_dir)
+    if not regions:
+        print(f"No region files found in {world_dir}")
+        return
+
+    mode = "Pruning" if args.apply else "Dry run:"
+    print(f"{mode} {len(regions)} region file(s), keeping chunks with InhabitedTime >= {args.min_inhabited}")
+    print()
+
+    tasks = [(str(path), args.min_inhabited, args.apply) for path in regions]
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        chunksize = max(1, len(tasks) // (args.workers * 8))
+        results = list(executor.map(prune_region, tasks, chunksize=chunksize))
+
+    dropped = sum(r['dropped'] for r in results)
+    kept = sum(r['kept'] for r in results)
+    unreadable = sum(r['unreadable'] for r in results)
+    old_bytes = sum(r['old_bytes'] for r in results)
+    new_bytes = sum(r['new_bytes'] for r in results)
+    emptied = sum(1 for r in results if r['dropped'] and not r['kept'])
+
+    print(f"Chunks pruned:   {dropped} of {dropped + kept}")
+    print(f"Regions removed: {emptied}")
+    if unreadable:
+        print(f"Unreadable:      {unreadable} (kept)")
+    print(f"Size:            {old_bytes / 1024 / 1024:.1f} MiB → {new_bytes / 1024 / 1024:.1f} MiB "
+          f"({(old_bytes - new_bytes) / 1024 / 1024:.1f} MiB freed)")
+    print()
+
+    if args.apply:
+        print("✓ Pruning complete")
+    else:
+        print("Nothing was changed. Run again with --apply (server stopped) to prune.")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\n\nCancelled by user.")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n\nError: {e}")
+        sys.exit(1)
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Config Reconciliation Script
+
+Applies server-settings.json to the running server, so most config.toml
+changes don't need a restart.
+Usage: ./reconcile-config.py [--dry-run]
+
+Compares the settings with the live server over RCON and changes what can
+be changed in-game:
+- difficulty and gamemode (as the default game mode)
+- the whitelist (on/off and the player list)
+- [gamerules] and [carpet] rules from config.toml (the latter only with
+  Carpet installed)
+
+The live values are read over RCON where the server can report them, so
+changes made in-game (/difficulty, /whitelist off) are reverted too. The
+default game mode and whether the whitelist is on can't be read, so those
+are set again on every run; setting them is harmless when they match.
+
+Every server.properties value is still written (as inject-server-settings.py
+does), so the next start agrees with the live server. Properties that only
+take effect on start (view-distance, max-players, motd, ...) are listed as
+needing a restart. Without a running server this is the same as
+'make inject-settings'.
+"""
+
+import re
+import sys
+import argparse
+import importlib.util
+from pathlib import Path
+
+try:
+    from mcrcon import MCRcon, MCRconException
+except ImportError:
+    print("Error: mcrcon not installed. Please run 'make install-deps' first.")
+    sys.exit(1)
+
+
+def load_inject_module():
+    """inject-server-settings.py owns the settings → server.properties mapping."""
+    path = Path(__file__).resolve().parent / "inject-server-settings.py"
+    spec = importlib.util.spec_from_file_location("inject_server_settings", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+inject = load_inject_module()
+
+# server.properties keys with an in-game equivalent: key -> (command that
+# reads the live value and its pattern, or None if there is none; command
+# for a new value)
+LIVE_PROPERTIES = {
+    'difficulty': ("difficulty", re.compile(r'The difficulty is (\w+)'), lambda value: f"difficulty {value}"),
+    'gamemode': (None, None, lambda value: f"defaultgamemode {value}"),
+    'white-list': (None, None, lambda value: f"whitelist {'on' if value == 'true' else 'off'}"),
+}
+
+UNKNOWN_COMMAND = "Unknown or incomplete command"
+# "Whitelist is already turned on", i.e. setting it changed nothing
+UNCHANGED_PATTERN = re.compile(r'already', re.IGNORECASE)
+GAMERULE_PATTERN = re.compile(r'is currently set to: (\S+)')
+CARPET_PATTERN = re.compile(r'Current value: (\S+)')
+# "There are 2 whitelisted player(s): Steve, Alex"
+WHITELIST_PATTERN = re.compile(r'whitelisted player(?:s|\(s\))?: (.*)$')
+
+
+def format_value(value):
+    return inject.convert_value_for_properties(value)
+
+
+def connect_rcon(env_vars):
+    """Return a connected MCRcon, or None if the server isn't reachable."""
+    password = env_vars.get('RCON_PASSWORD')
+    if not password:
+        return None
+
+    rcon = MCRcon(env_vars.get('RCON_HOST', '127.0.0.1'), password,
+                  port=int(env_vars.get('RCON_PORT', '25575')))
+    try:
+        rcon.connect()
+    except OSError:
+        return None
+    except MCRconException as e:
+        rcon.disconnect()
+        if "Login failed" in str(e):
+            print("Error: RCON login failed. Check that RCON_PASSWORD in .env matches rcon.password "
+                  "in server/server.properties.")
+            sys.exit(1)
+        return None  # timed out
+    return rcon
+
+
+def plan_properties(rcon, properties, desired):
+    """
+    (description, command, always) for the properties with an in-game
+    equivalent. always marks the ones that can't be read and are set anyway.
+    """
+    actions = []
+    for key, (query, pattern, set_command) in LIVE_PROPERTIES.items():
+        if key not in desired:
+            continue
+        wanted = desired[key]
+        if query is None:
+            old_value = properties.get(key)
+            description = f"{key}: {old_value} → {wanted}" if old_value != wanted else f"{key}: {wanted}"
+            actions.append((description, set_command(wanted), old_value == wanted))
+            continue
+
+        match = pattern.search(rcon.command(query))
+        current = match.group(1).lower() if match else None
+        if current != wanted:
+            actions.append((f"{key}: {current} (live) → {wanted}", set_command(wanted), False))
+    return actions
+
+
+def plan_rules(rcon, kind, rules, pattern, set_command):
+    """(description, command, always) for each rule whose live value differs."""
+    actions = []
+    for name, value in rules.items():
+        wanted = format_value(value)
+        query = f"carpet {name}" if kind == 'carpet' else f"gamerule {name}"
+        response = rcon.command(query)
+        if kind == 'carpet' and UNKNOWN_COMMAND in response:
+            print(f"⚠️  Carpet isn't loaded on the server; skipping {len(rules)} [carpet] rule(s)")
+            return []
+        match = pattern.search(response)
+        current = match.group(1) if match else None
+        if current != wanted:
+            actions.append((f"{kind} {name}: {current} → {wanted}", set_command(name, wanted), False))
+    return actions
+
+
+def plan_whitelist(rcon, players):
+    match = WHITELIST_PATTERN.search(rcon.command("whitelist list").strip())
+    current = {p.strip() for p in match.group(1).split(',') if p.strip()} if match else set()
+    wanted = set(players)
+
+    actions = []
+    for player in sorted(wanted - current):
+        actions.append((f"whitelist add {player}", f"whitelist add {player}", False))
+    for player in sorted(current - wanted):
+        actions.append((f"whitelist remove {player}", f"whitelist remove {player}", False))
+    return actions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply server settings to the running server")
+    parser.add_argument('--dry-run', action='store_true', help="Only show what would change")
+    args = parser.parse_args()
+
+    properties_path = Path("server") / "server.properties"
+    if not properties_path.exists():
+        print("Error: server/server.properties not found. Run the server once first.")
+        sys.exit(1)
+
+    settings = inject.load_server_settings()
+    env_vars = inject.load_env_vars()
+    properties = inject.parse_properties_file(properties_path)
+
+    desired = inject.desired_properties(settings, env_vars)
+    changed = {}
+    for key, value in desired.items():
+        if properties.get(key) != value:
+            changed[key] = (properties.get(key), value)
+
+    rcon = connect_rcon(env_vars)
+    live_actions = []
+    restart_needed = []
+
+    if rcon is None:
+        print("Server not reachable over RCON; only server.properties will be updated.")
+        restart_needed = sorted(changed)
+    else:
+        restart_needed = sorted(key for key in changed if key not in LIVE_PROPERTIES)
+        live_actions += plan_properties(rcon, properties, desired)
+        live_actions += plan_rules(rcon, 'gamerule', settings.get('gamerules', {}), GAMERULE_PATTERN,
+                                   lambda name, value: f"gamerule {name} {value}")
+        # setDefault also stores the rule in the world's carpet.conf, so it survives restarts
+        live_actions += plan_rules(rcon, 'carpet', settings.get('carpet', {}), CARPET_PATTERN,
+                                   lambda name, value: f"carpet setDefault {name} {value}")
+        if 'players' in settings.get('whitelist', {}):
+            live_actions += plan_whitelist(rcon, settings['whitelist']['players'])
+
+    applied = 0
+    for description, command, always in live_actions:
+        if args.dry_run:
+            print(f"  would {'set' if always else 'apply'} {description}"
+                  + (" (can't be read over RCON, so it's set every run)" if always else ""))
+            continue
+        response = rcon.command(command).strip()
+        # Set on every run; only worth mentioning if the server says it changed something
+        if always and (UNCHANGED_PATTERN.search(response) or command.startswith("defaultgamemode")):
+            continue
+        applied += 1
+        print(f"✓ Applied {description}" + (f" ({response})" if response else ""))
+
+    if rcon is not None:
+        rcon.disconnect()
+
+    if changed and not args.dry_run:
+        for key, (_, new_value) in changed.items():
+            properties[key] = new_value
+        inject.write_properties_file(properties_path, properties)
+        print(f"✓ Wrote {len(changed)} change(s) to server.properties")
+
+    print()
+    for key in restart_needed:
+        old_value, new_value = changed[key]
+        print(f"⚠️  {key}: {old_value} → {new_value} (takes effect after a restart)")
+
+    if args.dry_run:
+        print("Dry run, nothing was changed.")
+    elif restart_needed:
+        print("Restart the server to apply the properties above.")
+    elif applied or changed:
+        print("✓ All changes applied live, no restart needed")
+    else:
+        print("✓ Server already matches the configuration")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\n\nCancelled by user.")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n\nError: {e}")
+        sys.exit(1)
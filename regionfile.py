@@ -0,0 +1,225 @@
+"""
+Anvil region file (.mca) helpers shared by analyze-regions.py and prune-chunks.py.
+
+A region file holds up to 32x32 chunks. It starts with an 8 KiB header: 1024
+big-endian location entries (3 byte sector offset, 1 byte sector count)
+followed by 1024 big-endian write timestamps. Each chunk is stored at
+offset * 4096 as a 4 byte length, a 1 byte compression type and the
+compressed NBT payload. Chunks too big for the file live in c.X.Z.mcc files
+next to it, flagged by the high bit of the compression type.
+"""
+
+import os
+import re
+import zlib
+import struct
+
+SECTOR_SIZE = 4096
+HEADER_SIZE = 2 * SECTOR_SIZE
+CHUNKS_PER_REGION = 1024
+
+COMPRESSION_GZIP = 1
+COMPRESSION_ZLIB = 2
+COMPRESSION_NONE = 3
+COMPRESSION_LZ4 = 4
+EXTERNAL_FLAG = 0x80
+
+REGION_NAME_PATTERN = re.compile(r'^r\.(-?\d+)\.(-?\d+)\.mca$')
+
+_HEADER = struct.Struct('>1024I')
+_CHUNK_HEADER = struct.Struct('>IB')
+
+
+def region_coords(path):
+    """Return the (x, z) region coordinates from an r.X.Z.mca file name."""
+    match = REGION_NAME_PATTERN.match(path.name)
+    if not match:
+        return None
+    return int(match.group(1)), int(match.group(2))
+
+
+def chunk_coords(region_x, region_z, index):
+    """Return absolute chunk coordinates for a header slot index."""
+    return region_x * 32 + index % 32, region_z * 32 + index // 32
+
+
+def read_header(buf):
+    """
+    Parse the 8 KiB header from a bytes-like object (bytes or mmap).
+
+    Returns a list of (index, sector_offset, sector_count, timestamp) for every
+    slot that holds a chunk.
+    """
+    if len(buf) < HEADER_SIZE:
+        return []
+
+    locations = _HEADER.unpack_from(buf, 0)
+    timestamps = _HEADER.unpack_from(buf, SECTOR_SIZE)
+
+    entries = []
+    for index, location in enumerate(locations):
+        if location == 0:
+            continue
+        entries.append((index, location >> 8, location & 0xFF, timestamps[index]))
+
+    return entries
+
+
+def read_chunk_header(buf, sector_offset):
+    """Return (length, compression_type) for the chunk stored at sector_offset."""
+    position = sector_offset * SECTOR_SIZE
+    if position + _CHUNK_HEADER.size > len(buf):
+        return None
+    return _CHUNK_HEADER.unpack_from(buf, position)
+
+
+def write_region(path, chunks):
+    """
+    Write a compacted region file.
+
+    chunks is a list of (index, data, timestamp) where data is the stored
+    chunk record (length, compression type and payload) as found in the old
+    file. Records are packed back to back on sector boundaries.
+    """
+    locations = [0] * CHUNKS_PER_REGION
+    timestamps = [0] * CHUNKS_PER_REGION
+    sector = HEADER_SIZE // SECTOR_SIZE
+
+    with open(path, 'wb') as f:
+        f.write(bytes(HEADER_SIZE))
+
+        for index, data, timestamp in sorted(chunks, key=lambda chunk: chunk[0]):
+            sectors = (len(data) + SECTOR_SIZE - 1) // SECTOR_SIZE
+            locations[index] = (sector << 8) | sectors
+            timestamps[index] = timestamp
+            f.write(data)
+            f.write(bytes(sectors * SECTOR_SIZE - len(data)))
+            sector += sectors
+
+        f.seek(0)
+        f.write(_HEADER.pack(*locations))
+        f.write(_HEADER.pack(*timestamps))
+
+
+def sectors_for(length):
+    """Sectors needed to store a chunk record whose length field is length."""
+    return (length + 4 + SECTOR_SIZE - 1) // SECTOR_SIZE
+
+
+class _NbtStream:
+    """
+    Decompresses a chunk payload only as far as it is read.
+
+    Skipped bytes are decompressed but never copied out, and nothing past the
+    last byte read is decompressed at all.
+    """
+    READ_SIZE = 4096
+
+    def __init__(self, data, compression):
+        if compression == COMPRESSION_ZLIB:
+            self.decompressor = zlib.decompressobj()
+        elif compression == COMPRESSION_GZIP:
+            self.decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        elif compression == COMPRESSION_NONE:
+            self.decompressor = None
+        else:
+            raise ValueError(f"unsupported chunk compression type {compression}")
+
+        self.source = memoryview(data)
+        self.source_position = 0
+        self.buffer = bytearray()
+        self.position = 0
+
+    def _fill(self, size):
+        while len(self.buffer) - self.position < size:
+            if self.source_position >= len(self.source):
+                raise EOFError("chunk data ended early")
+
+            block = self.source[self.source_position:self.source_position + self.READ_SIZE]
+            self.source_position += len(block)
+
+            # Drop consumed bytes so skipping large arrays doesn't keep them around
+            if self.position > self.READ_SIZE * 4:
+                del self.buffer[:self.position]
+                self.position = 0
+
+            if self.decompressor:
+                self.buffer += self.decompressor.decompress(block)
+            else:
+                self.buffer += block
+
+    def read(self, size):
+        self._fill(size)
+        data = bytes(self.buffer[self.position:self.position + size])
+        self.position += size
+        return data
+
+    def skip(self, size):
+        while size > 0:
+            step = min(size, self.READ_SIZE * 4)
+            self._fill(step)
+            self.position += step
+            size -= step
+
+    def unpack(self, fmt):
+        return struct.unpack(fmt, self.read(struct.calcsize(fmt)))[0]
+
+
+TAG_END, TAG_COMPOUND, TAG_LIST, TAG_LONG = 0, 10, 9, 4
+
+# Payload sizes for fixed-width tags, and element sizes for array tags
+_FIXED_SIZES = {1: 1, 2: 2, 3: 4, 4: 8, 5: 4, 6: 8}
+_ARRAY_SIZES = {7: 1, 11: 4, 12: 8}
+
+
+def _skip_payload(stream, tag_type):
+    if tag_type in _FIXED_SIZES:
+        stream.skip(_FIXED_SIZES[tag_type])
+    elif tag_type in _ARRAY_SIZES:
+        stream.skip(stream.unpack('>i') * _ARRAY_SIZES[tag_type])
+    elif tag_type == 8:
+        stream.skip(stream.unpack('>H'))
+    elif tag_type == TAG_LIST:
+        element_type = stream.unpack('>B')
+        count = stream.unpack('>i')
+        if element_type in _FIXED_SIZES:
+            stream.skip(count * _FIXED_SIZES[element_type])
+        else:
+            for _ in range(count):
+                _skip_payload(stream, element_type)
+    elif tag_type == TAG_COMPOUND:
+        while True:
+            child_type = stream.unpack('>B')
+            if child_type == TAG_END:
+                return
+            stream.skip(stream.unpack('>H'))
+            _skip_payload(stream, child_type)
+    else:
+        raise ValueError(f"unknown NBT tag type {tag_type}")
+
+
+def read_root_long(data, compression, name):
+    """
+    Return a long stored directly in a chunk's root compound (e.g. InhabitedTime),
+    or None if it isn't there. Stops decompressing as soon as the tag is found.
+    """
+    stream = _NbtStream(data, compression)
+    if stream.unpack('>B') != TAG_COMPOUND:
+        raise ValueError("chunk root is not a compound")
+    stream.skip(stream.unpack('>H'))
+
+    wanted = name.encode()
+    while True:
+        tag_type = stream.unpack('>B')
+        if tag_type == TAG_END:
+            return None
+        tag_name = stream.read(stream.unpack('>H'))
+        if tag_type == TAG_LONG and tag_name == wanted:
+            return stream.unpack('>q')
+        _skip_payload(stream, tag_type)
+
+
+def external_chunk_path(region_path, region_x, region_z, index):
+    """Path of the .mcc file holding an oversized chunk."""
+    x, z = chunk_coords(region_x, region_z, index)
+    return os.path.join(os.path.dirname(region_path), f"c.{x}.{z}.mcc")
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Mod Resolver Script
+
+Finds the newest Modrinth file of each mod for the Minecraft version in
+config.toml ([versions] minecraft, Fabric loader), along with everything
+those files require.
+Usage: ./resolve-mods.py [slug ...] [--section server_mods] [--write]
+
+Without slugs, every mod in the config.toml section is resolved (mods are
+recognised by their cdn.modrinth.com URL). --write updates those URLs in
+config.toml in place; required mods that aren't listed yet are printed as
+[[<section>.mod]] entries to add.
+
+Project and version metadata is cached in .cache/modrinth/index.json for
+--ttl hours, so resolving again is instant and works offline (--offline).
+Projects are looked up in batches; --api-base (or MODRINTH_API) points the
+script at a different Modrinth-compatible API, e.g. a local stand-in.
+"""
+
+import os
+import re
+import sys
+import time
+import argparse
+import urllib.parse
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+# Handle TOML library imports (Python 3.11+ has tomllib built-in)
+try:
+    import tomllib
+except ImportError:
+    try:
+        import tomli as tomllib
+    except ImportError:
+        print("Error: tomli not installed. Please run 'make install-deps' first.")
+        sys.exit(1)
+
+from modrinth import DEFAULT_API, ModrinthClient, best_version, primary_file  # noqa: E402
+
+CDN_PATTERN = re.compile(r'https://cdn\.modrinth\.com/data/([A-Za-z0-9]+)/versions/')
+
+
+def resolve(client, roots, minecraft, loader, workers=8):
+    """
+    Resolve projects and their required dependencies, level by level.
+
+    Returns (resolved, unresolved). resolved maps project id to a dict with
+    the project, chosen version, file and what required it; unresolved
+    lists (id, reason) for projects that couldn't be resolved.
+    """
+    resolved = {}
+    unresolved = []
+    attempted = set()
+    required_by = {root: None for root in roots}
+    pending = list(roots)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while pending:
+            projects = client.projects(pending)
+            for project_id in pending:
+                if project_id not in projects:
+                    unresolved.append((project_id, "project not found"))
+
+            todo = {}
+            for requested, project in projects.items():
+                if project['id'] not in attempted:
+                    attempted.add(project['id'])
+                    todo[project['id']] = (project, required_by.get(requested))
+
+            ids = list(todo)
+            candidates = executor.map(lambda pid: client.compatible_versions(pid, minecraft, loader), ids)
+
+            dependency_ids = []
+            pinned_versions = []
+            for project_id, versions in zip(ids, candidates):
+                project, parent = todo[project_id]
+                version = best_version(versions)
+                if version is None:
+                    unresolved.append((project['slug'], f"no {loader} version for Minecraft {minecraft}"))
+                    continue
+
+                resolved[project_id] = {
+                    'project': project,
+                    'version': version,
+                    'file': primary_file(version),
+                    'required_by': parent,
+                }
+
+                for dependency in version.get('dependencies', []):
+                    if dependency['dependency_type'] != 'required':
+                        continue
+                    if dependency.get('project_id'):
+                        dependency_ids.append(dependency['project_id'])
+                        required_by.setdefault(dependency['project_id'], project['slug'])
+                    elif dependency.get('version_id'):
+                        pinned_versions.append((dependency['version_id'], project['slug']))
+
+            # Dependencies given only as a version still tell us the project
+            if pinned_versions:
+                versions = client.versions([version_id for version_id, _ in pinned_versions])
+                for version_id, parent in pinned_versions:
+                    if version_id in versions:
+                        dependency_id = versions[version_id]['project_id']
+                        dependency_ids.append(dependency_id)
+                        required_by.setdefault(dependency_id, parent)
+
+            pending = sorted({d for d in dependency_ids if d not in attempted})
+
+    return resolved, unresolved
+
+
+def load_config():
+    config_path = Path("config.toml")
+    if not config_path.exists():
+        print("Error: config.toml not found.")
+        print("Please run 'make setup' and 'make generate-config' first.")
+        sys.exit(1)
+
+    with open(config_path, 'rb') as f:
+        return tomllib.load(f)
+
+
+def configured_mods(config, section):
+    """(name, url, modrinth project id or None) for each mod in a [[section]] block."""
+    mods = []
+    for block in config.get(section, []):
+        entries = block.get('mod', [])
+        for mod in entries if isinstance(entries, list) else [entries]:
+            # Entries can name the project (modrinth = "spark") instead of a url
+            match = CDN_PATTERN.match(mod.get('url', ''))
+            mods.append((mod['name'], mod.get('url'), match.group(1) if match else mod.get('modrinth')))
+    return mods
+
+
+def write_urls(replacements):
+    """Swap old URLs for new ones in config.toml, leaving everything else untouched."""
+    config_path = Path("config.toml")
+    text = config_path.read_text()
+    for old_url, new_url in replacements:
+        text = text.replace(f'"{old_url}"', f'"{new_url}"')
+    config_path.write_text(text)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resolve mod downloads for the configured Minecraft version")
+    parser.add_argument('slugs', nargs='*', help="Modrinth project slugs or ids (default: the mods in --section)")
+    parser.add_argument('--section', default='server_mods', choices=['server_mods', 'client_mods'],
+                        help="config.toml mod list to resolve")
+    parser.add_argument('--minecraft', help="Minecraft version (default: [versions] minecraft)")
+    parser.add_argument('--loader', default='fabric', help="Mod loader (default: fabric)")
+    parser.add_argument('--write', action='store_true', help="Update the mod URLs in config.toml")
+    parser.add_argument('--ttl', type=float, default=24, help="Hours before cached metadata is refetched")
+    parser.add_argument('--offline', action='store_true', help="Only use cached metadata")
+    parser.add_argument('--refresh', action='store_true', help="Ignore cached metadata")
+    parser.add_argument('--api-base', default=os.environ.get('MODRINTH_API', DEFAULT_API),
+                        help="Modrinth API base URL")
+    args = parser.parse_args()
+
+    config = load_config()
+    versions = config.get('versions', {})
+    minecraft = args.minecraft or versions.get('minecraft', '1.21.1')
+    loader_version = versions.get('fabric_loader', '0.18.3')
+
+    mods = [] if args.slugs else configured_mods(config, args.section)
+    if args.slugs:
+        roots = args.slugs
+    else:
+        roots = [project_id for _, _, project_id in mods if project_id]
+        for name, _, project_id in mods:
+            if project_id is None:
+                print(f"⚠️  {name}: not a Modrinth URL, skipping")
+
+    if not roots:
+        print(f"No Modrinth mods to resolve in [[{args.section}]]")
+        return
+
+    client = ModrinthClient(args.api_base, ttl_hours=args.ttl, offline=args.offline, refresh=args.refresh)
+    started = time.perf_counter()
+    try:
+        resolved, unresolved = resolve(client, roots, minecraft, args.loader)
+    finally:
+        client.save()
+    elapsed = time.perf_counter() - started
+
+    print(f"Resolved for Minecraft {minecraft} ({args.loader} loader {loader_version}) "
+          f"in {elapsed:.2f}s, {client.requests} API request(s)")
+    print()
+
+    for entry in sorted(resolved.values(), key=lambda e: e['project']['slug']):
+        version = entry['version']
+        note = f", required by {entry['required_by']}" if entry['required_by'] else ""
+        print(f"✓ {entry['project']['slug']:<24} {version['version_number']} ({version['version_type']}{note})")
+    for project_id, reason in unresolved:
+        print(f"⚠️  {project_id}: {reason}")
+
+    # Mods already in config.toml get their URL replaced, the rest are new
+    by_project = {project_id: (name, url) for name, url, project_id in mods if project_id}
+    replacements = []
+    additions = []
+    for project_id, entry in resolved.items():
+        new_url = entry['file']['url'] if entry['file'] else None
+        if not new_url:
+            continue
+        if project_id in by_project:
+            name, old_url = by_project[project_id]
+            # Entries without a url are resolved by generate-config.py each time
+            if old_url and old_url != new_url:
+                replacements.append((name, old_url, new_url))
+        else:
+            additions.append((entry['project']['slug'], new_url))
+
+    if replacements:
+        print()
+        print(f"{len(replacements)} mod(s) have a different file for {minecraft}:")
+        for name, old_url, new_url in replacements:
+            print(f"  {name}: {urllib.parse.unquote(os.path.basename(new_url))}")
+        if args.write:
+            write_urls([(old_url, new_url) for _, old_url, new_url in replacements])
+            print("✓ Updated config.toml (run 'make generate-config' next)")
+        else:
+            print("Run again with --write to update config.toml.")
+    elif mods:
+        print()
+        print("✓ All configured mods are up to date")
+
+    if additions:
+        if mods:
+            print()
+            print("Required but not in config.toml yet:")
+        for slug, url in sorted(additions):
+            print()
+            print(f"[[{args.section}.mod]]")
+            print(f'name = "{slug}"')
+            print(f'url = "{url}"')
+
+    if unresolved:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\n\nCancelled by user.")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n\nError: {e}")
+        sys.exit(1)
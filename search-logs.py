@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Log Search Script
+
+Searches the server's logs, including the rotated logs/*.log.gz archives,
+without decompressing all of them.
+Usage: ./search-logs.py QUERY [--since 7d] [--until 2025-01-31] [--limit 50] [--logs server/logs]
+
+New archives are indexed first (their time range and the words they
+contain, in logs/.log-index.sqlite), so only archives that contain every
+word of the query are read. Words match whole words, case-insensitively;
+end one with * to match it as a prefix (e.g. 'Stev*'). The same search is
+available in Discord as /logs search.
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / "discord-bot"))
+from utils.log_index import LogIndex, parse_time  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search the server's current and archived logs")
+    parser.add_argument('query', nargs='?', help="Words to look for")
+    parser.add_argument('--since', help="Only lines after this (7d, 12h, 2025-01-31, '2025-01-31 18:00')")
+    parser.add_argument('--until', help="Only lines before this")
+    parser.add_argument('--limit', type=int, default=50, help="Show at most this many (newest) lines")
+    parser.add_argument('--logs', default='server/logs', help="Log directory (default: server/logs)")
+    parser.add_argument('--update', action='store_true', help="Only update the index")
+    args = parser.parse_args()
+
+    if not args.query and not args.update:
+        parser.error("a query is required (or --update)")
+
+    logs_dir = Path(args.logs)
+    if not logs_dir.is_dir():
+        print(f"Error: log directory not found: {logs_dir}")
+        sys.exit(1)
+
+    index = LogIndex(logs_dir)
+    started = time.perf_counter()
+    indexed, total = index.update()
+    if indexed:
+        print(f"✓ Indexed {indexed} new log archive(s) in {time.perf_counter() - started:.1f}s ({total} total)")
+    if args.update:
+        return
+
+    since = parse_time(args.since) if args.since else None
+    until = parse_time(args.until, end=True) if args.until else None
+
+    started = time.perf_counter()
+    result = index.search(args.query, since=since, until=until, limit=args.limit)
+    elapsed = time.perf_counter() - started
+
+    for timestamp, name, line in result['matches']:
+        print(f"{timestamp}  {name:<20}  {line}")
+
+    print()
+    more = " (showing the newest; narrow with --since/--until or raise --limit)" if result['truncated'] else ""
+    print(f"{len(result['matches'])} match(es){more}, "
+          f"{result['files_scanned']} of {result['files_total']} log file(s) read in {elapsed * 1000:.0f}ms")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\n\nCancelled by user.")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n\nError: {e}")
+        sys.exit(1)
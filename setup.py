@@ -118,6 +118,21 @@ def generate_toml_content(config):
     lines.append(f'motd = "{config["motd"]}"')
     lines.append("")
 
+    # Runtime settings, applied to the running server by 'make reconcile'
+    lines.append("# Game rules, Carpet rules and the whitelist can be changed without a")
+    lines.append("# restart: edit them, then run 'make generate-config' and 'make reconcile'.")
+    lines.append("#")
+    lines.append("# [gamerules]")
+    lines.append("# keepInventory = true")
+    lines.append("#")
+    lines.append("# [carpet]")
+    lines.append("# commandPlayer = \"ops\"")
+    lines.append("#")
+    lines.append("# [whitelist]")
+    lines.append("# enabled = true")
+    lines.append("# players = [\"Steve\", \"Alex\"]")
+    lines.append("")
+
     # Client mods
     lines.append("[[client_mods]]")
     lines.append("# Client-side mods configuration")
@@ -149,7 +164,11 @@ def generate_toml_content(config):
         for mod in config["server_mods"]:
             lines.append("[[server_mods.mod]]")
             lines.append(f'name = "{mod["name"]}"')
-            lines.append(f'url = "{mod["url"]}"')
+            if mod.get("url"):
+                lines.append(f'url = "{mod["url"]}"')
+            else:
+                # Resolved to the newest file by generate-config.py
+                lines.append(f'modrinth = "{mod["modrinth"]}"')
             lines.append("")
     else:
         lines.append("# Example:")